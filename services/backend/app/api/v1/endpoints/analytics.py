@@ -0,0 +1,82 @@
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field, validator
+
+from app.services import analytics
+
+router = APIRouter()
+
+
+class AnalyticsRequest(BaseModel):
+    equity: List[float] = Field(..., min_items=2, description="Equity curve, one value per bar")
+    pnl: Optional[List[float]] = Field(None, description="Per-trade net P&L")
+    holding_bars: Optional[List[float]] = Field(None, description="Per-trade holding period in bars")
+    window: int = Field(63, ge=2, le=100_000, description="Rolling window in bars")
+    periods_per_year: float = Field(analytics.PERIODS_PER_YEAR, gt=0, description="Bars per year, for annualising")
+    include_series: bool = Field(True, description="Return the rolling series, not just the summary")
+
+    @validator('equity')
+    def validate_equity(cls, v):
+        if any(not math.isfinite(value) or value <= 0 for value in v):
+            raise ValueError("equity values must be positive and finite")
+        return v
+
+    @validator('holding_bars')
+    def validate_holding_bars(cls, v, values):
+        if v is not None and len(v) != len(values.get('pnl') or []):
+            raise ValueError("holding_bars must have one value per pnl entry")
+        return v
+
+
+class AnalyticsResponse(BaseModel):
+    summary: Dict[str, Optional[float]]
+    trades: Optional[Dict[str, Optional[float]]] = None
+    window: int
+    count: int
+    series: Optional[Dict[str, List[Optional[float]]]] = None
+
+
+def _json_value(value):
+    return value if math.isfinite(value) else None
+
+
+def _json_series(values: np.ndarray) -> List[Optional[float]]:
+    # JSON has no NaN/inf; warm-up values go out as null
+    column = values.tolist()
+    for i in np.flatnonzero(~np.isfinite(values)).tolist():
+        column[i] = None
+    return column
+
+
+@router.post("", response_model=AnalyticsResponse)
+def analyse_equity(request: AnalyticsRequest):
+    """Summary and rolling risk metrics for an equity curve, e.g. one returned by a backtest."""
+    equity = np.asarray(request.equity, dtype=np.float64)
+    try:
+        summary = analytics.curve_stats(equity, request.periods_per_year)
+        series = None
+        if request.include_series:
+            series = {
+                name: _json_series(values.astype(np.float64))
+                for name, values in analytics.rolling_metrics(equity, request.window, request.periods_per_year).items()
+            }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    trades = None
+    if request.pnl is not None:
+        trades = {
+            name: _json_value(value)
+            for name, value in analytics.trade_stats(request.pnl, request.holding_bars).items()
+        }
+
+    return AnalyticsResponse(
+        summary={name: _json_value(value) for name, value in summary.items()},
+        trades=trades,
+        window=request.window,
+        count=len(equity),
+        series=series
+    )
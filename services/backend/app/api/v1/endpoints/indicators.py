@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
-import numpy as np
-from typing import List
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, validator
+import numpy as np
+
+import indicators
 
 router = APIRouter()
 
@@ -61,6 +63,31 @@ class IndicatorResponse(BaseModel):
     period: int
     count: int
 
+class IndicatorSpec(BaseModel):
+    name: str = Field(..., pattern="^(rsi|ema|sma|atr|true_range)$", description="Indicator name")
+    period: Optional[int] = Field(None, ge=1, le=1000, description="Indicator period (not used by true_range)")
+    source: str = Field("close", pattern="^(open|high|low|close|volume)$", description="Input column for rsi/ema/sma")
+    key: Optional[str] = Field(None, max_length=64, description="Output column name (default e.g. rsi_14)")
+
+class BatchIndicatorRequest(BaseModel):
+    open: Optional[List[float]] = Field(None, description="Open prices")
+    high: Optional[List[float]] = Field(None, description="High prices")
+    low: Optional[List[float]] = Field(None, description="Low prices")
+    close: List[float] = Field(..., min_items=1, description="Close prices")
+    volume: Optional[List[float]] = Field(None, description="Volumes")
+    indicators: List[IndicatorSpec] = Field(..., min_items=1, max_items=100, description="Indicators to compute")
+
+class BatchIndicatorResponse(BaseModel):
+    count: int
+    columns: Dict[str, List[Optional[float]]]
+
+def _json_column(values: np.ndarray) -> List[Optional[float]]:
+    # JSON has no NaN; warm-up values go out as null
+    column = values.tolist()
+    for i in np.flatnonzero(np.isnan(values)).tolist():
+        column[i] = None
+    return column
+
 @router.post("/rsi-strategy", response_model=RSIStrategyResponse)
 def rsi_strategy(request: RSIStrategyRequest):
     signals = []
@@ -88,35 +115,7 @@ def calculate_rsi(request: RSIRequest):
             detail=f"Need at least {request.period + 1} values for RSI calculations"
         )
 
-    values = np.array(request.values, dtype=float)
-    deltas = np.diff(values)
-
-    gain = np.where(deltas > 0, deltas, 0)
-    loss = np.where(deltas < 0, -deltas, 0)
-
-    avg_gain = np.mean(gain[:request.period])
-    avg_loss = np.mean(loss[:request.period])
-
-    rsi_values = [np.nan] * request.period
-
-    for i in range(request.period, len(deltas)):
-        avg_gain = (avg_gain * (request.period - 1) + gain[i] / request.period)
-        avg_loss = (avg_loss * (request.period - 1) + loss[i] / request.period)
-
-        if avg_loss == 0:
-            rsi = 100
-        else: 
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        
-        rsi_values.append(rsi)
-    
-    # Handle the first values
-    if avg_loss == 0:
-        rsi_values.append(100)
-    else:
-        rs = avg_gain / avg_loss
-        rsi_values.append(100 - (100 / (1 + rs)))
+    rsi_values = indicators.rsi(request.values, request.period).tolist()
 
     return IndicatorResponse(
         values=rsi_values,
@@ -129,13 +128,9 @@ def calculate_ema(request: EMARequest):
 
     if not request.values:
         raise HTTPException(status_code=400, detail="Values list cannot be empty")
-    ema_values = []
-    k = 2 / (request.period + 1)
-    for i, val in enumerate(request.values):
-        if i == 0:
-            ema_values.append(val)
-        else:
-            ema_values.append(val * k+ ema_values[i-1] * (1-k))
+
+    ema_values = indicators.ema(request.values, request.period).tolist()
+
     return IndicatorResponse(
         values=ema_values,
         period=request.period,
@@ -150,14 +145,9 @@ def calculte_sma(request: SMARequest):
             status_code=400,
             detail=f"Need at least {request.period} values for SMA calculation"
         )
-    values = np.array(request.values, dtype=float)
 
-    # Pad with NaN for the first (period - 1) values
-    sma_values = [np.nan] * (request.period - 1)
-
-    #Calculate SMA using convolution
-    sma = np.convolve(values, np.ones(request.period)/request.period, mode='valid')
-    sma_values.extend(sma.tolist())
+    # NaN for the first (period - 1) values
+    sma_values = indicators.sma(request.values, request.period).tolist()
 
     return IndicatorResponse(
         values=sma_values,
@@ -173,36 +163,34 @@ def calculate_atr(request: ATRRequest):
             status_code=400,
             detail=f"Need at least {request.period + 1} values for ATR calculation"
         )
-    
-    high = np.array(request.high, dtype=float)
-    low = np.array(request.low, dtype=float)
-    close = np.array(request.close, dtype=float)
-
-    
-    tr = np.zeros(len(close))
-    tr[0] = high[0] - low[0]
-
-    for i in range(1, len(close)):
-        tr[i] = max(
-            high[i] - low[i],
-            abs(high[i] - close[i - 1]),
-            abs(low[i] - close[i - 1])
-        )
-    
-    atr_values = [np.nan] * request.period
 
-    atr_prev = np.mean(tr[1:request.period+1])
+    atr_values = indicators.atr(request.high, request.low, request.close, request.period).tolist()
 
-    for i in range(request.period+1, len(close)):
-        atr_prev = (atr_prev * (request.period - 1) + tr[i]) / request.period
-        atr_values[i] = atr_prev
-    
     return IndicatorResponse(
         values=atr_values,
         period=request.period,
         count=len(atr_values)
     )
 
+@router.post("/batch", response_model=BatchIndicatorResponse)
+def calculate_batch(request: BatchIndicatorRequest):
+    try:
+        batch = indicators.IndicatorBatch({
+            "open": request.open,
+            "high": request.high,
+            "low": request.low,
+            "close": request.close,
+            "volume": request.volume
+        })
+        columns = batch.run([spec.model_dump() for spec in request.indicators])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BatchIndicatorResponse.model_construct(
+        count=batch.length,
+        columns={key: _json_column(values) for key, values in columns.items()}
+    )
+
 @router.get("/health")
 def health_check():
     return {
@@ -213,6 +201,7 @@ def health_check():
             "/ema",
             "/sma",
             "/atr",
+            "/batch",
             "/rsi-strategy"
         ]
     }
\ No newline at end of file
@@ -0,0 +1,158 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+
+from app.core.database import SessionLocal
+from app.core.deps import get_job_queue, get_market_data, get_result_cache
+from app.services import backtest_runner, sweep_service
+from app.services.backtest_store import save_backtest
+from app.services.job_queue import CANCELLED, FAILED, FINISHED, Job, JobQueue, QueueFull
+from app.services.market_data import MarketDataService
+from app.services.result_cache import ResultCache
+from app.api.v1.endpoints.ohlcv import load_bars
+from app.api.v1.endpoints.strategies import BacktestRequest, SweepRequest
+
+router = APIRouter()
+
+
+def _client_id(request: Request, x_client_id: Optional[str]) -> str:
+    # Fair share is per client: an explicit id if the caller sends one, else its address
+    if x_client_id:
+        return x_client_id[:64]
+    return request.client.host if request.client else "anonymous"
+
+
+def _fetch_bars(loop: asyncio.AbstractEventLoop, market_data: MarketDataService, ticker: str, period: str, interval: str):
+    # Runs on a job worker; the fetch itself goes through the event loop so it is still coalesced
+    # load_bars enforces the service timeout; the margin only guards against a stopped loop
+    timeout = None if market_data.timeout is None else market_data.timeout + 5
+    try:
+        return asyncio.run_coroutine_threadsafe(
+            load_bars(market_data, ticker, period, interval), loop
+        ).result(timeout)
+    except HTTPException as e:
+        raise RuntimeError(e.detail)
+
+
+def _submit(queue: JobQueue, kind: str, fn, client: str, priority: int) -> dict:
+    try:
+        job = queue.submit(kind, fn, client=client, priority=priority)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict()
+
+
+def _get_job(queue: JobQueue, job_id: str) -> Job:
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job with id {job_id} (unknown or expired)")
+    return job
+
+
+@router.post("/backtest", status_code=202)
+async def submit_backtest(
+    request: BacktestRequest,
+    http_request: Request,
+    priority: int = Query(0, ge=0, le=9, description="Higher runs first"),
+    x_client_id: Optional[str] = Header(None),
+    queue: JobQueue = Depends(get_job_queue),
+    market_data: MarketDataService = Depends(get_market_data),
+    cache: ResultCache = Depends(get_result_cache)
+):
+    try:
+        backtest_runner.check_strategy_type(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    loop = asyncio.get_running_loop()
+
+    def run(job: Job):
+        job.report(0, 2)
+        bars = _fetch_bars(loop, market_data, request.ticker, request.period, request.interval)
+        job.check_cancelled()
+        job.report(1, 2)
+
+        results, _ = backtest_runner.cached_backtest(cache, request, bars)
+        if request.save:
+            results = dict(results)
+            with SessionLocal() as db:
+                results['run_id'] = save_backtest(db, results)
+        return results
+
+    return _submit(queue, 'backtest', run, _client_id(http_request, x_client_id), priority)
+
+
+@router.post("/sweep", status_code=202)
+async def submit_sweep(
+    request: SweepRequest,
+    http_request: Request,
+    priority: int = Query(0, ge=0, le=9, description="Higher runs first"),
+    x_client_id: Optional[str] = Header(None),
+    queue: JobQueue = Depends(get_job_queue),
+    market_data: MarketDataService = Depends(get_market_data)
+):
+    # Grid errors are reported now rather than as a failed job
+    try:
+        parameter_sets = backtest_runner.sweep_parameter_sets(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    loop = asyncio.get_running_loop()
+
+    def run(job: Job):
+        job.report(0, len(parameter_sets))
+        bars = _fetch_bars(loop, market_data, request.ticker, request.period, request.interval)
+        job.check_cancelled()
+
+        sweep = backtest_runner.new_sweep(request, bars, parameter_sets)
+        sweep_service.register_sweep(sweep)
+        job.on_cancel(sweep.cancel)
+        try:
+            results = sweep.run(on_result=lambda row: job.report(sweep.completed, sweep.total, row))
+        finally:
+            sweep_service.unregister_sweep(sweep)
+        return backtest_runner.sweep_response(request, sweep, results)
+
+    return _submit(queue, 'sweep', run, _client_id(http_request, x_client_id), priority)
+
+
+@router.get("")
+def list_jobs(
+    client: Optional[str] = Query(None, description="Only jobs submitted by this client"),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    return {
+        'jobs': [job.to_dict() for job in queue.jobs(client)],
+        **queue.stats()
+    }
+
+
+@router.get("/{job_id}")
+def get_job_status(
+    job_id: str,
+    partial_limit: int = Query(20, ge=0, le=1000, description="Most recent partial results to include"),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    job = _get_job(queue, job_id)
+    status = job.to_dict()
+    status['partial_results'] = job.partial_results(partial_limit) if partial_limit else []
+    return status
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    job = _get_job(queue, job_id)
+
+    if job.status not in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job.status} ({job.progress or 0}% done)")
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=f"Job {job_id} failed: {job.error}")
+    if job.status == CANCELLED and job.result is None:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} was cancelled before producing a result")
+
+    return job.result
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    _get_job(queue, job_id)
+    return queue.cancel(job_id).to_dict()
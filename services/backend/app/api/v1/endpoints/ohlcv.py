@@ -1,9 +1,13 @@
-import yfinance as yf
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import datetime
-import pandas as pd
+from typing import Dict, List
+
+from app.core.dataset import OHLCVDataset
+from app.core.deps import get_market_data
+from app.core.metrics import span
+from app.services.market_data import MarketDataService
 
 router = APIRouter()
 
@@ -22,94 +26,91 @@ class MarketDataResponse(BaseModel):
     data: List[OHLCVData]
     count: int
 
-def load_data(
+async def load_bars(
+        market_data: MarketDataService,
         ticker: str,
         period: str = "1mo",
         interval: str = "1h"
-) -> MarketDataResponse:
+) -> OHLCVDataset:
     try:
-        data = yf.download(
-            ticker, 
-            period=period,
-            interval=interval,
-            progress=False
-        )
+        with span("load_bars"):
+            bars = await market_data.get_bars(ticker, period, interval)
 
-        if data.empty:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No data found for ticker {ticker} with period={period} and interval={interval}"
-            )
-        
-        data = data.reset_index()
-        datetime_col = 'Datetime' if 'Datetime' in data.columns else 'Date'
-
-        result = []
-        for _, row in data.iterrows():
-            try:
-                result.append(OHLCVData(
-                    timestamp=row[datetime_col].isoformat(),
-                    open = float(row["Open"]),
-                    low = float(row['Low']),
-                    close = float(row['Close']),
-                    high = float(row['High']),
-                    volume = float(row['Volume']),   
-                ))
-            except (KeyError, ValueError) as e:
-                continue
-        if not result:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failse to parse data for ticker {ticker}"
-            )
-        return MarketDataResponse(
-            ticker=ticker,
-            period=period,
-            interval=interval,
-            data=result, count=len(result)
+    # asyncio.wait_for raises its own TimeoutError, not the builtin one, before Python 3.11
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Timed out fetching data for {ticker}"
         )
-    
-    except HTTPException:
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error fetching data for {ticker}: {str(e)}"
         )
+
+    if len(bars) == 0:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for ticker {ticker} with period={period} and interval={interval}"
+        )
+    return bars
+
+async def load_data(
+        market_data: MarketDataService,
+        ticker: str,
+        period: str = "1mo",
+        interval: str = "1h"
+) -> Dict:
+    # Row objects are only built here, at the API edge
+    bars = await load_bars(market_data, ticker, period, interval)
+    with span("to_records"):
+        records = bars.to_records()
+    return {
+        "ticker": ticker,
+        "period": period,
+        "interval": interval,
+        "data": records,
+        "count": len(bars)
+    }
     
 @router.get("/nasdaq", response_model=MarketDataResponse)
-def get_nasdaq(
+async def get_nasdaq(
     period: str = Query("1mo", description="Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)"),
-    interval: str = Query("1h", description="Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)")
+    interval: str = Query("1h", description="Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)"),
+    market_data: MarketDataService = Depends(get_market_data)
 ):
-    return load_data("QQQ", period, interval)
+    return await load_data(market_data, "QQQ", period, interval)
 
 @router.get("/gold", response_model=MarketDataResponse)
-def get_gold(
+async def get_gold(
     period: str = Query("1mo", description="Data period"),
-    interval: str = Query("1h", description="Data interval")
+    interval: str = Query("1h", description="Data interval"),
+    market_data: MarketDataService = Depends(get_market_data)
 ):
-    return load_data("GC=F", period, interval)
+    return await load_data(market_data, "GC=F", period, interval)
 
 @router.get('/eurusd', response_model=MarketDataResponse)
-def get_eurusd(
+async def get_eurusd(
     period: str = Query("1mo", description="Data period"),
-    interval: str = Query("1h", description="Data interval")
+    interval: str = Query("1h", description="Data interval"),
+    market_data: MarketDataService = Depends(get_market_data)
 ):
-    return load_data("EURUSD=X", period, interval)
+    return await load_data(market_data, "EURUSD=X", period, interval)
 
 @router.get("/gbpusd", response_model=MarketDataResponse)
-def gbpusd(
+async def gbpusd(
         period: str = Query("1mo", description="Data period"),
-        interval: str = Query("1h", description="Data interval")
+        interval: str = Query("1h", description="Data interval"),
+        market_data: MarketDataService = Depends(get_market_data)
 ):
-    return load_data("GBPUSD=X", period, interval)
+    return await load_data(market_data, "GBPUSD=X", period, interval)
 
 @router.get("/custom/{ticker}", response_model=MarketDataResponse)
-def get_custom_ticker(
+async def get_custom_ticker(
     ticker:str,
     period: str = Query("1mo", description="Data period"),
-    interval: str = Query("1h", description="Data interval")
+    interval: str = Query("1h", description="Data interval"),
+    market_data: MarketDataService = Depends(get_market_data)
 ):
     if not ticker or len(ticker) > 20:
         raise HTTPException(
@@ -117,10 +118,12 @@ def get_custom_ticker(
             detail="Invalid ticker symbol"
         )
     
-    return load_data(ticker.upper(), period, interval)
+    return await load_data(market_data, ticker.upper(), period, interval)
 
 @router.get("/status")
 def data_service_status():
+    import yfinance as yf
+
     try:
         test_data = yf.download('QQQ', period='1d', interval='1h', progress=False)
 
@@ -141,6 +144,8 @@ def data_service_status():
 
 @router.get("/latest_{ticker}")
 def get_latest_price(ticker: str):
+    import yfinance as yf
+
     try:
         ticker_obj = yf.Ticker(ticker)
         info = ticker_obj.info
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
-from services.backtest_service import BacktestEngine
-import sys
-sys.path.append('..')
+from sqlalchemy.orm import Session
+from typing import List, Dict, Optional, Union
+from app.core.dataset import OHLCVDataset
+from app.core.deps import get_db, get_market_data, get_result_cache
+from app.services.backtest_store import save_backtest
+from app.services import backtest_runner, monte_carlo, sweep_service
+from app.services.market_data import MarketDataService
+from app.services.result_cache import ResultCache
+from app.api.v1.endpoints.ohlcv import load_bars
 
+from strategies.regression_strategy import LinearRegressionStrategy
 from strategies.rsi_strategy import RSIStrategy
-from endpoints.ohlcv import load_data
 
 router = APIRouter()
 
@@ -14,26 +20,69 @@ class BacktestRequest(BaseModel):
     ticker: str = Field(..., description='Ticker symbol')
     period: str = Field('1mo', description='Data period')
     interval: str = Field('1h', description='Data interval')
-    strategy_type: str = Field(..., description="Strategy type (rsi, ema, sma, etc)")
+    strategy_type: str = Field(..., description="Strategy type (rsi, linear_regression)")
 
     rsi_period: Optional[int] = Field(14, description="RSI period")
     oversold: Optional[float] = Field(30, description="Oversold threshold")
     overbought: Optional[float] = Field(70, description="Overbought Threshold")
 
+    lookback: int = Field(20, ge=3, le=1000, description="Regression window (linear_regression)")
+    horizon: int = Field(5, ge=1, le=500, description="Bars ahead to project the trend (linear_regression)")
+    threshold: float = Field(0.5, ge=0, description="Projected move in percent needed to signal (linear_regression)")
+    min_r2: float = Field(0.5, ge=0, le=1, description="Minimum fit quality to signal (linear_regression)")
+
     initial_capital: float = Field(10000, ge=100, description="Initial capital")
     comission: float = Field(0.001, ge=0, le=0.1, description = 'Comission rate')
     position_size: float = Field(1.0, ge=0.1, le=1.0, description="Position size")
+    engine: str = Field('vectorized', pattern='^(vectorized|loop)$', description="Backtest engine (vectorized, loop)")
+    save: bool = Field(False, description="Persist the run and its trades to the database")
+
+class MonteCarloRequest(BacktestRequest):
+    n_paths: int = Field(10000, ge=100, le=200000, description="Number of simulated trade sequences")
+    method: str = Field('bootstrap', pattern='^(bootstrap|shuffle)$', description="Resampling method (bootstrap, shuffle)")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed, for reproducible results")
 
 class StrategyRequest(BaseModel):
     ticker: str = Field(..., description="Ticker symbol (QQQ, GC=F, EURUSD=X, GBPUSD=X)")
     period: str = Field("1mo", description="Data period")
     interval: str = Field("1h", description="Data interval")
 
-class RSIStrategyRequest(StrategyRequest):
+class SignalPage(BaseModel):
+    signals_offset: int = Field(0, ge=0, description="First signal record to return")
+    signals_limit: Optional[int] = Field(None, ge=1, description="Signal records to return (all by default)")
+
+class RSIStrategyRequest(StrategyRequest, SignalPage):
     rsi_period: int = Field(14, ge=2, le=50, description="RSI period")
     oversold: float = Field(30, ge=0, le=100, description="Oversold threshold")
     overbought: float = Field(70, ge=0, le=100, description="Overbought threshold")
 
+class RegressionStrategyRequest(StrategyRequest, SignalPage):
+    lookback: int = Field(20, ge=3, le=1000, description="Regression window in bars")
+    horizon: int = Field(5, ge=1, le=500, description="Bars ahead to project the trend")
+    threshold: float = Field(0.5, ge=0, description="Projected move in percent needed to signal")
+    min_r2: float = Field(0.5, ge=0, le=1, description="Minimum fit quality to signal")
+
+class ParameterRange(BaseModel):
+    start: float = Field(..., description="First value")
+    stop: float = Field(..., description="Last value (inclusive)")
+    step: float = Field(..., gt=0, description="Increment")
+
+class SweepRequest(StrategyRequest):
+    rsi_period: Union[List[int], ParameterRange] = Field([14], description="RSI periods (list or range)")
+    oversold: Union[List[float], ParameterRange] = Field([30], description="Oversold thresholds (list or range)")
+    overbought: Union[List[float], ParameterRange] = Field([70], description="Overbought thresholds (list or range)")
+
+    initial_capital: float = Field(10000, ge=100, description="Initial capital")
+    comission: float = Field(0.001, ge=0, le=0.1, description='Comission rate')
+    position_size: float = Field(1.0, ge=0.1, le=1.0, description="Position size")
+    engine: str = Field('vectorized', pattern='^(vectorized|loop)$', description="Backtest engine (vectorized, loop)")
+
+    rank_by: str = Field('sharpe_ratio', description="Metric to rank results by")
+    descending: bool = Field(True, description="Rank highest values first")
+    top_n: Optional[int] = Field(None, ge=1, description="Only return the best N rows")
+    max_workers: Optional[int] = Field(None, ge=1, description="Worker processes (capped by server setting)")
+    sweep_id: Optional[str] = Field(None, max_length=64, description="Client-chosen id, usable to cancel the sweep")
+
 class StrategyListResponse(BaseModel):
     strategies: List[Dict]
 
@@ -70,128 +119,218 @@ def get_strategies():
             },
             {
                 'name': 'ML Linear Regression',
-                'description': 'Predict price using linear regression',
+                'description': 'Trade the projection of a rolling linear regression over the closes',
                 'type': 'machine_learning',
-                'parameters': ['feature', 'lookback'],
-                'status': 'coming_soon'
+                'parameters': ['lookback', 'horizon', 'threshold', 'min_r2']
             }
         ]
     }
 
-@router.post("/rsi-strategy")
-def run_rsi_strategy(request: RSIStrategyRequest):
-    try:
-        market_data = load_data(request.ticker, request.period, request.interval)
+def _rsi_signals(request: RSIStrategyRequest, bars: OHLCVDataset) -> Dict:
+    strategy = RSIStrategy(
+        period=request.rsi_period,
+        oversold=request.oversold,
+        overbought=request.overbought
+    )
 
-        if not market_data.data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No data available for {request.ticker}"
-            )
-        
-        data_list = [
-            {
-                'timestamp': candle.timestamp,
-                'open': candle.open,
-                'high': candle.high,
-                'low': candle.low,
-                'close': candle.close,
-                'volume': candle.volume
-            }
-            for candle in market_data.data
-        ]
+    signals = strategy.generate_signals(bars, offset=request.signals_offset, limit=request.signals_limit)
 
-        strategy = RSIStrategy(
-            period=request.rsi_period,
-            oversold=request.oversold,
-            overbought=request.overbought
-        )
+    signals['ticker'] = request.ticker
+    signals['data_period'] = request.period
+    signals['data_interval'] = request.interval
 
-        signals = strategy.generate_signals(data_list)
+    return signals
 
-        signals['ticker'] = request.ticker
-        signals['data_period'] = request.period
-        signals['data_interval'] = request.interval
+@router.post("/rsi-strategy")
+async def run_rsi_strategy(
+    request: RSIStrategyRequest,
+    market_data: MarketDataService = Depends(get_market_data)
+):
+    bars = await load_bars(market_data, request.ticker, request.period, request.interval)
 
-        return signals
-    
-    except HTTPException:
-        raise
+    try:
+        # CPU-bound work stays off the event loop
+        return await run_in_threadpool(_rsi_signals, request, bars)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f'Error running RSI strategy: {str(e)}'
         )
     
+def _regression_signals(request: RegressionStrategyRequest, bars: OHLCVDataset) -> Dict:
+    strategy = LinearRegressionStrategy(
+        lookback=request.lookback,
+        horizon=request.horizon,
+        threshold=request.threshold,
+        min_r2=request.min_r2
+    )
+
+    signals = strategy.generate_signals(bars, offset=request.signals_offset, limit=request.signals_limit)
+
+    signals['ticker'] = request.ticker
+    signals['data_period'] = request.period
+    signals['data_interval'] = request.interval
+
+    return signals
+
+@router.post("/linear-regression-strategy")
+async def run_regression_strategy(
+    request: RegressionStrategyRequest,
+    market_data: MarketDataService = Depends(get_market_data)
+):
+    bars = await load_bars(market_data, request.ticker, request.period, request.interval)
+
+    try:
+        return await run_in_threadpool(_regression_signals, request, bars)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f'Error running linear regression strategy: {str(e)}'
+        )
+
 @router.get("/status")
 def strategy_service_status():
     return {
         "status": 'healthy',
         'service': 'strategies',
-        'available_strategies': 1,
-        'coming_soon': 4
+        'available_strategies': 2,
+        'coming_soon': 3
     }
 
+def _check_strategy_type(request: BacktestRequest):
+    try:
+        backtest_runner.check_strategy_type(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/backtest")
-def run_backtest(request: BacktestRequest):
-    try: 
-        market_data = load_data(request.ticker, request.period, request.interval)
+async def run_backtest(
+    request: BacktestRequest,
+    response: Response,
+    market_data: MarketDataService = Depends(get_market_data),
+    db: Session = Depends(get_db),
+    cache: ResultCache = Depends(get_result_cache)
+):
+    _check_strategy_type(request)
 
-        if not market_data.data:
-            raise HTTPException(
-                status_code = 404,
-                detail=f"No data available for {request.ticker}"
-            )
+    bars = await load_bars(market_data, request.ticker, request.period, request.interval)
 
-        data_list = [
-            {
-                'timestamp': candle.timestamp,
-                'open': candle.open,
-                'high': candle.high,
-                'low': candle.low,
-                'close': candle.close,
-                'volume': candle.volume
-            }
-            for candle in market_data.data
-        ]
+    try:
+        results, hit = await run_in_threadpool(backtest_runner.cached_backtest, cache, request, bars)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error running backtest: {str(e)}"
+        )
 
-        if request.strategy_type.lower() == 'rsi':
-            strategy = RSIStrategy(
-                period=request.rsi_period,
-                oversold=request.oversold,
-                overbought=request.overbought
-            )
-            signal_result = strategy.generate_signals(data_list)
-            signals = signal_result['signals']
-        else:
+    response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+
+    if request.save:
+        results = dict(results)
+        try:
+            results['run_id'] = await run_in_threadpool(save_backtest, db, results)
+        except Exception as e:
             raise HTTPException(
-                status_code=400,
-                detail=f"Strategy type '{request.strategy_type}' not supported yet"
+                status_code=503,
+                detail=f"Backtest finished but could not be saved: {str(e)}"
             )
-    
-        backtest_engine = BacktestEngine(
-            initital_capital=request.initial_capital,
-            commision=request.comission,
-            position_size=request.position_size
-        )
 
-        results = backtest_engine.run_backtest(signals, data_list)
-
-        results['ticker'] = request.ticker
-        results['period'] = request.period
-        results['interval'] = request.interval
-        results['strategy'] = request.strategy_type
-        results['strategy_parameters'] = {
-            'rsi_period': request.rsi_period,
-            'oversold': request.oversold,
-            'overbought': request.overbought
-        }
-
-        return results
-    except HTTPException:
-        raise
+    return results
+
+_YEAR_NS = 365.25 * 24 * 3600 * 1_000_000_000
+
+def _monte_carlo(request: MonteCarloRequest, bars: OHLCVDataset, results: Dict) -> Dict:
+    # Annualise the per-trade Sharpe by how often the strategy actually traded
+    elapsed_ns = int(bars.timestamp[-1] - bars.timestamp[0]) if len(bars) > 1 else 0
+    trades_per_year = len(results['trades']) / (elapsed_ns / _YEAR_NS) if elapsed_ns > 0 else None
+
+    return monte_carlo.simulate(
+        results['trades'],
+        request.initial_capital,
+        n_paths=request.n_paths,
+        method=request.method,
+        seed=request.seed,
+        trades_per_year=trades_per_year
+    )
+
+@router.post("/monte-carlo")
+async def run_monte_carlo(
+    request: MonteCarloRequest,
+    market_data: MarketDataService = Depends(get_market_data),
+    cache: ResultCache = Depends(get_result_cache)
+):
+    _check_strategy_type(request)
+
+    bars = await load_bars(market_data, request.ticker, request.period, request.interval)
+
+    # Only the fields the caller set, so the cache key matches the equivalent /backtest call
+    backtest_request = BacktestRequest(**request.model_dump(include=set(BacktestRequest.model_fields), exclude_unset=True))
+    try:
+        results, _ = await run_in_threadpool(backtest_runner.cached_backtest, cache, backtest_request, bars)
     except Exception as e:
         raise HTTPException(
-            status_code=500, 
+            status_code=500,
             detail=f"Error running backtest: {str(e)}"
-        )
\ No newline at end of file
+        )
+    if not results['trades']:
+        raise HTTPException(status_code=400, detail="Backtest produced no trades to resample")
+
+    simulation = await run_in_threadpool(_monte_carlo, request, bars, results)
+    return {
+        'ticker': request.ticker,
+        'period': request.period,
+        'interval': request.interval,
+        'backtest': {
+            'final_capital': results['final_capital'],
+            'total_trades': results['total_trades'],
+            'metrics': results['metrics']
+        },
+        'monte_carlo': simulation
+    }
+
+@router.get("/cache")
+def result_cache_stats(cache: ResultCache = Depends(get_result_cache)):
+    return cache.stats()
+
+@router.delete("/cache")
+def clear_result_cache(cache: ResultCache = Depends(get_result_cache)):
+    cache.clear()
+    return cache.stats()
+
+@router.post("/sweep")
+async def run_sweep(
+    request: SweepRequest,
+    market_data: MarketDataService = Depends(get_market_data)
+):
+    try:
+        parameter_sets = backtest_runner.sweep_parameter_sets(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Data is fetched once and shared by every evaluation
+    bars = await load_bars(market_data, request.ticker, request.period, request.interval)
+
+    sweep = backtest_runner.new_sweep(request, bars, parameter_sets)
+
+    try:
+        sweep_service.register_sweep(sweep)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    try:
+        results = await run_in_threadpool(sweep.run)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error running sweep: {str(e)}"
+        )
+    finally:
+        sweep_service.unregister_sweep(sweep)
+
+    return backtest_runner.sweep_response(request, sweep, results)
+
+@router.delete("/sweep/{sweep_id}")
+def cancel_sweep(sweep_id: str):
+    if not sweep_service.cancel_sweep(sweep_id):
+        raise HTTPException(status_code=404, detail=f"No running sweep with id {sweep_id}")
+    return {'sweep_id': sweep_id, 'status': 'cancelling'}
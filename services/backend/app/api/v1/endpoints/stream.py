@@ -0,0 +1,62 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+
+from app.core.deps import get_stream_hub
+from app.services.live_stream import StreamHub
+
+router = APIRouter()
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    # Clients only listen; anything they send is ignored until they go away
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/{ticker}")
+async def stream_signals(
+    websocket: WebSocket,
+    ticker: str,
+    period: int = Query(14, ge=2, le=200),
+    oversold: float = Query(30, ge=0, le=100),
+    overbought: float = Query(70, ge=0, le=100),
+    hub: StreamHub = Depends(get_stream_hub)
+):
+    """
+    Live RSI signals for a ticker as JSON messages.
+
+    Sends {"event": "subscribed"} first, then one {"event": "signal"} per new
+    signal, {"event": "lagged", "dropped": n} if this client fell behind and
+    lost messages, and {"event": "end"} or {"event": "error"} when the feed stops.
+    """
+    if not ticker or len(ticker) > 20:
+        await websocket.close(code=1008, reason="Invalid ticker symbol")
+        return
+
+    await websocket.accept()
+    ticker = ticker.upper()
+    parameters = {"period": period, "oversold": oversold, "overbought": overbought}
+    subscription = hub.subscribe(ticker, parameters)
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+
+    try:
+        await websocket.send_json({"event": "subscribed", "ticker": ticker, "parameters": parameters})
+        while True:
+            message = asyncio.create_task(subscription.get())
+            await asyncio.wait({message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not message.done():
+                message.cancel()
+                return
+            await websocket.send_json(message.result())
+            if message.result()["event"] in ("end", "error"):
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(subscription)
+        disconnected.cancel()
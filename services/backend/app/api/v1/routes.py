@@ -1,30 +1,25 @@
 from fastapi import APIRouter
-from pydantic import BaseModel
-import pandas as pd
+from pydantic import BaseModel, Field
+import numpy as np
+
+import indicators
 
 router = APIRouter()
 
 class PriceData(BaseModel):
     close: list
     period: int
+    # This endpoint has always served rolling-mean RSI; Wilder's is opt-in
+    smoothing: str = Field("sma", pattern="^(sma|wilder)$")
 
-def compute_rsi(close, period):
-    df = pd.DataFrame(close, columns=["close"])
-    delta = df["close"].diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-
-    avg_gain = gain.rolling(period).mean()
-    avg_loss = loss.rolling(period).mean()
-
-    rs = avg_gain / avg_loss
-
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.fillna(0).tolist()
+def compute_rsi(close, period, smoothing="sma"):
+    # The warm-up is reported as 0 for the chart
+    rsi = indicators.rsi(close, period, smoothing=smoothing)
+    return np.nan_to_num(rsi, nan=0.0).tolist()
 
 @router.post("/indicators/rsi")
 def rsi_endpoint(data: PriceData):
-    result = compute_rsi(data.close, data.period)
+    result = compute_rsi(data.close, data.period, data.smoothing)
     return {"rsi": result}
 
 @router.get("/status")
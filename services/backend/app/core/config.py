@@ -1,6 +1,46 @@
+import os
+
+
 class Settings:
     PROJECT_NAME: str = "Algorithmic Trading Researh Platfrom"
     VERSION: str = "0.1.0"
 
-settings = Settings()
+    # Local OHLCV bar cache
+    BAR_CACHE_ENABLED: bool = os.getenv("BAR_CACHE_ENABLED", "1") != "0"
+    BAR_CACHE_DIR: str = os.getenv("BAR_CACHE_DIR", os.path.join(".cache", "bars"))
+
+    # Serve and persist bars through the database (ohlcv_bars) instead of the file cache
+    BAR_STORE_ENABLED: bool = os.getenv("BAR_STORE_ENABLED", "0") == "1"
+
+    # Upstream market data fetches (shared by concurrent identical requests)
+    MARKET_DATA_MAX_CONCURRENCY: int = int(os.getenv("MARKET_DATA_MAX_CONCURRENCY", 4))
+    MARKET_DATA_TIMEOUT: float = float(os.getenv("MARKET_DATA_TIMEOUT", 30))
+
+    # Backtest results, keyed by request and a fingerprint of the bars (empty dir = memory only)
+    RESULT_CACHE_MAX_MB: int = int(os.getenv("RESULT_CACHE_MAX_MB", 64))
+    RESULT_CACHE_DIR: str = os.getenv("RESULT_CACHE_DIR", "")
 
+    # Background jobs (/jobs): worker threads, queue bound and how long finished jobs are kept
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", 2))
+    JOB_MAX_QUEUED: int = int(os.getenv("JOB_MAX_QUEUED", 1000))
+    JOB_RESULT_TTL: float = float(os.getenv("JOB_RESULT_TTL", 3600))
+
+    # Live signal streaming (/stream): bar interval, poll rate, per-client queue bound,
+    # and a BarCache directory to replay instead of polling live data (speed 0 = as fast as possible)
+    STREAM_INTERVAL: str = os.getenv("STREAM_INTERVAL", "1m")
+    STREAM_POLL_SECONDS: float = float(os.getenv("STREAM_POLL_SECONDS", 60))
+    STREAM_QUEUE_SIZE: int = int(os.getenv("STREAM_QUEUE_SIZE", 100))
+    STREAM_REPLAY_DIR: str = os.getenv("STREAM_REPLAY_DIR", "")
+    STREAM_REPLAY_SPEED: float = float(os.getenv("STREAM_REPLAY_SPEED", 60))
+
+    # Import the API routers on their first request (0 = all at startup, e.g. to warm a worker)
+    LAZY_ROUTERS: bool = os.getenv("LAZY_ROUTERS", "1") != "0"
+
+    # Answer requests sent with `X-Profile: 1` with their cProfile output (debugging only)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "0") == "1"
+
+    # Parameter sweeps
+    SWEEP_MAX_WORKERS: int = int(os.getenv("SWEEP_MAX_WORKERS", os.cpu_count() or 1))
+    SWEEP_MAX_COMBINATIONS: int = int(os.getenv("SWEEP_MAX_COMBINATIONS", 5000))
+
+settings = Settings()
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from app.core.metrics import timed
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+PRICE_COLUMNS = COLUMNS[1:]
+
+TimeLike = Union[int, str, datetime, np.datetime64]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class OHLCVDataset:
+    """
+    Struct-of-arrays OHLCV bars.
+
+    `timestamp` is int64 nanoseconds since epoch (UTC), the other columns are
+    contiguous float64 arrays of the same length. `tz` is only used when
+    rendering timestamps at the API edge. Slicing returns views, never copies.
+    """
+
+    __slots__ = COLUMNS + ("tz",)
+
+    def __init__(
+        self,
+        timestamp,
+        open,
+        high,
+        low,
+        close,
+        volume,
+        tz: Optional[str] = None
+    ):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.tz = tz
+
+        n = len(self.timestamp)
+        for name in PRICE_COLUMNS:
+            if len(getattr(self, name)) != n:
+                raise ValueError("All OHLCV columns must have the same length")
+
+    # Construction
+
+    @classmethod
+    def empty(cls, tz: Optional[str] = None) -> "OHLCVDataset":
+        return cls(np.empty(0, np.int64), *(np.empty(0) for _ in PRICE_COLUMNS), tz=tz)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], tz: Optional[str] = None) -> "OHLCVDataset":
+        return cls(*(columns[name] for name in COLUMNS), tz=tz)
+
+    @classmethod
+    @timed("parse")
+    def from_frame(cls, frame) -> "OHLCVDataset":
+        """Build from a yfinance-style DataFrame indexed by datetime."""
+        if frame is None or frame.empty:
+            return cls.empty()
+
+        index = frame.index
+        tz = str(index.tz) if index.tz is not None else None
+        if tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        columns = {"timestamp": np.asarray(index.as_unit("ns").asi8, dtype=np.int64)}
+        for name in PRICE_COLUMNS:
+            # Single-ticker downloads may still come back with (Price, Ticker) columns
+            columns[name] = np.ascontiguousarray(
+                np.asarray(frame[name.capitalize()], dtype=np.float64).reshape(-1)
+            )
+
+        keep = ~np.isnan(columns["close"])
+        if not keep.all():
+            columns = {name: values[keep] for name, values in columns.items()}
+
+        order = np.argsort(columns["timestamp"], kind="stable")
+        if (order != np.arange(len(order))).any():
+            columns = {name: values[order] for name, values in columns.items()}
+
+        return cls.from_columns(columns, tz=tz)
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "OHLCVDataset":
+        """Build from list-of-dict candles (`timestamp` may be ISO strings or datetimes)."""
+        if not records:
+            return cls.empty()
+
+        import pandas as pd
+
+        stamps = [r["timestamp"] for r in records]
+        try:
+            index = pd.DatetimeIndex(pd.to_datetime(stamps))
+        except (ValueError, TypeError):
+            # Mixed UTC offsets
+            index = pd.DatetimeIndex(pd.to_datetime(stamps, utc=True))
+
+        tz = str(index.tz) if index.tz is not None else None
+        if tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        return cls(
+            index.as_unit("ns").asi8,
+            *(np.fromiter((r[name] for r in records), np.float64, len(records)) for name in PRICE_COLUMNS),
+            tz=tz
+        )
+
+    # Access
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return OHLCVDataset(*(getattr(self, name)[key] for name in COLUMNS), tz=self.tz)
+        if isinstance(key, (int, np.integer)):
+            return {name: getattr(self, name)[key].item() for name in COLUMNS}
+        raise TypeError("OHLCVDataset indices must be integers or slices")
+
+    def between(self, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None) -> "OHLCVDataset":
+        """View of bars with start <= timestamp < end."""
+        first = 0 if start is None else int(np.searchsorted(self.timestamp, _to_ns(start), side="left"))
+        last = len(self) if end is None else int(np.searchsorted(self.timestamp, _to_ns(end), side="left"))
+        return self[first:last]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    def merge(self, newer: "OHLCVDataset") -> "OHLCVDataset":
+        """Append `newer`; stored bars from its first timestamp onwards are replaced."""
+        if len(newer) == 0:
+            return self
+        cut = int(np.searchsorted(self.timestamp, newer.timestamp[0], side="left"))
+        return OHLCVDataset(
+            *(np.concatenate([getattr(self, name)[:cut], getattr(newer, name)]) for name in COLUMNS),
+            tz=newer.tz or self.tz
+        )
+
+    # API edge
+
+    def iso_timestamps(self, indices: Optional[Iterable[int]] = None) -> List[str]:
+        """ISO-8601 strings in the dataset's timezone, optionally only for `indices`."""
+        import pandas as pd
+
+        stamps = self.timestamp if indices is None else self.timestamp[np.asarray(indices, dtype=np.intp)]
+        index = pd.to_datetime(stamps, unit="ns", utc=self.tz is not None)
+        if self.tz is not None:
+            index = index.tz_convert(self.tz)
+        return [ts.isoformat() for ts in index]
+
+    def to_records(self) -> List[Dict]:
+        return [
+            {"timestamp": ts, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for ts, o, h, lo, c, v in zip(
+                self.iso_timestamps(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+            )
+        ]
+
+
+def as_dataset(data: Union[OHLCVDataset, List[Dict]]) -> OHLCVDataset:
+    """Accept either a dataset or legacy list-of-dict candles."""
+    if isinstance(data, OHLCVDataset):
+        return data
+    return OHLCVDataset.from_records(list(data))
+
+
+def _to_ns(value: TimeLike) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, np.datetime64):
+        return int(value.astype("datetime64[ns]").astype(np.int64))
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
@@ -1,9 +1,26 @@
 from app.core.database import SessionLocal
 from sqlalchemy.orm import Session
 
+from app.services.job_queue import JobQueue, job_queue
+from app.services.live_stream import StreamHub, stream_hub
+from app.services.market_data import MarketDataService, market_data
+from app.services.result_cache import ResultCache, result_cache
+
 def get_db() -> Session:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_market_data() -> MarketDataService:
+    return market_data
+
+def get_result_cache() -> ResultCache:
+    return result_cache
+
+def get_job_queue() -> JobQueue:
+    return job_queue
+
+def get_stream_hub() -> StreamHub:
+    return stream_hub
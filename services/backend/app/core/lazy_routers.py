@@ -0,0 +1,78 @@
+import importlib
+import threading
+from typing import List, NamedTuple, Optional
+
+
+class _Pending(NamedTuple):
+    module: str
+    prefix: str
+
+
+class LazyRouters:
+    """
+    Routers included into `app` on first use instead of at import.
+
+    Endpoint modules pull in NumPy, the strategies, SQLAlchemy and so on, so
+    importing them all up front dominates cold start. Each is registered
+    here by dotted path and prefix, and LazyRouterMiddleware imports and
+    includes it when the first request under that prefix arrives.
+
+    Every pending router whose prefix covers the path is loaded, in
+    registration order, so where routers overlap (two under /api/v1 both
+    declaring /status) the one registered first still wins, as it would
+    with eager includes. The OpenAPI schema and docs need everything and
+    load all of them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._pending: List[_Pending] = []
+        self._loaded: List[str] = []
+        self._lock = threading.Lock()
+
+    def add(self, module: str, prefix: str = ""):
+        """Register `module`'s `router` to be included under `prefix`."""
+        self._pending.append(_Pending(module, prefix.rstrip("/")))
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    @property
+    def loaded(self) -> List[str]:
+        return list(self._loaded)
+
+    def load(self, path: Optional[str] = None):
+        """Include the pending routers serving `path` (every one when None)."""
+        with self._lock:
+            due = [entry for entry in self._pending if path is None or _covers(entry.prefix, path)]
+            for entry in due:
+                router = importlib.import_module(entry.module).router
+                self.app.include_router(router, prefix=entry.prefix)
+                self._pending.remove(entry)
+                self._loaded.append(entry.module)
+            if due:
+                # Any schema built so far is missing the new routes
+                self.app.openapi_schema = None
+
+
+def _covers(prefix: str, path: str) -> bool:
+    return not prefix or path == prefix or path.startswith(prefix + "/")
+
+
+class LazyRouterMiddleware:
+    """Loads the routers a request needs (see LazyRouters) before it is routed."""
+
+    def __init__(self, app, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+        fastapi_app = routers.app
+        self._load_all = {
+            url for url in (fastapi_app.openapi_url, fastapi_app.docs_url, fastapi_app.redoc_url) if url
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.routers.pending:
+            path = scope["path"]
+            self.routers.load(None if path in self._load_all else path)
+        await self.app(scope, receive, send)
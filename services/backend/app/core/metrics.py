@@ -0,0 +1,250 @@
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.responses import JSONResponse, PlainTextResponse
+
+# Seconds; the stages of a backtest request range from microseconds (cache hits) to a slow download
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+    """Prometheus-style histogram with a fixed label set; thread-safe."""
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, [list(counts), total, count]) for key, (counts, total, count) in self._series.items())
+
+        for label_values, (counts, total, count) in series:
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total!r}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._histograms: List[Histogram] = []
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float], labels: Sequence[str] = ()) -> Histogram:
+        histogram = Histogram(name, help, buckets, labels)
+        self._histograms.append(histogram)
+        return histogram
+
+    def render(self) -> str:
+        """Everything recorded so far in the Prometheus text exposition format."""
+        return "\n".join(line for histogram in self._histograms for line in histogram.render()) + "\n"
+
+
+registry = Registry()
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", LATENCY_BUCKETS, ("method", "route", "status")
+)
+REQUEST_SIZE = registry.histogram(
+    "http_request_size_bytes", "HTTP request body size by route.", SIZE_BUCKETS, ("method", "route")
+)
+RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes", "HTTP response body size by route.", SIZE_BUCKETS, ("method", "route")
+)
+STAGE_DURATION = registry.histogram(
+    "stage_duration_seconds", "Time spent in each instrumented stage.", LATENCY_BUCKETS, ("stage",)
+)
+
+
+class RequestTrace:
+    """Spans recorded while serving one request, plus its profiler when profiling was asked for."""
+
+    def __init__(self, profile: bool = False):
+        self.spans: List[Tuple[str, float]] = []
+        self.profile = profile
+        self._profilers: Dict[int, cProfile.Profile] = {}
+        self._depth: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def start_profile(self) -> Optional[cProfile.Profile]:
+        """Start profiling the calling thread (cProfile is per thread); None if it already is."""
+        thread = threading.get_ident()
+        with self._lock:
+            depth = self._depth.get(thread, 0)
+            self._depth[thread] = depth + 1
+            if depth:
+                return None
+            profiler = self._profilers.setdefault(thread, cProfile.Profile())
+        profiler.enable()
+        return profiler
+
+    def stop_profile(self, profiler: Optional[cProfile.Profile]):
+        thread = threading.get_ident()
+        if profiler is not None:
+            profiler.disable()
+        with self._lock:
+            self._depth[thread] -= 1
+
+    def profile_report(self, limit: int = 40) -> str:
+        out = io.StringIO()
+        profilers = list(self._profilers.values())
+        stats = pstats.Stats(profilers[0], stream=out)
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.spans]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+@contextmanager
+def span(stage: str):
+    """
+    Time a stage of request handling into stage_duration_seconds.
+
+    Inside a request the span is also listed in its Server-Timing header,
+    and when the request is being profiled, work on a worker thread is
+    profiled from its outermost span.
+    """
+    trace = current_trace.get()
+    profiling = trace is not None and trace.profile
+    profiler = trace.start_profile() if profiling else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiling:
+            trace.stop_profile(profiler)
+        STAGE_DURATION.observe(elapsed, stage)
+        if trace is not None:
+            trace.spans.append((stage, elapsed))
+
+
+def timed(stage: str):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse whose body rendering is timed as the "serialize" stage."""
+
+    def render(self, content) -> bytes:
+        with span("serialize"):
+            return super().render(content)
+
+
+class MetricsMiddleware:
+    """
+    Records per-route latency, request and response sizes, and adds a
+    Server-Timing header listing the request's spans.
+
+    Routes are labelled by their template (/api/v1/jobs/{job_id}), so label
+    cardinality stays bounded. With `profiling` on, a request sent with
+    `X-Profile: 1` runs under cProfile (the event loop thread plus every
+    worker thread entering a span) and is answered with the profile as
+    text instead of its normal response. One request is profiled at a time;
+    concurrent requests still show up in the event loop part of it.
+    """
+
+    def __init__(self, app, profiling: bool = False):
+        self.app = app
+        self.profiling = profiling
+        self._profile_lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", ()))
+        profile = (
+            self.profiling
+            and headers.get(b"x-profile", b"").lower() in (b"1", b"true")
+            and self._profile_lock.acquire(blocking=False)
+        )
+        trace = RequestTrace(profile=profile)
+        token = current_trace.set(trace)
+        loop_profiler = trace.start_profile() if profile else None
+        start = time.perf_counter()
+        status = 500
+        response_bytes = 0
+
+        async def send_with_timing(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = (b"server-timing", trace.server_timing(time.perf_counter() - start).encode())
+                message = {**message, "headers": list(message.get("headers", ())) + [timing]}
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            if not profile:
+                await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_trace.reset(token)
+            if profile:
+                trace.stop_profile(loop_profiler)
+                self._profile_lock.release()
+
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUEST_DURATION.observe(elapsed, method, route, str(status))
+            REQUEST_SIZE.observe(int(headers.get(b"content-length", 0) or 0), method, route)
+            RESPONSE_SIZE.observe(response_bytes, method, route)
+
+        if profile:
+            report = PlainTextResponse(
+                f"{scope['method']} {scope['path']} -> {status} in {elapsed * 1000:.1f} ms\n\n{trace.profile_report()}"
+            )
+            await report(scope, receive, send)
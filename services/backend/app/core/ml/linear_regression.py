@@ -1,10 +1,44 @@
 import numpy as np
 
+SOLVERS = ("gd", "sgd", "lstsq")
+
+
 class LinearRegressionGD:
-    def __init__(self, lr=0.01, epochs=1000, normalize=True):
+    """
+    Linear regression with a choice of solver.
+
+    - "gd": full-batch gradient descent for `epochs` epochs (the original behaviour)
+    - "sgd": shuffled mini-batches, stopping once the training loss has not
+      improved by `tol` for `n_iter_no_change` epochs
+    - "lstsq": closed-form least squares
+
+    y may be 1D or 2D (one column per target); all targets are fitted at once.
+    partial_fit() updates the model from a new chunk without revisiting earlier
+    data: "lstsq" keeps running means and co-moments and re-solves exactly,
+    the gradient solvers take one SGD pass over the chunk.
+    """
+
+    def __init__(
+        self,
+        lr=0.01,
+        epochs=1000,
+        normalize=True,
+        solver="gd",
+        batch_size=32,
+        tol=1e-6,
+        n_iter_no_change=5,
+        random_state=None
+    ):
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {SOLVERS}")
         self.lr = lr
         self.epochs = epochs
         self.normalize = normalize
+        self.solver = solver
+        self.batch_size = batch_size
+        self.tol = tol
+        self.n_iter_no_change = n_iter_no_change
+        self.random_state = random_state
 
         self.w = None
         self.b = 0
@@ -12,42 +46,199 @@ class LinearRegressionGD:
         self.mean = None
         self.std = None
 
+        self.n_iter_ = 0
+        self.n_seen_ = 0
+        # Running mean and co-moment matrix of [X, y] (Chan et al. merge)
+        self._z_mean = None
+        self._z_comoment = None
+        self._rng = np.random.default_rng(random_state)
+
     def _normalize(self, X):
         if not self.normalize:
             return X
-        
-        if self.mean is None:
-            self.mean = X.mean(axis = 0)
-            self.std = X.std(axis=0) + 1e-8
-
         return (X - self.mean) / self.std
 
     def predict(self, X):
-        X = np.array(X, dtype=np.float32)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            # A single feature, as fit() takes it
+            X = X.reshape(-1, 1)
         X = self._normalize(X)
         return np.dot(X, self.w) + self.b
 
     def fit(self, X, y):
-        X = np.array(X, dtype=np.float32)
-        y = np.array(y, dtype=np.float32)
+        X, y = self._check(X, y)
+        self._reset()
+        self._update_moments(X, y)
+        self._set_scaler()
+
+        if self.solver == "lstsq":
+            self._solve_lstsq(X, y)
+            return self
 
         X = self._normalize(X)
+        self.w = np.zeros((X.shape[1],) + y.shape[1:])
+        self.b = np.zeros(y.shape[1:]) if y.ndim > 1 else 0.0
 
-        n_samples, n_features = X.shape
+        if self.solver == "gd":
+            self._fit_gd(X, y)
+        else:
+            self._fit_sgd(X, y)
+        return self
 
-        self.w = np.zeros(n_features)
-        self.b = 0
+    def partial_fit(self, X, y):
+        """Update the fitted model with new rows (e.g. the latest bar)."""
+        X, y = self._check(X, y)
+        if self.w is None:
+            self._reset()
+        elif self.w.shape[0] != X.shape[1] or np.shape(self.b) != y.shape[1:]:
+            raise ValueError("partial_fit data does not match the shape the model was fitted with")
 
+        old_mean, old_std = self.mean, self.std
+        self._update_moments(X, y)
+        self._set_scaler()
+
+        if self.solver == "lstsq":
+            self._solve_moments()
+            return self
+
+        if self.w is None:
+            self.w = np.zeros((X.shape[1],) + y.shape[1:])
+            self.b = np.zeros(y.shape[1:]) if y.ndim > 1 else 0.0
+        elif self.normalize:
+            # Re-express the current model in the updated scaling so its predictions are unchanged
+            raw_w = self.w / _column(old_std, self.w)
+            self.b = self.b + np.dot(self.mean - old_mean, raw_w)
+            self.w = raw_w * _column(self.std, self.w)
+
+        self._sgd_epoch(self._normalize(X), y)
+        self.n_iter_ += 1
+        return self
+
+    def mse(self, y_true, y_pred):
+        return np.mean((y_true - y_pred) ** 2)
+
+    # Solvers
+
+    def _fit_gd(self, X, y):
+        n_samples = X.shape[0]
         for _ in range(self.epochs):
             y_pred = np.dot(X, self.w) + self.b
 
             error = y_pred - y
 
             dw = (1/n_samples) * np.dot(X.T, error)
-            db = (1/n_samples) * np.sum(error)
+            db = (1/n_samples) * np.sum(error, axis=0)
 
             self.w -= self.lr * dw
             self.b -= self.lr * db
+        self.n_iter_ = self.epochs
 
-    def mse(self, y_true, y_pred):
-        return np.mean((y_true - y_pred) ** 2)
\ No newline at end of file
+    def _fit_sgd(self, X, y):
+        best = np.inf
+        stale = 0
+        self.n_iter_ = 0
+        for _ in range(self.epochs):
+            self._sgd_epoch(X, y)
+            self.n_iter_ += 1
+
+            loss = self.mse(y, np.dot(X, self.w) + self.b)
+            if not np.isfinite(loss):
+                raise ValueError("SGD diverged; lower the learning rate")
+            if loss > best - self.tol:
+                stale += 1
+                if stale >= self.n_iter_no_change:
+                    break
+            else:
+                stale = 0
+            best = min(best, loss)
+
+    def _sgd_epoch(self, X, y):
+        order = self._rng.permutation(len(X))
+        for start in range(0, len(X), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            error = np.dot(X[batch], self.w) + self.b - y[batch]
+            self.w -= self.lr * np.dot(X[batch].T, error) / len(batch)
+            self.b -= self.lr * np.sum(error, axis=0) / len(batch)
+
+    def _solve_lstsq(self, X, y):
+        # Centring absorbs the intercept and keeps the problem well conditioned
+        X_centred = X - self._z_mean[:X.shape[1]]
+        y_centred = y - self._z_mean[X.shape[1]:].reshape(y.shape[1:])
+        raw_w = np.linalg.lstsq(X_centred, y_centred, rcond=None)[0]
+        self._set_raw(raw_w)
+
+    def _solve_moments(self):
+        # Normal equations on the centred co-moments; lstsq copes with singular features
+        d = len(self._z_mean) - self._n_targets
+        sxx = self._z_comoment[:d, :d]
+        sxy = self._z_comoment[:d, d:]
+        raw_w = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+        self._set_raw(raw_w if self._y_2d else raw_w[:, 0])
+
+    def _set_raw(self, raw_w):
+        # Store weights for normalized inputs: x @ raw_w + b == normalize(x) @ w + b'
+        d = raw_w.shape[0]
+        x_mean = self._z_mean[:d]
+        y_mean = self._z_mean[d:] if self._y_2d else self._z_mean[d]
+        raw_b = y_mean - np.dot(x_mean, raw_w)
+        if self.normalize:
+            self.w = raw_w * _column(self.std, raw_w)
+            self.b = raw_b + np.dot(self.mean, raw_w)
+        else:
+            self.w = raw_w
+            self.b = raw_b
+        self.n_iter_ = 1
+
+    # Running statistics
+
+    def _check(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if y.ndim not in (1, 2) or len(y) != len(X):
+            raise ValueError("y must have one row (or one value) per row of X")
+        return X, y
+
+    def _reset(self):
+        self.w = None
+        self.b = 0
+        self.mean = None
+        self.std = None
+        self.n_iter_ = 0
+        self.n_seen_ = 0
+        self._z_mean = None
+        self._z_comoment = None
+        self._rng = np.random.default_rng(self.random_state)
+
+    def _update_moments(self, X, y):
+        self._y_2d = y.ndim == 2
+        self._n_targets = y.shape[1] if self._y_2d else 1
+        Z = np.column_stack([X, y])
+        n_b = len(Z)
+        mean_b = Z.mean(axis=0)
+        centred = Z - mean_b
+        comoment_b = centred.T @ centred
+
+        if self.n_seen_ == 0:
+            self._z_mean, self._z_comoment = mean_b, comoment_b
+        else:
+            n_a = self.n_seen_
+            n = n_a + n_b
+            delta = mean_b - self._z_mean
+            self._z_comoment = self._z_comoment + comoment_b + np.outer(delta, delta) * (n_a * n_b / n)
+            self._z_mean = self._z_mean + delta * (n_b / n)
+        self.n_seen_ += n_b
+
+    def _set_scaler(self):
+        if not self.normalize:
+            return
+        d = len(self._z_mean) - self._n_targets
+        self.mean = self._z_mean[:d].copy()
+        self.std = np.sqrt(np.diag(self._z_comoment)[:d] / self.n_seen_) + 1e-8
+
+
+def _column(scale, like):
+    # Per-feature scale broadcast over target columns
+    return scale[:, None] if np.ndim(like) == 2 else scale
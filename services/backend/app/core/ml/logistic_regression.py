@@ -1,35 +1,150 @@
 import numpy as np
 
 class LogisticRegression:
-    def __init__(self, lr = 0.01, n_iters=1000):
-        self.lr = 0.01
-        self.n_iters = 1000
+    """
+    Binary logistic regression trained by (mini-batch) gradient descent.
+
+    X may be (n_samples, n_features) for one model, or (n_models, n_samples,
+    n_features) to train one independent model per leading index (e.g. per
+    ticker) in the same array operations; y is then (n_models, n_samples).
+    Rows containing NaN are ignored, so series of different lengths can be
+    stacked by padding with NaN.
+
+    batch_size=None trains full-batch; l2 adds 0.5 * l2 * |w|^2 to the loss
+    (the bias is not penalised). With warm_start, fit() continues from the
+    current weights instead of starting from zero.
+    """
+
+    def __init__(
+        self,
+        lr=0.01,
+        n_iters=1000,
+        batch_size=None,
+        l2=0.0,
+        warm_start=False,
+        tol=None,
+        random_state=None
+    ):
+        self.lr = lr
+        self.n_iters = n_iters
+        self.batch_size = batch_size
+        self.l2 = l2
+        self.warm_start = warm_start
+        self.tol = tol
+        self.random_state = random_state
+
         self.w = None
         self.b = 0.0
+        self.n_iter_ = 0
+        self._rng = np.random.default_rng(random_state)
+
+    @staticmethod
+    def sigmoid(z):
+        # exp() only ever sees non-positive arguments, so it cannot overflow
+        z = np.asarray(z, dtype=np.float64)
+        e = np.exp(-np.abs(z))
+        return np.where(z >= 0, 1 / (1 + e), e / (1 + e))
 
-    def sigmoid(self, z):
-        return 1 / (1 + np.exp(z))
-    
     def fit(self, X, y):
-        n_samples, n_weights = X.shape
-        self.w = np.zeros(n_samples)
+        X, y, weight = self._check(X, y)
+        batched = X.ndim == 3
+        n_samples = X.shape[-2]
 
-        for _ in range(self.n_iterts):
-            linear_model = np.dot(X, self.w) + self.b
-            y_pred = self.sigmoid(linear_model)
+        if self.w is None or not self.warm_start or self.w.shape != X.shape[:-2] + X.shape[-1:]:
+            self.w = np.zeros(X.shape[:-2] + X.shape[-1:])
+            self.b = np.zeros(X.shape[0]) if batched else 0.0
+        self.n_iter_ = 0
 
-            dw = (1 / n_samples) * np.dot(X.T, (y_pred - y))
-            db = (1 / n_samples) + np.sum(y_pred - y)
+        batch_size = self.batch_size or n_samples
+        previous = self._loss(X, y, weight) if self.tol is not None else None
+        for _ in range(self.n_iters):
+            order = self._rng.permutation(n_samples) if batch_size < n_samples else slice(None)
+            for start in range(0, n_samples, batch_size):
+                rows = order[start:start + batch_size] if batch_size < n_samples else order
+                self._step(X[..., rows, :], y[..., rows], weight[..., rows])
+            self.n_iter_ += 1
+
+            if self.tol is not None:
+                current = self._loss(X, y, weight)
+                if np.all(previous - current < self.tol):
+                    break
+                previous = current
+        return self
 
-            self.w = -self.lr * dw
-            self.b = -self.lr * db
-        
     def predict_prob(self, X):
-        linear_model = np.dot(X, self.w) + self.b
-        return self.sigmoid(linear_model)
+        X = np.asarray(X, dtype=np.float64)
+        return self.sigmoid(self._linear(X))
 
     def predict(self, X, threshold = 0.5):
         return np.where(self.predict_prob(X) >= threshold, 1, 0)
- 
 
-    
\ No newline at end of file
+    def loss(self, X, y):
+        """Mean log-loss (plus the L2 term) per model."""
+        X, y, weight = self._check(X, y)
+        return self._loss(X, y, weight)
+
+    def score(self, X, y):
+        """Accuracy per model on the rows without NaN."""
+        X, y, weight = self._check(X, y)
+        correct = (self.predict(X) == y) * weight
+        return correct.sum(axis=-1) / np.maximum(weight.sum(axis=-1), 1)
+
+    def _linear(self, X):
+        if X.ndim == 3:
+            return np.einsum("mnd,md->mn", X, self.w) + self.b[:, None]
+        return np.dot(X, self.w) + self.b
+
+    def _step(self, X, y, weight):
+        counts = np.maximum(weight.sum(axis=-1), 1)
+        error = (self.predict_prob(X) - y) * weight
+        if X.ndim == 3:
+            dw = np.einsum("mnd,mn->md", X, error) / counts[:, None]
+        else:
+            dw = np.dot(X.T, error) / counts
+        db = error.sum(axis=-1) / counts
+
+        self.w -= self.lr * (dw + self.l2 * self.w)
+        self.b -= self.lr * db
+
+    def _loss(self, X, y, weight):
+        z = self._linear(X)
+        # log(1 + e^z) - y*z is the log-loss written without computing a probability
+        losses = (np.logaddexp(0, z) - y * z) * weight
+        penalty = 0.5 * self.l2 * np.sum(self.w ** 2, axis=-1)
+        return losses.sum(axis=-1) / np.maximum(weight.sum(axis=-1), 1) + penalty
+
+    def _check(self, X, y):
+        # No copy for float64 input (e.g. memory-mapped feature matrices) unless there is padding to clear
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if X.ndim not in (2, 3) or y.shape != X.shape[:-1]:
+            raise ValueError("X must be (samples, features) or (models, samples, features) with y matching its leading axes")
+
+        valid = np.isfinite(X).all(axis=-1) & np.isfinite(y)
+        weight = valid.astype(np.float64)
+        if not valid.all():
+            # Padding rows get weight 0; zeroing them keeps NaN out of the sums
+            X = np.where(valid[..., None], X, 0.0)
+            y = np.where(valid, y, 0.0)
+        return X, y, weight
+
+
+def direction_dataset(closes, lags: int = 5):
+    """
+    Lagged log returns as features and next-bar direction (1 up, 0 otherwise) as labels.
+
+    closes is (n_bars,) or (n_tickers, n_bars); the result has matching leading
+    axes, with NaN rows wherever a return is unavailable.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(closes), axis=-1)
+
+    n = returns.shape[-1] - lags
+    if n < 1:
+        raise ValueError(f"Need at least {lags + 2} closes for {lags} lags")
+
+    X = np.stack([returns[..., i:i + n] for i in range(lags)], axis=-1)
+    following = returns[..., lags:]
+    y = np.where(np.isnan(following), np.nan, (following > 0).astype(np.float64))
+    return X, y
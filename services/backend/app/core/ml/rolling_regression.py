@@ -0,0 +1,115 @@
+from typing import NamedTuple
+
+import numpy as np
+
+# Windows solved per block; each block re-centres its prefix sums (see rolling_ols)
+_BLOCK = 8192
+
+
+class RollingOLS(NamedTuple):
+    """
+    Per-window OLS fits, one row per window end (NaN until the first full window).
+
+    Predictions should go through predict(), which works relative to the
+    window means and so stays accurate where the intercept is large (e.g. a
+    time index in the millions).
+    """
+    coef: np.ndarray        # (n, p)
+    intercept: np.ndarray   # (n,)
+    r2: np.ndarray          # (n,)
+    x_mean: np.ndarray      # (n, p)
+    y_mean: np.ndarray      # (n,)
+
+    def predict(self, X) -> np.ndarray:
+        """Value of each window's fit at X (n rows, one per window)."""
+        X = np.asarray(X, dtype=np.float64).reshape(self.x_mean.shape)
+        return self.y_mean + np.einsum("ij,ij->i", X - self.x_mean, self.coef)
+
+
+def rolling_ols(X, y, window: int) -> RollingOLS:
+    """
+    Ordinary least squares (with intercept) of y on X over every trailing window.
+
+    Sums of the cross products of [X, y] come from cumulative sums, so each
+    window costs O(p^2) to assemble plus one p x p solve, whatever its length.
+    The prefix sums restart every block of windows, centred on that block's
+    data, which keeps them from losing precision over long series.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    n, p = X.shape
+    if len(y) != n or y.ndim != 1:
+        raise ValueError("y must be one-dimensional with one value per row of X")
+    if window < p + 1:
+        raise ValueError(f"window must be at least {p + 1} for {p} feature(s)")
+
+    coef = np.full((n, p), np.nan)
+    intercept = np.full(n, np.nan)
+    r2 = np.full(n, np.nan)
+    x_mean = np.full((n, p), np.nan)
+    y_mean = np.full(n, np.nan)
+
+    block = max(_BLOCK, window)
+    for first_end in range(window - 1, n, block):
+        last_end = min(first_end + block, n)
+        rows = slice(first_end - window + 1, last_end)
+        ends = slice(first_end, last_end)
+
+        # Offsets local to the block keep the cumulative sums small
+        x_offset = X[rows].mean(axis=0)
+        y_offset = y[rows].mean()
+        Z = np.column_stack([X[rows] - x_offset, y[rows] - y_offset])
+
+        sums = _window_sums(Z, window)
+        cross = _window_sums(Z[:, :, None] * Z[:, None, :], window)
+
+        mean = sums / window
+        # Centred (co)variance sums within each window
+        centred = cross - window * mean[:, :, None] * mean[:, None, :]
+        sxx = centred[:, :p, :p]
+        sxy = centred[:, :p, p]
+        syy = centred[:, p, p]
+
+        beta = _solve(sxx, sxy)
+        explained = np.einsum("ij,ij->i", beta, sxy)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2[ends] = np.where(syy > 0, explained / syy, np.nan)
+
+        coef[ends] = beta
+        x_mean[ends] = mean[:, :p] + x_offset
+        y_mean[ends] = mean[:, p] + y_offset
+        intercept[ends] = y_mean[ends] - np.einsum("ij,ij->i", x_mean[ends], beta)
+
+    return RollingOLS(coef, intercept, np.clip(r2, 0.0, 1.0), x_mean, y_mean)
+
+
+def rolling_trend(values, window: int, horizon: int = 1):
+    """
+    Straight-line fit of `values` against bar number over each trailing window.
+
+    Returns (slope per bar, r2, forecast `horizon` bars after the window end);
+    NaN for the first window-1 bars.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    index = np.arange(len(values), dtype=np.float64)
+    fit = rolling_ols(index, values, window)
+    forecast = fit.predict(index + horizon)
+    return fit.coef[:, 0], fit.r2, forecast
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    # Sum over each trailing window from one cumulative sum along axis 0
+    csum = np.cumsum(values, axis=0)
+    out = csum[window - 1:].copy()
+    out[1:] -= csum[:-window]
+    return out
+
+
+def _solve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.solve(a, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        # A flat feature in some window; the pseudo-inverse gives the minimum-norm fit
+        return np.einsum("nij,nj->ni", np.linalg.pinv(a), b)
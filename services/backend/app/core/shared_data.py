@@ -0,0 +1,122 @@
+import atexit
+import uuid
+import weakref
+from multiprocessing import shared_memory
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from app.core.dataset import COLUMNS, OHLCVDataset
+
+SEGMENT_PREFIX = "algobars_"
+
+# Every column is 8 bytes wide (int64 timestamps, float64 prices/volume)
+_ITEM_SIZE = 8
+
+
+class SharedBarsHandle(NamedTuple):
+    """Picklable reference to a published dataset; this is all a worker receives."""
+    name: str
+    length: int
+    tz: Optional[str] = None
+
+
+class SharedOHLCV:
+    """
+    Owner side of a dataset published into one `multiprocessing.shared_memory` segment.
+
+    Columns are laid out back to back in COLUMNS order. The owner is the only
+    process that unlinks the segment: on close(), when used as a context manager,
+    when garbage-collected, or at interpreter exit. If the owner dies without any
+    of those running, the multiprocessing resource tracker unlinks it.
+    """
+
+    def __init__(self, bars: OHLCVDataset):
+        n = len(bars)
+        self._shm = shared_memory.SharedMemory(
+            name=SEGMENT_PREFIX + uuid.uuid4().hex[:16],
+            create=True,
+            size=max(1, n * _ITEM_SIZE * len(COLUMNS))
+        )
+        self.handle = SharedBarsHandle(self._shm.name, n, bars.tz)
+
+        for i, name in enumerate(COLUMNS):
+            column = getattr(bars, name)
+            view = np.ndarray(n, dtype=column.dtype, buffer=self._shm.buf, offset=i * n * _ITEM_SIZE)
+            view[:] = column
+            del view
+
+        self._finalizer = weakref.finalize(self, _release, self._shm)
+
+    @property
+    def name(self) -> str:
+        return self.handle.name
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self):
+        """Unlink the segment. Workers that are still attached keep their mapping."""
+        self._finalizer()
+
+    def __enter__(self) -> "SharedOHLCV":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _release(shm: shared_memory.SharedMemory):
+    try:
+        shm.close()
+    except BufferError:
+        # Views handed out in this process are still alive; the mapping goes with them
+        pass
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# Worker side: segments this process has attached to, kept open while views exist
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def attach_shared(handle: SharedBarsHandle) -> OHLCVDataset:
+    """Read-only, zero-copy dataset backed by a segment published with SharedOHLCV."""
+    shm = _attached.get(handle.name)
+    if shm is None:
+        shm = _open_segment(handle.name)
+        _attached[handle.name] = shm
+
+    n = handle.length
+    columns = {}
+    for i, name in enumerate(COLUMNS):
+        dtype = np.int64 if name == "timestamp" else np.float64
+        view = np.ndarray(n, dtype=dtype, buffer=shm.buf, offset=i * n * _ITEM_SIZE)
+        view.flags.writeable = False
+        columns[name] = view
+
+    return OHLCVDataset.from_columns(columns, tz=handle.tz)
+
+
+def detach_all():
+    """Drop this process's attachments (the owner still decides when to unlink)."""
+    while _attached:
+        _, shm = _attached.popitem()
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python 3.13+: attaching must not register the segment for cleanup here
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+atexit.register(detach_all)
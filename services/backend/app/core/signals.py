@@ -0,0 +1,131 @@
+from typing import Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from app.core.dataset import OHLCVDataset
+
+BUY = 1
+SELL = -1
+
+_CODES = {'BUY': BUY, 'SELL': SELL}
+
+# describe(index, timestamp, price, buy, **indicator values at the bar) -> signal record
+Describe = Callable[..., Dict]
+
+
+class SignalSet:
+    """
+    A strategy's signals over a series of bars, kept as arrays.
+
+    `codes` holds BUY (+1), SELL (-1) or 0 for every bar and `columns` the
+    indicator values behind them, aligned with the bars. Backtests read
+    `codes` directly. The signal records the API returns (timestamps,
+    rounded values, a reason string) are only built by records(), and only
+    for the slice of signals asked for: with dense signals, formatting them
+    all used to cost more than computing them.
+    """
+
+    def __init__(
+        self,
+        bars: OHLCVDataset,
+        codes: np.ndarray,
+        columns: Optional[Mapping[str, np.ndarray]] = None,
+        describe: Optional[Describe] = None,
+        first_index: int = 0
+    ):
+        codes = np.asarray(codes, dtype=np.int8)
+        if len(codes) != len(bars):
+            raise ValueError(f"Expected one signal code per bar ({len(bars)}), got {len(codes)}")
+        self.bars = bars
+        self.codes = codes
+        self.columns = dict(columns or {})
+        self.describe = describe
+        # Index of bars[0] in the series record indices refer to (on_bars batches continue a history)
+        self.first_index = first_index
+        self._indices: Optional[np.ndarray] = None
+        self._records: Optional[List[Dict]] = None
+
+    @classmethod
+    def empty(cls, bars: OHLCVDataset) -> "SignalSet":
+        return cls(bars, np.zeros(len(bars), dtype=np.int8))
+
+    @classmethod
+    def from_records(cls, bars: OHLCVDataset, records: List[Dict]) -> "SignalSet":
+        """Wrap already-built records (a strategy with only generate_signals); a later signal on a bar wins."""
+        signals = cls(bars, _codes_from_records(records, len(bars)))
+        signals._records = list(records)
+        return signals
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Positions (in `bars`) of the bars that signal, in order."""
+        if self._indices is None:
+            self._indices = np.flatnonzero(self.codes)
+        return self._indices
+
+    def __len__(self) -> int:
+        return len(self._records) if self._records is not None else len(self.indices)
+
+    @property
+    def buy_count(self) -> int:
+        return int(np.count_nonzero(self.codes == BUY))
+
+    @property
+    def sell_count(self) -> int:
+        return int(np.count_nonzero(self.codes == SELL))
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """Signal records for signals[start:stop], e.g. one page of an API response."""
+        if self._records is not None:
+            return self._records[start:stop]
+
+        indices = self.indices[start:stop]
+        timestamps = self.bars.iso_timestamps(indices)
+        prices = self.bars.close[indices].tolist()
+        buys = (self.codes[indices] == BUY).tolist()
+        values = {name: column[indices].tolist() for name, column in self.columns.items()}
+        names = list(values)
+        describe = self.describe or _plain
+
+        return [
+            describe(self.first_index + i, timestamp, price, buy, **dict(zip(names, row)))
+            for i, timestamp, price, buy, *row in zip(
+                indices.tolist(), timestamps, prices, buys, *(values[name] for name in names)
+            )
+        ]
+
+    def since(self, index: int) -> List[Dict]:
+        """Records of the signals at or after record index `index` (only those are built)."""
+        if self._records is not None:
+            return [record for record in self._records if record['index'] >= index]
+        return self.records(int(np.searchsorted(self.indices, index - self.first_index)))
+
+
+def _plain(index: int, timestamp, price: float, buy: bool, **values) -> Dict:
+    return {"index": index, "timestamp": timestamp, 'type': 'BUY' if buy else 'SELL', 'price': price, **values}
+
+
+def signal_codes(signals, n: int) -> np.ndarray:
+    """
+    BUY/SELL/0 code per bar from a SignalSet, a code array or a list of
+    signal records (where a later signal on the same bar wins).
+    """
+    if isinstance(signals, SignalSet):
+        codes = signals.codes
+    elif isinstance(signals, np.ndarray):
+        codes = signals.astype(np.int8, copy=False)
+    else:
+        return _codes_from_records(signals, n)
+
+    if len(codes) != n:
+        raise ValueError(f"Expected one signal code per bar ({n}), got {len(codes)}")
+    return codes
+
+
+def _codes_from_records(records: List[Dict], n: int) -> np.ndarray:
+    codes = np.zeros(n, dtype=np.int8)
+    for record in records:
+        i = record['index']
+        if 0 <= i < n:
+            codes[i] = _CODES.get(record['type'], 0)
+    return codes
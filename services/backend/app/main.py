@@ -1,12 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.routes import router as api_router
+from app.core.config import settings
+from app.core.lazy_routers import LazyRouterMiddleware, LazyRouters
+from app.core.metrics import MetricsMiddleware, TimedJSONResponse
 
-from app.api.v1.endpoints import indicators as indicators_router
-from app.api.v1.endpoints import ohlcv as ohlcv_router
+from app.api.v1.endpoints import metrics as metrics_router
 
 
-app = FastAPI(title="Algorithmic Trading Research Platform")
+app = FastAPI(title="Algorithmic Trading Research Platform", default_response_class=TimedJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,8 +16,26 @@ app.add_middleware(
     allow_methods=["*"],   # allow all HTTP methods
     allow_headers=["*"],   # allow all headers
 )
+app.add_middleware(MetricsMiddleware, profiling=settings.PROFILING_ENABLED)
 
-app.include_router(api_router, prefix="/api/v1")
-app.include_router(indicators_router.router, prefix="/api/v1/indicators")
-app.include_router(ohlcv_router.router, prefix="/api/v1")
+# The API routers (and NumPy, pandas, yfinance, SQLAlchemy behind them) load on first use
+routers = LazyRouters(app)
+routers.add("app.api.v1.routes", prefix="/api/v1")
+routers.add("app.api.v1.endpoints.indicators", prefix="/api/v1/indicators")
+routers.add("app.api.v1.endpoints.ohlcv", prefix="/api/v1")
+routers.add("app.api.v1.endpoints.strategies", prefix="/api/v1/strategies")
+routers.add("app.api.v1.endpoints.jobs", prefix="/api/v1/jobs")
+routers.add("app.api.v1.endpoints.analytics", prefix="/api/v1/analytics")
+routers.add("app.api.v1.endpoints.stream", prefix="/api/v1/stream")
+app.add_middleware(LazyRouterMiddleware, routers=routers)
 
+if not settings.LAZY_ROUTERS:
+    routers.load()
+
+app.include_router(metrics_router.router)
+
+
+@app.get("/health")
+def health():
+    """Liveness check; answers without loading any of the API routers."""
+    return {"status": "ok", "routers_loaded": routers.loaded}
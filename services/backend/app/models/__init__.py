@@ -0,0 +1,4 @@
+from app.models.backtest import BacktestRun, Trade
+from app.models.market_data import Bar, BarSeries
+
+__all__ = ["Bar", "BarSeries", "BacktestRun", "Trade"]
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+
+
+class BacktestRun(Base):
+    __tablename__ = "backtest_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    ticker: Mapped[str] = mapped_column(String(20), index=True, nullable=False)
+    period: Mapped[str] = mapped_column(String(8), nullable=False)
+    interval: Mapped[str] = mapped_column(String(8), nullable=False)
+    strategy: Mapped[str] = mapped_column(String(32), nullable=False)
+    strategy_parameters: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    engine_parameters: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+
+    initial_capital: Mapped[float] = mapped_column(Float, nullable=False)
+    final_capital: Mapped[float] = mapped_column(Float, nullable=False)
+    total_return_percent: Mapped[float] = mapped_column(Float, nullable=False)
+    total_trades: Mapped[int] = mapped_column(Integer, nullable=False)
+    metrics: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+
+    trades: Mapped[List["Trade"]] = relationship(
+        back_populates="run",
+        cascade="all, delete-orphan",
+        order_by="Trade.id"
+    )
+
+
+class Trade(Base):
+    __tablename__ = "backtest_trades"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("backtest_runs.id", ondelete="CASCADE"), index=True, nullable=False)
+
+    entry_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    exit_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    entry_price: Mapped[float] = mapped_column(Float, nullable=False)
+    exit_price: Mapped[float] = mapped_column(Float, nullable=False)
+    shares: Mapped[float] = mapped_column(Float, nullable=False)
+    pnl: Mapped[float] = mapped_column(Float, nullable=False)
+    pnl_percent: Mapped[float] = mapped_column(Float, nullable=False)
+    holding_bars: Mapped[int] = mapped_column(Integer, nullable=False)
+    commission_total: Mapped[float] = mapped_column(Float, nullable=False)
+
+    run: Mapped[BacktestRun] = relationship(back_populates="trades")
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from sqlalchemy import BigInteger, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class Bar(Base):
+    """
+    One OHLCV bar. The (ticker, interval, ts) primary key is also the range-scan
+    index, so a ticker/interval/time-window read is a single index range query.
+    """
+    __tablename__ = "ohlcv_bars"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    interval: Mapped[str] = mapped_column(String(8), primary_key=True)
+    # Nanoseconds since the epoch (UTC), the same representation as OHLCVDataset.timestamp
+    ts: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    open: Mapped[float] = mapped_column(Float(precision=53), nullable=False)
+    high: Mapped[float] = mapped_column(Float(precision=53), nullable=False)
+    low: Mapped[float] = mapped_column(Float(precision=53), nullable=False)
+    close: Mapped[float] = mapped_column(Float(precision=53), nullable=False)
+    volume: Mapped[float] = mapped_column(Float(precision=53), nullable=False)
+
+
+class BarSeries(Base):
+    """Bookkeeping per (ticker, interval), the database counterpart of a BarCache entry."""
+    __tablename__ = "ohlcv_series"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    interval: Mapped[str] = mapped_column(String(8), primary_key=True)
+    # Earliest time (ns) the stored bars are known to be complete from
+    covered_from: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Epoch seconds of the last successful fetch
+    fetched_at: Mapped[float] = mapped_column(Float(precision=53), nullable=False)
+    tz: Mapped[Optional[str]] = mapped_column(String(64))
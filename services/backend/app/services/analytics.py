@@ -0,0 +1,255 @@
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+import indicators
+
+# Trading days; pass the bar count per year for intraday curves (e.g. 252 * 7 for 1h equities)
+PERIODS_PER_YEAR = 252
+
+
+def _as_curve(equity) -> np.ndarray:
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.ndim != 1:
+        raise ValueError("equity curve must be one-dimensional")
+    return equity
+
+
+def simple_returns(equity) -> np.ndarray:
+    equity = _as_curve(equity)
+    return np.diff(equity) / equity[:-1]
+
+
+def drawdown(equity):
+    """Running peak, drawdown from it (absolute) and drawdown as a fraction of the peak."""
+    equity = _as_curve(equity)
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = peaks - equity
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(peaks > 0, drawdowns / peaks, 0.0)
+    return peaks, drawdowns, fraction
+
+
+def max_drawdown(equity):
+    """Largest drawdown (absolute, percent of its peak), at the first bar where it occurs."""
+    peaks, drawdowns, _ = drawdown(equity)
+    if len(drawdowns) == 0:
+        return 0, 0
+    worst = int(np.argmax(drawdowns))
+    max_dd = float(drawdowns[worst]) if drawdowns[worst] > 0 else 0
+    max_dd_percent = (max_dd / peaks[worst]) * 100 if max_dd and peaks[worst] > 0 else 0
+    return max_dd, float(max_dd_percent)
+
+
+def sharpe_ratio(returns, periods_per_year: float = PERIODS_PER_YEAR) -> float:
+    """Annualised mean over standard deviation (population std, no risk-free rate)."""
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) == 0:
+        return 0
+    std = np.std(returns)
+    return float(np.mean(returns) / std * np.sqrt(periods_per_year)) if std > 0 else 0
+
+
+def underwater_duration(equity) -> np.ndarray:
+    """Bars since the last equity high (0 on a new high)."""
+    equity = _as_curve(equity)
+    peaks = np.maximum.accumulate(equity)
+    index = np.arange(len(equity))
+    last_high = np.maximum.accumulate(np.where(equity >= peaks, index, 0))
+    return index - last_high
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    """
+    Trailing-window maximum, expanding over the first window-1 values.
+
+    van Herk/Gil-Werman: split into blocks of `window`, take prefix maxima and
+    suffix maxima inside each block, and every window is the max of one suffix
+    and one prefix. Three comparisons per value regardless of the window.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if n == 0 or window == 1:
+        return x.copy()
+
+    # Front padding turns trailing windows into forward windows starting at 0..n-1
+    blocks = -(-(n + window - 1) // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[window - 1:window - 1 + n] = x
+
+    grid = padded.reshape(blocks, window)
+    prefix = np.maximum.accumulate(grid, axis=1).ravel()
+    suffix = np.maximum.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    starts = np.arange(n)
+    return np.maximum(suffix[starts], prefix[starts + window - 1])
+
+
+def _rolling_moments(returns: np.ndarray, window: int):
+    # Centre on the global mean so the cumulative sums inside sma() stay small
+    centre = float(np.mean(returns)) if len(returns) else 0.0
+    shifted = returns - centre
+    mean = indicators.sma(shifted, window)
+    second = indicators.sma(shifted * shifted, window)
+    variance = second - mean * mean
+    # A flat window leaves cancellation noise rather than an exact zero
+    variance[variance <= second * 1e-12] = 0.0
+    return mean + centre, variance
+
+
+def rolling_volatility(returns, window: int, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    returns = np.asarray(returns, dtype=np.float64)
+    _, variance = _rolling_moments(returns, window)
+    return np.sqrt(variance * periods_per_year)
+
+
+def rolling_sharpe(returns, window: int, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    returns = np.asarray(returns, dtype=np.float64)
+    mean, variance = _rolling_moments(returns, window)
+    std = np.sqrt(variance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, mean / std * np.sqrt(periods_per_year), np.where(np.isnan(std), np.nan, 0.0))
+
+
+def rolling_sortino(returns, window: int, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    """Mean return over downside deviation (root mean square of the negative returns)."""
+    returns = np.asarray(returns, dtype=np.float64)
+    mean = indicators.sma(returns, window)
+    downside = np.minimum(returns, 0.0)
+    downside_dev = np.sqrt(np.maximum(indicators.sma(downside * downside, window), 0.0))
+    # Windows without a single loss are exactly zero, not cumulative-sum residue
+    losses = np.cumsum(returns < 0)
+    if len(losses) >= window:
+        in_window = losses[window - 1:].copy()
+        in_window[1:] -= losses[:-window]
+        downside_dev[window - 1:][in_window == 0] = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            downside_dev > 0,
+            mean / downside_dev * np.sqrt(periods_per_year),
+            np.where(np.isnan(downside_dev), np.nan, 0.0)
+        )
+
+
+def rolling_calmar(equity, window: int, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    """
+    Annualised return over the last `window` bars divided by the worst drawdown
+    in those bars, with drawdowns measured from the trailing-window peak. NaN
+    until a full window is available; 0 when the window has no drawdown.
+    """
+    equity = _as_curve(equity)
+    n = len(equity)
+    out = np.full(n, np.nan)
+    if n <= window:
+        return out
+
+    peak = rolling_max(equity, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        depth = np.where(peak > 0, 1.0 - equity / peak, 0.0)
+    worst = rolling_max(depth, window)
+
+    growth = equity[window:] / equity[:-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annual = np.where(growth > 0, np.abs(growth) ** (periods_per_year / window) - 1.0, -1.0)
+        out[window:] = np.where(worst[window:] > 0, annual / worst[window:], 0.0)
+    return out
+
+
+def trade_stats(pnl, holding_bars=None) -> Dict:
+    """Win/loss statistics from an array of per-trade P&L."""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if len(pnl) == 0:
+        return {
+            'win_rate': 0,
+            'avg_win': 0,
+            'avg_loss': 0,
+            'profit_factor': 0,
+            'total_wins': 0,
+            'total_losses': 0,
+            'largest_win': 0,
+            'largest_loss': 0,
+            'avg_holding_bars': 0
+        }
+
+    wins = pnl > 0
+    win_pnl = pnl[wins]
+    loss_pnl = pnl[~wins]
+    gross_win = float(win_pnl.sum())
+    gross_loss = float(-loss_pnl.sum())
+
+    return {
+        'win_rate': round(len(win_pnl) / len(pnl) * 100, 2),
+        'avg_win': round(float(win_pnl.mean()), 2) if len(win_pnl) else 0,
+        'avg_loss': round(float(loss_pnl.mean()), 2) if len(loss_pnl) else 0,
+        'profit_factor': round(gross_win / gross_loss, 2) if gross_loss > 0 else float('inf'),
+        'total_wins': int(len(win_pnl)),
+        'total_losses': int(len(loss_pnl)),
+        'largest_win': round(float(win_pnl.max()), 2) if len(win_pnl) else 0,
+        'largest_loss': round(float(loss_pnl.min()), 2) if len(loss_pnl) else 0,
+        'avg_holding_bars': round(float(np.mean(holding_bars)), 1) if holding_bars is not None and len(holding_bars) else 0
+    }
+
+
+def curve_stats(equity, periods_per_year: float = PERIODS_PER_YEAR) -> Dict:
+    """Whole-curve drawdown, return and risk figures."""
+    equity = _as_curve(equity)
+    if len(equity) < 2:
+        raise ValueError("equity curve needs at least two points")
+
+    _, drawdowns, fraction = drawdown(equity)
+    worst = int(np.argmax(drawdowns))
+    max_dd, max_dd_percent = max_drawdown(equity)
+    returns = simple_returns(equity)
+    mean = float(np.mean(returns))
+    downside = np.minimum(returns, 0.0)
+    downside_dev = float(np.sqrt(np.mean(downside * downside)))
+
+    years = len(returns) / periods_per_year
+    growth = float(equity[-1] / equity[0])
+    cagr = growth ** (1 / years) - 1 if growth > 0 else -1.0
+    # Calmar uses the deepest drawdown relative to its peak, which need not be the largest in money
+    deepest = float(fraction.max())
+
+    return {
+        'total_return_percent': round((growth - 1) * 100, 4),
+        'cagr_percent': round(cagr * 100, 4),
+        'volatility_percent': round(float(np.std(returns)) * math.sqrt(periods_per_year) * 100, 4),
+        'sharpe_ratio': round(sharpe_ratio(returns, periods_per_year), 4),
+        'sortino_ratio': round(mean / downside_dev * math.sqrt(periods_per_year), 4) if downside_dev > 0 else 0,
+        'calmar_ratio': round(cagr / deepest, 4) if deepest > 0 else 0,
+        'max_drawdown': round(max_dd, 2),
+        'max_drawdown_percent': round(max_dd_percent, 2),
+        'max_drawdown_peak_index': int(np.argmax(equity[:worst + 1])),
+        'max_drawdown_trough_index': worst,
+        'max_underwater_bars': int(underwater_duration(equity).max()),
+    }
+
+
+def rolling_metrics(
+    equity,
+    window: int,
+    periods_per_year: float = PERIODS_PER_YEAR,
+    returns: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Rolling series aligned with the equity curve (index 0 has no return, so it is NaN).
+    """
+    equity = _as_curve(equity)
+    if returns is None:
+        returns = simple_returns(equity)
+
+    def aligned(series):
+        return np.concatenate(([np.nan], series))
+
+    _, _, fraction = drawdown(equity)
+    return {
+        'volatility': aligned(rolling_volatility(returns, window, periods_per_year)),
+        'sharpe': aligned(rolling_sharpe(returns, window, periods_per_year)),
+        'sortino': aligned(rolling_sortino(returns, window, periods_per_year)),
+        'calmar': rolling_calmar(equity, window, periods_per_year),
+        'drawdown_percent': fraction * 100,
+        'underwater_bars': underwater_duration(equity),
+    }
@@ -0,0 +1,161 @@
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.dataset import OHLCVDataset
+from app.core.metrics import span
+from app.services import sweep_service
+from app.services.backtest_service import BacktestEngine
+from app.services.result_cache import ResultCache, fingerprint, request_key
+from strategies.regression_strategy import LinearRegressionStrategy
+from strategies.rsi_strategy import RSIStrategy
+
+if TYPE_CHECKING:
+    from app.api.v1.endpoints.strategies import BacktestRequest, SweepRequest
+
+# BacktestRequest fields read by each strategy type
+STRATEGY_FIELDS = {
+    'rsi': ('rsi_period', 'oversold', 'overbought'),
+    'linear_regression': ('lookback', 'horizon', 'threshold', 'min_r2'),
+}
+STRATEGY_TYPES = tuple(STRATEGY_FIELDS)
+
+# Backtests and sweeps as run for a request, shared by the synchronous endpoints and /jobs.
+# Invalid requests raise ValueError; the routers answer those with a 400.
+
+
+def check_strategy_type(request: "BacktestRequest"):
+    if request.strategy_type.lower() not in STRATEGY_TYPES:
+        raise ValueError(f"Strategy type '{request.strategy_type}' not supported yet")
+
+
+def strategy_parameters(request: "BacktestRequest") -> Dict:
+    if request.strategy_type.lower() == 'linear_regression':
+        return {
+            'lookback': request.lookback,
+            'horizon': request.horizon,
+            'threshold': request.threshold,
+            'min_r2': request.min_r2
+        }
+    return {
+        'rsi_period': request.rsi_period,
+        'oversold': request.oversold,
+        'overbought': request.overbought
+    }
+
+
+def build_strategy(request: "BacktestRequest"):
+    parameters = strategy_parameters(request)
+    if request.strategy_type.lower() == 'linear_regression':
+        return LinearRegressionStrategy(**parameters)
+    return RSIStrategy(
+        period=parameters['rsi_period'],
+        oversold=parameters['oversold'],
+        overbought=parameters['overbought']
+    )
+
+
+def backtest(request: "BacktestRequest", bars: OHLCVDataset) -> Dict:
+    with span("generate_signals"):
+        signals = build_strategy(request).compute_signals(bars)
+
+    backtest_engine = BacktestEngine(
+        initial_capital=request.initial_capital,
+        commission=request.comission,
+        position_size=request.position_size,
+        engine=request.engine
+    )
+
+    with span("run_backtest"):
+        results = backtest_engine.run_backtest(signals, bars)
+
+    results['ticker'] = request.ticker
+    results['period'] = request.period
+    results['interval'] = request.interval
+    results['strategy'] = request.strategy_type
+    results['strategy_parameters'] = strategy_parameters(request)
+
+    return results
+
+
+def cached_backtest(cache: ResultCache, request: "BacktestRequest", bars: OHLCVDataset) -> Tuple[Dict, bool]:
+    """backtest() through the result cache; returns (results, whether they came from the cache)."""
+    # Everything that determines the result except the bars, which are fingerprinted
+    # Another strategy's parameters don't change the result
+    unused = {
+        name for strategy_type, names in STRATEGY_FIELDS.items()
+        if strategy_type != request.strategy_type.lower() for name in names
+    }
+    with span("cache_lookup"):
+        key = request_key(**request.model_dump(exclude={'save'} | unused))
+        data_fingerprint = fingerprint(bars)
+        results = cache.get(key, data_fingerprint)
+    if results is not None:
+        return results, True
+
+    results = backtest(request, bars)
+    cache.put(key, data_fingerprint, results)
+    return results, False
+
+
+def _sweep_values(values) -> List:
+    # A list of values, or a ParameterRange
+    if isinstance(values, (list, tuple)):
+        return list(values)
+    return sweep_service.parameter_range(values.start, values.stop, values.step)
+
+
+def sweep_parameter_sets(request: "SweepRequest") -> List[Dict]:
+    if request.rank_by not in sweep_service.RANKABLE_METRICS:
+        raise ValueError(
+            f"Cannot rank by '{request.rank_by}', expected one of {list(sweep_service.RANKABLE_METRICS)}"
+        )
+
+    grid = sweep_service.expand_grid({
+        'rsi_period': [int(v) for v in _sweep_values(request.rsi_period)],
+        'oversold': _sweep_values(request.oversold),
+        'overbought': _sweep_values(request.overbought)
+    })
+    parameter_sets = [p for p in grid if p['rsi_period'] >= 2 and p['oversold'] < p['overbought']]
+
+    if not parameter_sets:
+        raise ValueError("Parameter grid is empty")
+    if len(parameter_sets) > settings.SWEEP_MAX_COMBINATIONS:
+        raise ValueError(
+            f"Sweep has {len(parameter_sets)} combinations, limit is {settings.SWEEP_MAX_COMBINATIONS}"
+        )
+    return parameter_sets
+
+
+def new_sweep(request: "SweepRequest", bars: OHLCVDataset, parameter_sets: List[Dict]) -> sweep_service.ParameterSweep:
+    return sweep_service.ParameterSweep(
+        bars,
+        parameter_sets,
+        engine_settings={
+            'initial_capital': request.initial_capital,
+            'commission': request.comission,
+            'position_size': request.position_size,
+            'engine': request.engine
+        },
+        max_workers=min(request.max_workers or settings.SWEEP_MAX_WORKERS, settings.SWEEP_MAX_WORKERS),
+        sweep_id=request.sweep_id
+    )
+
+
+def sweep_response(request: "SweepRequest", sweep: sweep_service.ParameterSweep, results: List[Dict]) -> Dict:
+    ranked = sweep_service.rank_results(results, request.rank_by, request.descending)
+    if request.top_n:
+        ranked = ranked[:request.top_n]
+
+    return {
+        'sweep_id': sweep.sweep_id,
+        'ticker': request.ticker,
+        'period': request.period,
+        'interval': request.interval,
+        'strategy': 'rsi',
+        'rank_by': request.rank_by,
+        'total_combinations': sweep.total,
+        'evaluated': sweep.completed,
+        'cancelled': sweep.cancelled,
+        'max_workers': sweep.max_workers,
+        'results': ranked
+    }
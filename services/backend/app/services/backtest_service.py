@@ -1,53 +1,93 @@
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime
 
+from app.core.dataset import OHLCVDataset, as_dataset
+from app.core.signals import BUY, SELL, SignalSet, signal_codes
+from app.services import analytics
+
+ENGINES = ("vectorized", "loop")
+
 class BacktestEngine:
     def __init__(
         self,
         initial_capital: float = 10000.0,
         commission: float = 0.001,  # 0.1% commission per trade
-        position_size: float = 1.0   # Trade size as fraction of capital
+        position_size: float = 1.0,  # Trade size as fraction of capital
+        engine: str = "vectorized"   # "vectorized" (NumPy) or "loop" (bar-by-bar reference)
     ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown backtest engine '{engine}', expected one of {ENGINES}")
+
         self.initial_capital = initial_capital
         self.commission = commission
         self.position_size = position_size
+        self.engine = engine
     
     def run_backtest(
         self, 
-        signals: List[Dict], 
-        data: List[Dict]
+        signals: Union[SignalSet, np.ndarray, List[Dict]],
+        data: Union[OHLCVDataset, List[Dict]]
     ) -> Dict:
+        """`signals`: a strategy's SignalSet, its BUY/SELL/0 code array, or signal records."""
+        data = as_dataset(data)
+        codes = signal_codes(signals, len(data))
+
+        if self.engine == "loop":
+            capital, trades, equity_curve = self._run_loop(codes, data)
+        else:
+            capital, trades, equity_curve = self._run_vectorized(codes, data)
+
+        # Timestamps are only rendered for the bars that actually traded
+        self._attach_trade_times(trades, data)
+
+        # Calculate metrics
+        metrics = self._calculate_metrics(trades, equity_curve)
+        if isinstance(equity_curve, np.ndarray):
+            equity_curve = equity_curve.tolist()
+        
+        return {
+            'initial_capital': self.initial_capital,
+            'final_capital': capital,
+            'total_pnl': capital - self.initial_capital,
+            'total_return_percent': ((capital - self.initial_capital) / self.initial_capital) * 100,
+            'trades': trades,
+            'total_trades': len(trades),
+            'equity_curve': equity_curve,
+            'metrics': metrics,
+            'parameters': {
+                'commission': self.commission,
+                'position_size': self.position_size
+            }
+        }
+
+    def _run_loop(self, codes: np.ndarray, data: OHLCVDataset):
+        closes = data.close.tolist()
+
         capital = self.initial_capital
         position = None  # Current position (None, or dict with entry details)
         trades = []
         equity_curve = [self.initial_capital]
         
-        # Create a map of index to signal for quick lookup
-        signal_map = {signal['index']: signal for signal in signals}
-        
-        for i, candle in enumerate(data):
-            if i in signal_map:
-                signal = signal_map[i]
-                
-                if signal['type'] == 'BUY' and position is None:
+        for i, (close, code) in enumerate(zip(closes, codes.tolist())):
+            if code:
+                if code == BUY and position is None:
                     # Open long position
-                    entry_price = candle['close']
+                    entry_price = close
                     shares = (capital * self.position_size) / entry_price
                     commission_paid = (shares * entry_price) * self.commission
                     
                     position = {
                         'type': 'LONG',
                         'entry_price': entry_price,
-                        'entry_time': candle['timestamp'],
                         'entry_index': i,
                         'shares': shares,
                         'commission_paid': commission_paid
                     }
                 
-                elif signal['type'] == 'SELL' and position is not None:
+                elif code == SELL and position is not None:
                     # Close position
-                    exit_price = candle['close']
+                    exit_price = close
                     exit_commission = (position['shares'] * exit_price) * self.commission
                     
                     # Calculate P&L
@@ -59,8 +99,9 @@ class BacktestEngine:
                     
                     # Record trade
                     trade = {
-                        'entry_time': position['entry_time'],
-                        'exit_time': candle['timestamp'],
+                        # Bar indices for now, rendered as timestamps once the loop is done
+                        'entry_time': position['entry_index'],
+                        'exit_time': i,
                         'entry_price': position['entry_price'],
                         'exit_price': exit_price,
                         'shares': position['shares'],
@@ -77,30 +118,98 @@ class BacktestEngine:
             # Update equity curve
             if position is not None:
                 # Mark-to-market
-                current_value = capital + (candle['close'] - position['entry_price']) * position['shares']
+                current_value = capital + (close - position['entry_price']) * position['shares']
                 equity_curve.append(current_value)
             else:
                 equity_curve.append(capital)
         
-        # Calculate metrics
-        metrics = self._calculate_metrics(trades, equity_curve)
-        
-        return {
-            'initial_capital': self.initial_capital,
-            'final_capital': capital,
-            'total_pnl': capital - self.initial_capital,
-            'total_return_percent': ((capital - self.initial_capital) / self.initial_capital) * 100,
-            'trades': trades,
-            'total_trades': len(trades),
-            'equity_curve': equity_curve,
-            'metrics': metrics,
-            'parameters': {
-                'commission': self.commission,
-                'position_size': self.position_size
+        return capital, trades, equity_curve
+
+    def _run_vectorized(self, sig: np.ndarray, data: OHLCVDataset):
+        """Whole-array equivalent of _run_loop for the long-only, single-position model."""
+        n = len(data)
+        closes = data.close
+
+        # Flat -> BUY opens and long -> SELL closes; any other signal leaves the
+        # state alone, so an event only acts when it differs from the previous one.
+        events = np.flatnonzero(sig)
+        kinds = sig[events]
+        acts = kinds != np.concatenate(([-1], kinds[:-1]))
+        entries = events[acts & (kinds == 1)]
+        exits = events[acts & (kinds == -1)]
+
+        entry_price = closes[entries]
+        exit_price = closes[exits]
+        closed = len(exits)
+
+        # Each round trip scales capital by a fixed factor, so capital before
+        # every entry is a cumulative product
+        growth = 1 + self.position_size * (
+            (exit_price - entry_price[:closed])
+            - entry_price[:closed] * self.commission
+            - exit_price * self.commission
+        ) / entry_price[:closed]
+        capital_steps = self.initial_capital * np.concatenate(([1.0], np.cumprod(growth)))
+
+        shares = capital_steps[:len(entries)] * self.position_size / entry_price
+        entry_commission = shares * entry_price * self.commission
+        exit_commission = shares[:closed] * exit_price * self.commission
+        pnl = (
+            (exit_price - entry_price[:closed]) * shares[:closed]
+            - entry_commission[:closed]
+            - exit_commission
+        )
+
+        # Mark-to-market: realised capital plus the open position's unrealised P&L
+        opened = np.zeros(n, dtype=np.int64)
+        opened[entries] = 1
+        opened = np.cumsum(opened)
+        realised = np.zeros(n, dtype=np.int64)
+        realised[exits] = 1
+        realised = np.cumsum(realised)
+
+        equity = capital_steps[realised]
+        holding = opened > realised
+        current = opened[holding] - 1
+        equity[holding] += (closes[holding] - entry_price[current]) * shares[current]
+
+        trades = [
+            {
+                'entry_time': int(entry),
+                'exit_time': int(exit_),
+                'entry_price': e_price,
+                'exit_price': x_price,
+                'shares': qty,
+                'pnl': net,
+                'pnl_percent': (net / (e_price * qty)) * 100,
+                'holding_bars': int(exit_ - entry),
+                'commission_total': c_in + c_out
             }
-        }
-    
-    def _calculate_metrics(self, trades: List[Dict], equity_curve: List[float]) -> Dict:
+            for entry, exit_, e_price, x_price, qty, net, c_in, c_out in zip(
+                entries[:closed].tolist(),
+                exits.tolist(),
+                entry_price[:closed].tolist(),
+                exit_price.tolist(),
+                shares[:closed].tolist(),
+                pnl.tolist(),
+                entry_commission[:closed].tolist(),
+                exit_commission.tolist()
+            )
+        ]
+
+        equity_curve = np.concatenate(([self.initial_capital], equity))
+        return float(capital_steps[closed]), trades, equity_curve
+
+    def _attach_trade_times(self, trades: List[Dict], data: OHLCVDataset):
+        if not trades:
+            return
+        indices = [t['entry_time'] for t in trades] + [t['exit_time'] for t in trades]
+        stamps = data.iso_timestamps(indices)
+        for trade, entry_time, exit_time in zip(trades, stamps[:len(trades)], stamps[len(trades):]):
+            trade['entry_time'] = entry_time
+            trade['exit_time'] = exit_time
+
+    def _calculate_metrics(self, trades: List[Dict], equity_curve: Union[List[float], np.ndarray]) -> Dict:
         """Calculate performance metrics"""
         if not trades:
             return {
@@ -115,52 +224,29 @@ class BacktestEngine:
                 'total_losses': 0
             }
         
-        # Separate winning and losing trades
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        losing_trades = [t for t in trades if t['pnl'] <= 0]
-        
-        # Win rate
-        win_rate = (len(winning_trades) / len(trades)) * 100 if trades else 0
-        
-        # Average win/loss
-        avg_win = np.mean([t['pnl'] for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([t['pnl'] for t in losing_trades]) if losing_trades else 0
-        
-        # Profit factor
-        total_wins = sum(t['pnl'] for t in winning_trades)
-        total_losses = abs(sum(t['pnl'] for t in losing_trades))
-        profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
-        
-        # Maximum drawdown
-        peak = equity_curve[0]
-        max_dd = 0
-        max_dd_percent = 0
-        
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            dd = peak - value
-            dd_percent = (dd / peak) * 100 if peak > 0 else 0
-            
-            if dd > max_dd:
-                max_dd = dd
-                max_dd_percent = dd_percent
-        
+        pnl = np.fromiter((t['pnl'] for t in trades), dtype=float, count=len(trades))
+        holding_bars = np.fromiter((t['holding_bars'] for t in trades), dtype=float, count=len(trades))
+        stats = analytics.trade_stats(pnl, holding_bars)
+
+        equity = np.asarray(equity_curve, dtype=float)
+        max_dd, max_dd_percent = analytics.max_drawdown(equity)
+
         # Sharpe ratio (simplified - assumes daily returns)
-        returns = np.diff(equity_curve) / equity_curve[:-1]
-        sharpe_ratio = (np.mean(returns) / np.std(returns)) * np.sqrt(252) if len(returns) > 1 and np.std(returns) > 0 else 0
-        
+        returns = analytics.simple_returns(equity)
+        sharpe_ratio = analytics.sharpe_ratio(returns) if len(returns) > 1 else 0
+
         return {
-            'win_rate': round(win_rate, 2),
-            'avg_win': round(avg_win, 2),
-            'avg_loss': round(avg_loss, 2),
-            'profit_factor': round(profit_factor, 2),
+            'win_rate': stats['win_rate'],
+            'avg_win': stats['avg_win'],
+            'avg_loss': stats['avg_loss'],
+            'profit_factor': stats['profit_factor'],
             'max_drawdown': round(max_dd, 2),
             'max_drawdown_percent': round(max_dd_percent, 2),
             'sharpe_ratio': round(sharpe_ratio, 2),
-            'total_wins': len(winning_trades),
-            'total_losses': len(losing_trades),
-            'largest_win': round(max([t['pnl'] for t in winning_trades]), 2) if winning_trades else 0,
-            'largest_loss': round(min([t['pnl'] for t in losing_trades]), 2) if losing_trades else 0,
-            'avg_holding_bars': round(np.mean([t['holding_bars'] for t in trades]), 1) if trades else 0
-        }
\ No newline at end of file
+            'total_wins': stats['total_wins'],
+            'total_losses': stats['total_losses'],
+            'largest_win': stats['largest_win'],
+            'largest_loss': stats['largest_loss'],
+            'avg_holding_bars': stats['avg_holding_bars']
+        }
+
@@ -0,0 +1,52 @@
+import math
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.backtest import BacktestRun, Trade
+
+
+def _json_number(value):
+    # JSON columns reject NaN/inf (e.g. profit_factor with no losing trades)
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def save_backtest(db: Session, results: Dict) -> int:
+    """Persist a run_backtest result (with the endpoint's request fields) and return the run id."""
+    run = BacktestRun(
+        ticker=results['ticker'],
+        period=results['period'],
+        interval=results['interval'],
+        strategy=results['strategy'],
+        strategy_parameters=results.get('strategy_parameters', {}),
+        engine_parameters=results.get('parameters', {}),
+        initial_capital=results['initial_capital'],
+        final_capital=results['final_capital'],
+        total_return_percent=results['total_return_percent'],
+        total_trades=results['total_trades'],
+        metrics={key: _json_number(value) for key, value in results['metrics'].items()}
+    )
+    run.trades = [
+        Trade(
+            entry_time=_timestamp(trade['entry_time']),
+            exit_time=_timestamp(trade['exit_time']),
+            entry_price=trade['entry_price'],
+            exit_price=trade['exit_price'],
+            shares=trade['shares'],
+            pnl=trade['pnl'],
+            pnl_percent=trade['pnl_percent'],
+            holding_bars=trade['holding_bars'],
+            commission_total=trade['commission_total']
+        )
+        for trade in results['trades']
+    ]
+
+    db.add(run)
+    db.commit()
+    return run.id
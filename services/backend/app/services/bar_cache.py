@@ -0,0 +1,236 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.dataset import COLUMNS, OHLCVDataset
+from app.services.resampler import finer_intervals, resample
+
+# Seconds a stored series is served as-is before its tail is topped up
+FRESHNESS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+    "1d": 3600,
+    "5d": 6 * 3600,
+    "1wk": 6 * 3600,
+    "1mo": 24 * 3600,
+    "3mo": 24 * 3600,
+}
+
+_DAY = 24 * 3600
+
+PERIODS = {
+    "1d": _DAY,
+    "5d": 5 * _DAY,
+    "1mo": 31 * _DAY,
+    "3mo": 92 * _DAY,
+    "6mo": 183 * _DAY,
+    "1y": 366 * _DAY,
+    "2y": 731 * _DAY,
+    "5y": 1827 * _DAY,
+    "10y": 3653 * _DAY,
+}
+
+# yfinance counts these periods in trading days rather than calendar time
+TRADING_DAY_PERIODS = {"1d": 1, "5d": 5}
+
+_NS = 1_000_000_000
+_MAX_HISTORY = np.iinfo(np.int64).min
+
+
+def period_start(period: str, now: float) -> int:
+    """Earliest timestamp (ns since epoch) a request for `period` needs."""
+    if period == "max":
+        return _MAX_HISTORY
+    if period == "ytd":
+        year_start = datetime(datetime.fromtimestamp(now, timezone.utc).year, 1, 1, tzinfo=timezone.utc)
+        return int(year_start.timestamp()) * _NS
+    return int(now - PERIODS[period]) * _NS
+
+
+def slice_period(bars: OHLCVDataset, period: str, start: int) -> OHLCVDataset:
+    """The bars a yfinance request for `period` starting at `start` would return."""
+    timestamps = bars.timestamp
+
+    if period in TRADING_DAY_PERIODS and len(timestamps):
+        # Last N distinct session dates, like yfinance does on weekends/holidays
+        days = np.unique(timestamps // (_DAY * _NS))
+        start = int(days[-min(len(days), TRADING_DAY_PERIODS[period])]) * _DAY * _NS
+
+    return bars.between(start=start)
+
+
+class BarCache:
+    """
+    On-disk OHLCV store keyed by (ticker, interval).
+
+    Each key is one uncompressed .npz file holding the columns in COLUMNS plus
+    bookkeeping: the earliest time the stored history is known to cover and when
+    the tail was last fetched. Requests inside the covered range are served from
+    disk; stale entries only download the bars since the last stored timestamp.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        fetch: Callable,
+        clock: Callable[[], float] = time.time
+    ):
+        # fetch(ticker, interval, period=None, start=None) -> yfinance-style DataFrame
+        self.root = root
+        self.fetch = fetch
+        self.clock = clock
+
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def get(self, ticker: str, period: str, interval: str) -> OHLCVDataset:
+        if interval not in FRESHNESS or (period not in PERIODS and period not in ("ytd", "max")):
+            # Unknown periods/intervals go straight to the provider
+            return OHLCVDataset.from_frame(self.fetch(ticker, interval, period=period))
+
+        bars = self._get_resampled(ticker, period, interval)
+        if bars is not None:
+            return bars
+
+        with self._lock(ticker, interval):
+            now = self.clock()
+            start = period_start(period, now)
+            entry = self._read(ticker, interval)
+
+            if entry is None or entry["covered_from"] > start:
+                bars = OHLCVDataset.from_frame(self.fetch(ticker, interval, period=period))
+                if len(bars) == 0:
+                    if entry is None:
+                        return bars
+                else:
+                    entry = {
+                        "bars": bars if entry is None else entry["bars"].merge(bars),
+                        "covered_from": start if entry is None else min(entry["covered_from"], start),
+                        "fetched_at": now,
+                    }
+                    self._write(ticker, interval, entry)
+
+            elif now - entry["fetched_at"] > FRESHNESS[interval]:
+                self._top_up(ticker, interval, entry, now)
+
+        return slice_period(entry["bars"], period, start)
+
+    def _get_resampled(self, ticker: str, period: str, interval: str) -> Optional[OHLCVDataset]:
+        """The request built from finer stored bars, or None if no stored series covers it."""
+        start = period_start(period, self.clock())
+        if self._covers(ticker, interval, start):
+            # Stored at this interval already, which is cheaper to serve
+            return None
+        source = next((source for source in finer_intervals(interval) if self._covers(ticker, source, start)), None)
+        if source is None:
+            return None
+
+        with self._lock(ticker, source):
+            now = self.clock()
+            start = period_start(period, now)
+            entry = self._read(ticker, source)
+            if entry is None or entry["covered_from"] > start:
+                return None
+            # Top up as often as a series stored at the requested interval would be
+            if now - entry["fetched_at"] > FRESHNESS[interval]:
+                self._top_up(ticker, source, entry, now)
+
+        read_from = start
+        if period in TRADING_DAY_PERIODS:
+            # Session-based periods can reach back past a weekend or holiday
+            read_from = start - (TRADING_DAY_PERIODS[period] + 4) * _DAY * _NS
+        read_from = max(read_from, entry["covered_from"])
+        # A day of lead-in so the first session's buckets align as usual; buckets
+        # starting before read_from may be missing bars and are dropped
+        bars = resample(entry["bars"].between(start=max(read_from - _DAY * _NS, entry["covered_from"])), interval)
+        return slice_period(bars.between(start=read_from), period, start)
+
+    def _top_up(self, ticker: str, interval: str, entry: Dict, now: float):
+        last = int(entry["bars"].timestamp[-1])
+        try:
+            tail = OHLCVDataset.from_frame(self.fetch(
+                ticker,
+                interval,
+                start=datetime.fromtimestamp(last / _NS, timezone.utc)
+            ))
+        except Exception:
+            # Serve what we have rather than fail on a flaky top-up
+            return
+
+        entry["bars"] = entry["bars"].merge(tail)
+        entry["fetched_at"] = now
+        self._write(ticker, interval, entry)
+
+    def stored(self, ticker: str, interval: str) -> Optional[OHLCVDataset]:
+        """Everything on disk for the key, without fetching; None if nothing is stored."""
+        entry = self._read(ticker, interval)
+        return None if entry is None else entry["bars"]
+
+    def invalidate(self, ticker: str, interval: str):
+        with self._lock(ticker, interval):
+            try:
+                os.remove(self._path(ticker, interval))
+            except FileNotFoundError:
+                pass
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((ticker, interval), threading.Lock())
+
+    def _path(self, ticker: str, interval: str) -> str:
+        # Tickers like "GC=F" or "EURUSD=X" are escaped so every key maps to one file name
+        safe = re.sub(r"[^A-Za-z0-9.-]", lambda m: "%{:02X}".format(ord(m.group())), f"{ticker}@{interval}")
+        return os.path.join(self.root, f"{safe}.npz")
+
+    def _read(self, ticker: str, interval: str) -> Optional[Dict]:
+        path = self._path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                return {
+                    "bars": OHLCVDataset.from_columns(
+                        {name: stored[name] for name in COLUMNS},
+                        tz=str(stored["tz"]) or None
+                    ),
+                    "covered_from": int(stored["covered_from"]),
+                    "fetched_at": float(stored["fetched_at"]),
+                }
+        except (OSError, KeyError, ValueError):
+            # Corrupt or foreign file: treat as a miss and overwrite on next write
+            return None
+
+    def _covers(self, ticker: str, interval: str, start: int) -> bool:
+        # npz members load lazily, so this reads a few bytes however long the series is
+        try:
+            with np.load(self._path(ticker, interval), allow_pickle=False) as stored:
+                return int(stored["covered_from"]) <= start
+        except (OSError, KeyError, ValueError):
+            return False
+
+    def _write(self, ticker: str, interval: str, entry: Dict):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(ticker, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                tz=np.array(entry["bars"].tz or ""),
+                covered_from=np.int64(entry["covered_from"]),
+                fetched_at=np.float64(entry["fetched_at"]),
+                **entry["bars"].columns()
+            )
+        # Atomic swap so concurrent readers never see a half-written file
+        os.replace(tmp_path, path)
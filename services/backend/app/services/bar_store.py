@@ -0,0 +1,297 @@
+import io
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import Engine
+
+from app.core.dataset import COLUMNS, OHLCVDataset
+from app.models.market_data import Bar, BarSeries
+from app.services.bar_cache import FRESHNESS, PERIODS, TRADING_DAY_PERIODS, period_start, slice_period
+
+_NS = 1_000_000_000
+_DAY_NS = 24 * 3600 * _NS
+
+# Rows per executemany batch on the non-COPY path
+_BATCH_ROWS = 50_000
+
+# PostgreSQL binary COPY framing: signature, flags, header extension length
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack("!h", -1)
+
+# One binary COPY row of COLUMNS: field count, then (length, value) per column.
+# Every column is NOT NULL and 8 bytes wide, so rows are fixed-size records.
+_COPY_ROW = np.dtype(
+    [("fields", ">i2")]
+    + [
+        field
+        for name in COLUMNS
+        for field in ((f"{name}_len", ">i4"), (name, ">i8" if name == "timestamp" else ">f8"))
+    ]
+)
+
+_UPSERT_SET = ", ".join(f"{name} = excluded.{name}" for name in COLUMNS[1:])
+
+# "interval" is a keyword in PostgreSQL, so raw SQL always quotes it
+_INSERT_COLUMNS = 'ticker, "interval", ts, open, high, low, close, volume'
+
+
+def encode_copy(bars: OHLCVDataset) -> bytes:
+    """The bars' columns as a PostgreSQL binary COPY stream, built without per-row Python."""
+    rows = np.empty(len(bars), dtype=_COPY_ROW)
+    rows["fields"] = len(COLUMNS)
+    for name in COLUMNS:
+        rows[f"{name}_len"] = 8
+        rows[name] = getattr(bars, name)
+    return _PGCOPY_HEADER + rows.tobytes() + _PGCOPY_TRAILER
+
+
+def decode_copy(payload, tz: Optional[str] = None) -> OHLCVDataset:
+    """Inverse of encode_copy for `COPY (SELECT <COLUMNS> ...) TO STDOUT (FORMAT binary)`."""
+    view = memoryview(payload)
+    if bytes(view[:11]) != _PGCOPY_HEADER[:11]:
+        raise ValueError("Not a PostgreSQL binary COPY stream")
+    extension = struct.unpack("!i", view[15:19])[0]
+    offset = 19 + extension
+    count = (len(view) - offset - len(_PGCOPY_TRAILER)) // _COPY_ROW.itemsize
+
+    rows = np.frombuffer(view, dtype=_COPY_ROW, count=count, offset=offset)
+    columns = {
+        name: rows[name].astype(np.int64 if name == "timestamp" else np.float64)
+        for name in COLUMNS
+    }
+    return OHLCVDataset.from_columns(columns, tz=tz)
+
+
+class BarStore:
+    """
+    OHLCV bars in the `ohlcv_bars` table, read and written column-wise.
+
+    On PostgreSQL, writes are a binary COPY into a temporary table followed by
+    one upsert, and range reads are a binary `COPY (SELECT ...) TO STDOUT` that
+    is decoded straight into NumPy arrays. Other databases (SQLite in tests and
+    local runs) use batched executemany and a plain cursor. No ORM rows are built
+    in either direction.
+    """
+
+    def __init__(self, engine: Engine, clock: Callable[[], float] = time.time):
+        self.engine = engine
+        self.clock = clock
+
+    @property
+    def _copy(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    def ingest(
+        self,
+        ticker: str,
+        interval: str,
+        bars: OHLCVDataset,
+        covered_from: Optional[int] = None
+    ) -> int:
+        """
+        Insert or overwrite bars for (ticker, interval) and return the row count.
+
+        covered_from (ns) marks the stored series as complete from that time;
+        by default the first ingested bar. Coverage only ever grows.
+        """
+        if len(bars) == 0:
+            return 0
+
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            if self._copy:
+                self._ingest_copy(cursor, ticker, interval, bars)
+            else:
+                self._ingest_batches(cursor, ticker, interval, bars)
+            cursor.close()
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+        self._update_series(
+            ticker,
+            interval,
+            int(bars.timestamp[0]) if covered_from is None else covered_from,
+            bars.tz
+        )
+        return len(bars)
+
+    def _ingest_copy(self, cursor, ticker: str, interval: str, bars: OHLCVDataset):
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS ohlcv_load "
+            "(ts bigint, open float8, high float8, low float8, close float8, volume float8) "
+            "ON COMMIT DELETE ROWS"
+        )
+        cursor.copy_expert("COPY ohlcv_load FROM STDIN WITH (FORMAT binary)", io.BytesIO(encode_copy(bars)))
+        cursor.execute(
+            f"INSERT INTO ohlcv_bars ({_INSERT_COLUMNS}) "
+            "SELECT %s, %s, ts, open, high, low, close, volume FROM ohlcv_load "
+            f'ON CONFLICT (ticker, "interval", ts) DO UPDATE SET {_UPSERT_SET}',
+            (ticker, interval)
+        )
+
+    def _ingest_batches(self, cursor, ticker: str, interval: str, bars: OHLCVDataset):
+        marker = "?" if self.engine.dialect.paramstyle == "qmark" else "%s"
+        sql = (
+            f"INSERT INTO ohlcv_bars ({_INSERT_COLUMNS}) "
+            f"VALUES ({', '.join([marker] * 8)}) "
+            f'ON CONFLICT (ticker, "interval", ts) DO UPDATE SET {_UPSERT_SET}'
+        )
+        for start in range(0, len(bars), _BATCH_ROWS):
+            chunk = bars[start:start + _BATCH_ROWS]
+            columns = [getattr(chunk, name).tolist() for name in COLUMNS]
+            cursor.executemany(sql, [(ticker, interval) + row for row in zip(*columns)])
+
+    def read(
+        self,
+        ticker: str,
+        interval: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        tz: Optional[str] = None
+    ) -> OHLCVDataset:
+        """Bars with start <= timestamp < end (ns), as one index range scan."""
+        stmt = (
+            select(Bar.ts, Bar.open, Bar.high, Bar.low, Bar.close, Bar.volume)
+            .where(Bar.ticker == ticker, Bar.interval == interval)
+            .order_by(Bar.ts)
+        )
+        if start is not None:
+            stmt = stmt.where(Bar.ts >= start)
+        if end is not None:
+            stmt = stmt.where(Bar.ts < end)
+
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            if self._copy:
+                query = cursor.mogrify(*_compile(stmt, self.engine)).decode()
+                buffer = io.BytesIO()
+                cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT binary)", buffer)
+                return decode_copy(buffer.getbuffer(), tz=tz)
+
+            cursor.execute(*_compile(stmt, self.engine))
+            rows = np.fromiter(
+                cursor,
+                dtype=[(name, np.int64 if name == "timestamp" else np.float64) for name in COLUMNS]
+            )
+            return OHLCVDataset.from_columns({name: rows[name].copy() for name in COLUMNS}, tz=tz)
+        finally:
+            raw.close()
+
+    def series(self, ticker: str, interval: str) -> Optional[Dict]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(BarSeries.covered_from, BarSeries.fetched_at, BarSeries.tz)
+                .where(BarSeries.ticker == ticker, BarSeries.interval == interval)
+            ).first()
+            if row is None:
+                return None
+            last = conn.execute(
+                select(func.max(Bar.ts)).where(Bar.ticker == ticker, Bar.interval == interval)
+            ).scalar()
+        return {"covered_from": row.covered_from, "fetched_at": row.fetched_at, "tz": row.tz, "last": last}
+
+    def delete(self, ticker: str, interval: str):
+        with self.engine.begin() as conn:
+            conn.execute(delete(Bar).where(Bar.ticker == ticker, Bar.interval == interval))
+            conn.execute(delete(BarSeries).where(BarSeries.ticker == ticker, BarSeries.interval == interval))
+
+    def _update_series(self, ticker: str, interval: str, covered_from: int, tz: Optional[str]):
+        with self.engine.begin() as conn:
+            current = conn.execute(
+                select(BarSeries.covered_from)
+                .where(BarSeries.ticker == ticker, BarSeries.interval == interval)
+            ).scalar()
+            if current is None:
+                conn.execute(BarSeries.__table__.insert().values(
+                    ticker=ticker, interval=interval, covered_from=covered_from, fetched_at=self.clock(), tz=tz
+                ))
+            else:
+                conn.execute(
+                    BarSeries.__table__.update()
+                    .where(BarSeries.ticker == ticker, BarSeries.interval == interval)
+                    .values(covered_from=min(current, covered_from), fetched_at=self.clock(), tz=tz)
+                )
+
+
+def _compile(stmt, engine: Engine):
+    """SQL text and DBAPI parameters for a Core statement, for use on a raw cursor."""
+    compiled = stmt.compile(dialect=engine.dialect)
+    if compiled.positiontup is not None:
+        return str(compiled), tuple(compiled.params[name] for name in compiled.positiontup)
+    return str(compiled), compiled.params
+
+
+class StoredBarsProvider:
+    """
+    Market-data provider that serves requests from a BarStore.
+
+    Same policy as BarCache, with the database as storage: a request inside
+    the stored coverage is one indexed range read, a stale series only
+    downloads bars since its last stored timestamp, and anything else is a
+    full download that is ingested before it is returned.
+    """
+
+    def __init__(
+        self,
+        store: BarStore,
+        fetch: Callable,
+        clock: Callable[[], float] = time.time
+    ):
+        # fetch(ticker, interval, period=None, start=None) -> yfinance-style DataFrame
+        self.store = store
+        self.fetch = fetch
+        self.clock = clock
+        self._locks: Dict = {}
+        self._locks_guard = threading.Lock()
+
+    def __call__(self, ticker: str, period: str, interval: str) -> OHLCVDataset:
+        if interval not in FRESHNESS or (period not in PERIODS and period not in ("ytd", "max")):
+            return OHLCVDataset.from_frame(self.fetch(ticker, interval, period=period))
+
+        with self._lock(ticker, interval):
+            now = self.clock()
+            start = period_start(period, now)
+            series = self.store.series(ticker, interval)
+
+            if series is None or series["last"] is None or series["covered_from"] > start:
+                bars = OHLCVDataset.from_frame(self.fetch(ticker, interval, period=period))
+                if len(bars) == 0 and series is None:
+                    return bars
+                self.store.ingest(ticker, interval, bars, covered_from=start)
+
+            elif now - series["fetched_at"] > FRESHNESS[interval]:
+                try:
+                    tail = OHLCVDataset.from_frame(self.fetch(
+                        ticker,
+                        interval,
+                        start=datetime.fromtimestamp(series["last"] / _NS, timezone.utc)
+                    ))
+                except Exception:
+                    # Serve what we have rather than fail on a flaky top-up
+                    tail = None
+                if tail is not None:
+                    self.store.ingest(ticker, interval, tail, covered_from=series["covered_from"])
+
+            series = self.store.series(ticker, interval)
+
+        read_from = start
+        if period in TRADING_DAY_PERIODS:
+            # Session-based periods can reach back past a weekend or holiday
+            read_from = start - (TRADING_DAY_PERIODS[period] + 4) * _DAY_NS
+        bars = self.store.read(ticker, interval, start=read_from, tz=series["tz"] if series else None)
+        return slice_period(bars, period, start)
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((ticker, interval), threading.Lock())
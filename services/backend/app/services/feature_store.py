@@ -0,0 +1,379 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.dataset import OHLCVDataset
+from app.services.result_cache import request_key
+from indicators import IndicatorBatch, StreamingIndicator
+from indicators.streaming import STREAMING_INDICATORS
+
+# name -> parameter it takes
+FEATURES = {
+    "return": "lag",          # log return of the bar `lag` bars back (0 = this bar)
+    "rsi": "period",          # Wilder RSI
+    "ema_distance": "period",  # close / EMA - 1
+    "sma_distance": "period",  # close / SMA - 1
+    "atr_range": "period",    # (high - low) / ATR
+}
+
+# Indicator behind each indicator-based feature
+_INDICATOR = {"rsi": "rsi", "ema_distance": "ema", "sma_distance": "sma", "atr_range": "atr"}
+
+# Appends longer than this are recomputed with the vectorized kernels rather than bar by bar
+_STREAM_MAX_ROWS = 2000
+
+
+def normalize_spec(spec: Sequence[Mapping]) -> List[Dict]:
+    """Validated, canonical copy of a feature spec: [{"name": ..., "lag"/"period": int}, ...]."""
+    features = []
+    for item in spec:
+        name = item.get("name")
+        if name not in FEATURES:
+            raise ValueError(f"Unknown feature '{name}', expected one of {list(FEATURES)}")
+        param = FEATURES[name]
+        value = item.get(param, 0 if param == "lag" else None)
+        if value is None or int(value) != value or value < (0 if param == "lag" else 1):
+            raise ValueError(f"Feature '{name}' needs an integer {param}")
+        features.append({"name": name, param: int(value)})
+    if not features:
+        raise ValueError("Feature spec is empty")
+    return features
+
+
+def feature_names(spec: Sequence[Mapping]) -> List[str]:
+    return [f"{f['name']}_{f.get('lag', f.get('period'))}" for f in normalize_spec(spec)]
+
+
+def spec_hash(spec: Sequence[Mapping]) -> str:
+    return request_key(features=normalize_spec(spec))
+
+
+def _warmup(feature: Dict) -> int:
+    # Index of the first bar where the feature is defined
+    if feature["name"] == "return":
+        return feature["lag"] + 1
+    if feature["name"] in ("rsi", "atr_range"):
+        return feature["period"]
+    if feature["name"] == "sma_distance":
+        return feature["period"] - 1
+    return 0
+
+
+def compute_features(bars: OHLCVDataset, spec: Sequence[Mapping]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Feature matrix (bars x features, NaN during warm-up) and per-bar log returns,
+    computed with the shared vectorized indicator kernels.
+    """
+    spec = normalize_spec(spec)
+    n = len(bars)
+    close = bars.close
+    returns = np.full(n, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = np.diff(np.log(close))
+    returns[~np.isfinite(returns)] = np.nan
+
+    batch = IndicatorBatch({"high": bars.high, "low": bars.low, "close": close})
+    X = np.full((n, len(spec)), np.nan)
+    for j, feature in enumerate(spec):
+        name = feature["name"]
+        if name == "return":
+            lag = feature["lag"]
+            if lag < n:
+                X[lag:, j] = returns[:n - lag]
+        elif name == "atr_range":
+            if n > feature["period"]:
+                X[:, j] = (bars.high - bars.low) / batch.compute("atr", feature["period"])
+        elif name == "rsi":
+            X[:, j] = batch.compute("rsi", feature["period"])
+        else:
+            X[:, j] = close / batch.compute(_INDICATOR[name], feature["period"]) - 1
+    # Division by a zero range or price is undefined, like the warm-up
+    X[~np.isfinite(X)] = np.nan
+    return X, returns
+
+
+def _ratio(a: float, b: float) -> float:
+    return a / b if b != 0 and not math.isnan(b) else math.nan
+
+
+def _log_return(previous: float, current: float) -> float:
+    return math.log(current) - math.log(previous) if previous > 0 and current > 0 else math.nan
+
+
+class _FeatureStream:
+    """Per-bar version of compute_features(), resumable from a JSON checkpoint."""
+
+    def __init__(self, spec: List[Dict], indicators: Dict[str, StreamingIndicator], closes: List[float]):
+        self.spec = spec
+        self.indicators = indicators
+        self.max_lag = max((f["lag"] for f in spec if f["name"] == "return"), default=0)
+        # Enough closes for the oldest lagged return
+        self.closes = deque(closes, maxlen=self.max_lag + 2)
+
+    @staticmethod
+    def _key(feature: Dict) -> str:
+        return f"{_INDICATOR[feature['name']]}_{feature['period']}"
+
+    @classmethod
+    def from_history(cls, bars: OHLCVDataset, spec: List[Dict]) -> "_FeatureStream":
+        columns = {"high": bars.high, "low": bars.low, "close": bars.close}
+        indicators = {}
+        for feature in spec:
+            if feature["name"] != "return":
+                key = cls._key(feature)
+                if key not in indicators:
+                    kind = STREAMING_INDICATORS[_INDICATOR[feature["name"]]]
+                    indicators[key] = kind.from_history(columns, feature["period"])
+        stream = cls(spec, indicators, [])
+        stream.closes.extend(bars.close[-stream.closes.maxlen:].tolist())
+        return stream
+
+    def update(self, high: float, low: float, close: float) -> Tuple[List[float], float]:
+        self.closes.append(close)
+        values = {key: indicator.update({"high": high, "low": low, "close": close})
+                  for key, indicator in self.indicators.items()}
+
+        closes = list(self.closes)
+        row = []
+        for feature in self.spec:
+            name = feature["name"]
+            if name == "return":
+                i = len(closes) - 1 - feature["lag"]
+                row.append(_log_return(closes[i - 1], closes[i]) if i >= 1 else math.nan)
+            elif name == "rsi":
+                row.append(values[self._key(feature)])
+            elif name == "atr_range":
+                row.append(_ratio(high - low, values[self._key(feature)]))
+            else:
+                row.append(_ratio(close, values[self._key(feature)]) - 1)
+        latest = _log_return(closes[-2], closes[-1]) if len(closes) > 1 else math.nan
+        return row, latest
+
+    def to_dict(self) -> Dict:
+        return {
+            "indicators": {key: indicator.to_dict() for key, indicator in self.indicators.items()},
+            "closes": list(self.closes),
+        }
+
+    @classmethod
+    def from_dict(cls, spec: List[Dict], data: Dict) -> "_FeatureStream":
+        indicators = {key: StreamingIndicator.from_dict(state) for key, state in data["indicators"].items()}
+        return cls(spec, indicators, data["closes"])
+
+
+class FeatureMatrix:
+    """
+    A stored feature matrix as read-only memory maps.
+
+    X is (rows, features) float64 in row-major order, so any row range is a
+    contiguous view the models can train on without copying; nothing is read
+    from disk until it is touched.
+    """
+
+    def __init__(self, X: np.ndarray, timestamps: np.ndarray, returns: np.ndarray, meta: Dict):
+        self.X = X
+        self.timestamps = timestamps
+        self.returns = returns
+        self.columns: List[str] = meta["columns"]
+        self.spec: List[Dict] = meta["spec"]
+        self.tz: Optional[str] = meta.get("tz")
+        # First row where every feature is defined
+        self.first_complete: int = max(_warmup(f) for f in self.spec)
+
+    def __len__(self) -> int:
+        return len(self.X)
+
+    def targets(self, kind: str = "return") -> np.ndarray:
+        """Next-bar log return (or 1/0 direction) for rows 0..len-2, aligned with X[:-1]."""
+        following = self.returns[1:]
+        if kind == "return":
+            return following
+        if kind == "direction":
+            return (following > 0).astype(np.float64)
+        raise ValueError(f"Unknown target '{kind}', expected 'return' or 'direction'")
+
+    def batches(
+        self,
+        batch_rows: int,
+        target: str = "return",
+        start: Optional[int] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(X, y) chunks of complete, labelled rows, for partial_fit over data larger than memory."""
+        start = self.first_complete if start is None else max(start, self.first_complete)
+        stop = len(self) - 1
+        for begin in range(start, stop, batch_rows):
+            end = min(begin + batch_rows, stop)
+            X = self.X[begin:end]
+            if target == "direction":
+                y = (self.returns[begin + 1:end + 1] > 0).astype(np.float64)
+            else:
+                y = self.targets(target)[begin:end]
+            yield X, y
+
+
+class FeatureStore:
+    """
+    Feature matrices on disk keyed by (ticker, interval, spec hash).
+
+    Each key is a directory holding the matrix, timestamps and per-bar log
+    returns as raw little-endian arrays plus meta.json with the row count and
+    the streaming-indicator checkpoint after the last row. sync() builds a
+    matrix with the vectorized kernels, or appends only the new bars by
+    resuming that checkpoint, so the stored rows are never recomputed.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def get(self, ticker: str, interval: str, spec: Sequence[Mapping]) -> Optional[FeatureMatrix]:
+        spec = normalize_spec(spec)
+        meta = self._read_meta(self._dir(ticker, interval, spec))
+        return None if meta is None else self._open(self._dir(ticker, interval, spec), meta)
+
+    def sync(self, ticker: str, interval: str, bars: OHLCVDataset, spec: Sequence[Mapping]) -> FeatureMatrix:
+        """Bring the stored matrix up to date with `bars` and return it."""
+        spec = normalize_spec(spec)
+        directory = self._dir(ticker, interval, spec)
+
+        with self._lock(ticker, interval, spec_hash(spec)):
+            meta = self._read_meta(directory)
+            if meta is None or meta["rows"] == 0 or not len(bars):
+                return self._build(directory, bars, spec)
+
+            last = meta["last_timestamp"]
+            overlap = np.searchsorted(bars.timestamp, last)
+            if overlap == len(bars) or bars.timestamp[overlap] != last:
+                # The new bars do not continue the stored history; start over from them
+                return self._build(directory, bars, spec)
+
+            new = bars[overlap + 1:]
+            if len(new) == 0:
+                return self._open(directory, meta)
+            if len(new) > _STREAM_MAX_ROWS and bars.timestamp[0] <= meta["first_timestamp"]:
+                # `bars` covers everything stored, so a vectorized rebuild is cheaper than streaming
+                return self._build(directory, bars, spec)
+            return self._append(directory, meta, new, spec)
+
+    def delete(self, ticker: str, interval: str, spec: Sequence[Mapping]):
+        spec = normalize_spec(spec)
+        directory = self._dir(ticker, interval, spec)
+        with self._lock(ticker, interval, spec_hash(spec)):
+            for name in ("meta.json", "features.f64", "timestamps.i64", "returns.f64"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def _build(self, directory: str, bars: OHLCVDataset, spec: List[Dict]) -> FeatureMatrix:
+        X, returns = compute_features(bars, spec)
+        os.makedirs(directory, exist_ok=True)
+        # Invalidate first so a crash mid-write leaves no meta pointing at partial arrays
+        self._remove_meta(directory)
+        self._write_arrays(directory, "wb", X, bars.timestamp, returns)
+
+        stream = _FeatureStream.from_history(bars, spec)
+        first = int(bars.timestamp[0]) if len(bars) else None
+        meta = self._meta(spec, len(bars), bars, stream, first)
+        self._write_meta(directory, meta)
+        return self._open(directory, meta)
+
+    def _append(self, directory: str, meta: Dict, new: OHLCVDataset, spec: List[Dict]) -> FeatureMatrix:
+        stream = _FeatureStream.from_dict(spec, meta["state"])
+        rows = np.empty((len(new), len(spec)))
+        returns = np.empty(len(new))
+        for i, (high, low, close) in enumerate(zip(new.high.tolist(), new.low.tolist(), new.close.tolist())):
+            rows[i], returns[i] = stream.update(high, low, close)
+
+        # Drop anything past the recorded row count (left by an interrupted append)
+        self._truncate(directory, meta["rows"], len(spec))
+        self._write_arrays(directory, "ab", rows, new.timestamp, returns)
+
+        meta = self._meta(spec, meta["rows"] + len(new), new, stream, meta["first_timestamp"])
+        self._write_meta(directory, meta)
+        return self._open(directory, meta)
+
+    @staticmethod
+    def _meta(spec: List[Dict], rows: int, bars: OHLCVDataset, stream: _FeatureStream, first_timestamp: Optional[int]) -> Dict:
+        return {
+            "spec": spec,
+            "columns": feature_names(spec),
+            "rows": rows,
+            "first_timestamp": first_timestamp,
+            "last_timestamp": int(bars.timestamp[-1]) if len(bars) else None,
+            "tz": bars.tz,
+            "state": stream.to_dict(),
+        }
+
+    def _open(self, directory: str, meta: Dict) -> FeatureMatrix:
+        rows, width = meta["rows"], len(meta["spec"])
+        return FeatureMatrix(
+            _map(os.path.join(directory, "features.f64"), np.float64, (rows, width)),
+            _map(os.path.join(directory, "timestamps.i64"), np.int64, (rows,)),
+            _map(os.path.join(directory, "returns.f64"), np.float64, (rows,)),
+            meta
+        )
+
+    @staticmethod
+    def _write_arrays(directory: str, mode: str, X, timestamps, returns):
+        for name, values, dtype in (
+            ("features.f64", X, "<f8"),
+            ("timestamps.i64", timestamps, "<i8"),
+            ("returns.f64", returns, "<f8"),
+        ):
+            with open(os.path.join(directory, name), mode) as f:
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    @staticmethod
+    def _truncate(directory: str, rows: int, width: int):
+        for name, row_bytes in (("features.f64", 8 * width), ("timestamps.i64", 8), ("returns.f64", 8)):
+            path = os.path.join(directory, name)
+            if os.path.getsize(path) > rows * row_bytes:
+                os.truncate(path, rows * row_bytes)
+
+    def _dir(self, ticker: str, interval: str, spec: List[Dict]) -> str:
+        # Same escaping as BarCache so every ticker maps to one directory name
+        safe = re.sub(r"[^A-Za-z0-9.-]", lambda m: "%{:02X}".format(ord(m.group())), f"{ticker}@{interval}")
+        return os.path.join(self.root, safe, spec_hash(spec))
+
+    def _lock(self, ticker: str, interval: str, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((ticker, interval, key), threading.Lock())
+
+    @staticmethod
+    def _read_meta(directory: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(directory, "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_meta(directory: str, meta: Dict):
+        path = os.path.join(directory, "meta.json")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            # NaN (e.g. an indicator still warming up) round-trips through Python's JSON
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove_meta(directory: str):
+        try:
+            os.remove(os.path.join(directory, "meta.json"))
+        except FileNotFoundError:
+            pass
+
+
+def _map(path: str, dtype, shape: Tuple[int, ...]) -> np.ndarray:
+    if shape[0] == 0:
+        # mmap cannot map zero bytes
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
@@ -0,0 +1,201 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+from app.core.dataset import OHLCVDataset
+from app.services.bar_cache import BarCache
+from app.services.market_data import MarketDataService
+
+_NS = 1_000_000_000
+
+
+class BarFeed(ABC):
+    """
+    Source of bars for live consumers (StreamHub, ReplayEngine).
+
+    history() returns the bars available when a ticker is first subscribed
+    (used to warm strategies up, never signalled); bars() then yields
+    batches of newer bars, oldest first, for as long as the feed runs.
+    """
+
+    @abstractmethod
+    async def history(self, ticker: str) -> OHLCVDataset:
+        pass
+
+    @abstractmethod
+    def bars(self, ticker: str, after: Optional[int]) -> AsyncIterator[OHLCVDataset]:
+        pass
+
+
+class PollingFeed(BarFeed):
+    """Live bars from the market-data service, re-polled every `poll_seconds`."""
+
+    def __init__(
+        self,
+        service: MarketDataService,
+        interval: str = "1m",
+        period: str = "5d",
+        poll_seconds: float = 60.0
+    ):
+        self.service = service
+        self.interval = interval
+        self.period = period
+        self.poll_seconds = poll_seconds
+
+    async def history(self, ticker: str) -> OHLCVDataset:
+        return await self.service.get_bars(ticker, self.period, self.interval)
+
+    async def bars(self, ticker: str, after: Optional[int]):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                bars = await self.service.get_bars(ticker, self.period, self.interval)
+            except Exception:
+                # A failed poll is retried on the next tick
+                continue
+            if after is not None:
+                # Bars up to the last one already pushed were seen on an earlier poll
+                bars = bars.between(start=after + 1)
+            if len(bars):
+                after = int(bars.timestamp[-1])
+                yield bars
+
+
+class _ReplayStats:
+    def __init__(self, started: float):
+        self.started = started
+        self.finished: Optional[float] = None
+        self.bars = 0
+        self.batches = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    def record(self, bars: int, lag: float):
+        self.bars += bars
+        self.batches += 1
+        self.lag_total += lag * bars
+        self.lag_max = max(self.lag_max, lag)
+
+
+class ReplayFeed(BarFeed):
+    """
+    Stored bars played back like a live feed, at `speed` times real time.
+
+    speed=None plays as fast as the consumer takes them. Otherwise bars keep
+    their recorded spacing divided by `speed`, with gaps (nights, weekends)
+    capped at `max_gap` wall-clock seconds. Whatever is due when the consumer
+    asks for more arrives as one batch (up to `batch_size` bars), so a
+    consumer that falls behind catches up in bulk instead of drifting. The
+    first `warmup` bars of each ticker are its history.
+
+    Replays of different tickers interleave on one event loop; stats()
+    reports bars, batches, throughput and lag (how late bars were handed
+    over relative to their schedule) per ticker and overall.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], Optional[OHLCVDataset]],
+        speed: Optional[float] = None,
+        warmup: int = 0,
+        max_gap: Optional[float] = None,
+        batch_size: int = 65536
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive (or None for as fast as possible)")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.load = load
+        self.speed = speed
+        self.warmup = warmup
+        self.max_gap = max_gap
+        self.batch_size = batch_size
+        self._stats: Dict[str, _ReplayStats] = {}
+
+    @classmethod
+    def from_cache(cls, root: str, interval: str, **options) -> "ReplayFeed":
+        """Replay the series a BarCache has stored under `root`."""
+        store = BarCache(root, fetch=None)
+        return cls(lambda ticker: store.stored(ticker, interval), **options)
+
+    @classmethod
+    def from_datasets(cls, bars: Mapping[str, OHLCVDataset], **options) -> "ReplayFeed":
+        return cls(bars.get, **options)
+
+    def _stored(self, ticker: str) -> OHLCVDataset:
+        bars = self.load(ticker)
+        if bars is None:
+            raise LookupError(f"No stored bars for {ticker}")
+        return bars
+
+    async def history(self, ticker: str) -> OHLCVDataset:
+        return self._stored(ticker)[:self.warmup]
+
+    async def bars(self, ticker: str, after: Optional[int]):
+        bars = self._stored(ticker)
+        bars = bars[self.warmup:] if after is None else bars.between(start=after + 1)
+        stats = self._stats[ticker] = _ReplayStats(time.monotonic())
+        n = len(bars)
+
+        if self.speed is None:
+            for start in range(0, n, self.batch_size):
+                batch = bars[start:start + self.batch_size]
+                stats.record(len(batch), 0.0)
+                yield batch
+                # Let the other tickers' replays run between batches
+                await asyncio.sleep(0)
+            stats.finished = time.monotonic()
+            return
+
+        offsets = self._schedule(bars.timestamp)
+        started = time.monotonic()
+        i = 0
+        while i < n:
+            now = time.monotonic() - started
+            if offsets[i] > now:
+                await asyncio.sleep(offsets[i] - now)
+                continue
+            stop = min(int(np.searchsorted(offsets, now, side="right")), i + self.batch_size)
+            stats.record(stop - i, now - offsets[i])
+            yield bars[i:stop]
+            i = stop
+        stats.finished = time.monotonic()
+
+    def _schedule(self, timestamps: np.ndarray) -> np.ndarray:
+        # Wall-clock seconds after the start at which each bar is due
+        gaps = np.diff(timestamps) / _NS / self.speed
+        if self.max_gap is not None:
+            gaps = np.minimum(gaps, self.max_gap)
+        return np.concatenate([[0.0], np.cumsum(gaps)])
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        tickers = {}
+        for ticker, stats in self._stats.items():
+            seconds = (stats.finished or now) - stats.started
+            tickers[ticker] = {
+                "bars": stats.bars,
+                "batches": stats.batches,
+                "seconds": seconds,
+                "bars_per_second": stats.bars / seconds if seconds > 0 else None,
+                "mean_lag": stats.lag_total / stats.bars if stats.bars else 0.0,
+                "max_lag": stats.lag_max,
+                "finished": stats.finished is not None,
+            }
+
+        total = sum(stats.bars for stats in self._stats.values())
+        seconds = (
+            max((stats.finished or now) for stats in self._stats.values())
+            - min(stats.started for stats in self._stats.values())
+        ) if self._stats else 0.0
+        return {
+            "speed": self.speed,
+            "bars": total,
+            "seconds": seconds,
+            "bars_per_second": total / seconds if seconds > 0 else None,
+            "max_lag": max((stats.lag_max for stats in self._stats.values()), default=0.0),
+            "tickers": tickers,
+        }
@@ -0,0 +1,290 @@
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function to stop early after cancel()."""
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """
+    One unit of work plus everything a poller can see about it.
+
+    The job function receives the Job and calls report() as it goes; rows
+    passed to report() are kept as partial results until the job finishes.
+    """
+
+    def __init__(self, kind: str, fn: Callable[["Job"], Any], client: str, priority: int, created_at: float):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.fn = fn
+        self.client = client
+        self.priority = priority
+
+        self.status = QUEUED
+        self.created_at = created_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self.completed = 0
+        self.total: Optional[int] = None
+        self.partial: List[Any] = []
+        self.result: Any = None
+        self.error: Optional[str] = None
+
+        self._cancel = threading.Event()
+        self._on_cancel: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status == SUCCEEDED:
+            return 100.0
+        if not self.total:
+            return None
+        return round(100.0 * self.completed / self.total, 2)
+
+    def report(self, completed: int, total: Optional[int] = None, row: Any = None):
+        with self._lock:
+            self.completed = completed
+            if total is not None:
+                self.total = total
+            if row is not None:
+                self.partial.append(row)
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """Run `callback` when the job is cancelled (immediately if it already is)."""
+        self._on_cancel.append(callback)
+        if self.cancelled:
+            callback()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def partial_results(self, limit: Optional[int] = None) -> List[Any]:
+        with self._lock:
+            rows = list(self.partial)
+        return rows if limit is None else rows[-limit:]
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "client": self.client,
+            "priority": self.priority,
+            "status": self.status,
+            "progress": self.progress,
+            "completed": self.completed,
+            "total": self.total,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Bounded pool of worker threads running submitted jobs.
+
+    The highest priority runs first. Within a priority, the next job comes
+    from the client with the fewest running jobs (ties go to whoever was
+    served least recently), so one client queueing a hundred sweeps cannot
+    starve everybody else. Finished jobs are kept for `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        ttl: float = 3600.0,
+        max_queued: int = 1000,
+        clock: Callable[[], float] = time.time
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.max_queued = max_queued
+        self.clock = clock
+
+        self._jobs: Dict[str, Job] = {}
+        # priority -> client -> queued jobs in submission order
+        self._queued: Dict[int, Dict[str, Deque[Job]]] = {}
+        self._queued_count = 0
+        self._running: Dict[str, int] = {}
+        self._last_served: Dict[str, int] = {}
+        self._served = 0
+
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], client: str = "anonymous", priority: int = 0) -> Job:
+        with self._cond:
+            self._expire()
+            if self._queued_count >= self.max_queued:
+                raise QueueFull(f"Job queue is full ({self.max_queued} queued)")
+
+            job = Job(kind, fn, client, priority, self.clock())
+            self._jobs[job.id] = job
+            self._queued.setdefault(priority, {}).setdefault(client, deque()).append(job)
+            self._queued_count += 1
+
+            self._start_workers()
+            self._cond.notify()
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def jobs(self, client: Optional[str] = None) -> List[Job]:
+        with self._cond:
+            self._expire()
+            return [job for job in self._jobs.values() if client is None or job.client == client]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+
+            job._cancel.set()
+            if job.status == QUEUED:
+                waiting = self._queued[job.priority][job.client]
+                waiting.remove(job)
+                if not waiting:
+                    del self._queued[job.priority][job.client]
+                self._queued_count -= 1
+                self._finish(job, CANCELLED)
+                return job
+            callbacks = list(job._on_cancel)
+
+        # Running: ask the job to stop; it finishes as cancelled when it notices
+        for callback in callbacks:
+            callback()
+        return job
+
+    def stats(self) -> Dict:
+        with self._cond:
+            counts = {status: 0 for status in (QUEUED, RUNNING) + FINISHED}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {"workers": self.max_workers, "counts": counts}
+
+    def shutdown(self, wait: bool = True):
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+            workers = list(self._workers)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    # Scheduling
+
+    def _start_workers(self):
+        # Caller holds self._cond; threads are only started once there is work
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f"job-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> Optional[Job]:
+        # Caller holds self._cond
+        for priority in sorted(self._queued, reverse=True):
+            clients = self._queued[priority]
+            waiting = [client for client, jobs in clients.items() if jobs]
+            if not waiting:
+                continue
+            client = min(
+                waiting,
+                key=lambda c: (self._running.get(c, 0), self._last_served.get(c, -1))
+            )
+            job = clients[client].popleft()
+            if not clients[client]:
+                del clients[client]
+            self._queued_count -= 1
+            self._served += 1
+            self._last_served[client] = self._served
+            return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait(timeout=self.ttl)
+                    self._expire()
+                    job = self._next_job()
+
+                job.status = RUNNING
+                job.started_at = self.clock()
+                self._running[job.client] = self._running.get(job.client, 0) + 1
+
+            try:
+                result = job.fn(job)
+            except JobCancelled:
+                status, result, error = CANCELLED, None, None
+            except Exception as e:
+                status, result, error = FAILED, None, str(e) or type(e).__name__
+            else:
+                status, error = (CANCELLED if job.cancelled else SUCCEEDED), None
+
+            with self._cond:
+                self._running[job.client] -= 1
+                job.result = result
+                job.error = error
+                self._finish(job, status)
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = self.clock()
+        if status == SUCCEEDED:
+            if job.total is not None:
+                job.completed = job.total
+            # The final result supersedes the partial rows
+            job.partial = []
+
+    def _expire(self):
+        # Caller holds self._cond
+        cutoff = self.clock() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in FINISHED and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+job_queue = JobQueue(
+    max_workers=settings.JOB_WORKERS,
+    ttl=settings.JOB_RESULT_TTL,
+    max_queued=settings.JOB_MAX_QUEUED
+)
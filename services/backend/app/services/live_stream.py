@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.feeds import BarFeed, PollingFeed, ReplayFeed
+from app.services.market_data import market_data
+from strategies.rsi_strategy import RSIStrategy
+
+
+class Subscription:
+    """One client's bounded queue of messages from a channel."""
+
+    def __init__(self, key: Tuple, maxsize: int):
+        self.key = key
+        self.dropped = 0
+        self._reported = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def publish(self, message: Dict):
+        # Never blocks the channel: a full queue loses its oldest message instead
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    async def get(self) -> Dict:
+        if self.dropped > self._reported:
+            lagged = {"event": "lagged", "dropped": self.dropped - self._reported}
+            self._reported = self.dropped
+            return lagged
+        return await self._queue.get()
+
+
+class StreamHub:
+    """
+    Fans live RSI signals out to WebSocket subscribers.
+
+    Subscribers with the same (ticker, strategy parameters) share one channel:
+    a single task reads the feed, updates one RSIStrategy with each batch of
+    bars and publishes each new signal to every subscriber's queue. Queues are bounded
+    and drop their oldest message when full, so a slow client only loses its
+    own backlog (and is told how much) without holding up the others.
+    """
+
+    def __init__(self, feed: BarFeed, queue_size: int = 100):
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        self.feed = feed
+        self.queue_size = queue_size
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._channels: Dict[Tuple, asyncio.Task] = {}
+        self._subscribers: Dict[Tuple, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, ticker: str, parameters: Dict) -> Subscription:
+        key = (ticker, tuple(sorted(parameters.items())))
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop is not self._loop:
+                # Channels run on one event loop; a new loop starts from scratch
+                self._loop = loop
+                self._channels = {}
+                self._subscribers = {}
+
+            subscription = Subscription(key, self.queue_size)
+            self._subscribers.setdefault(key, set()).add(subscription)
+            if key not in self._channels:
+                task = loop.create_task(self._run(key, ticker, parameters))
+                task.add_done_callback(lambda done: self._finished(key, done))
+                self._channels[key] = task
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.key)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                # Last one out stops the channel
+                del self._subscribers[subscription.key]
+                task = self._channels.pop(subscription.key, None)
+                if task is not None:
+                    task.cancel()
+
+    def _finished(self, key: Tuple, task: asyncio.Task):
+        # A feed that ended can be started again by the next subscriber
+        with self._lock:
+            if self._channels.get(key) is task:
+                del self._channels[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+        return {
+            "channels": len(self._channels),
+            "subscribers": len(subscribers),
+            "dropped": sum(s.dropped for s in subscribers),
+        }
+
+    def _publish(self, key: Tuple, message: Dict):
+        for subscription in list(self._subscribers.get(key, ())):
+            subscription.publish(message)
+
+    async def _run(self, key: Tuple, ticker: str, parameters: Dict):
+        try:
+            strategy = RSIStrategy(**parameters)
+            history = await self.feed.history(ticker)
+            strategy.warm_up(history)
+            after = int(history.timestamp[-1]) if len(history) else None
+
+            async for batch in self.feed.bars(ticker, after):
+                for signal in strategy.on_bars(batch):
+                    self._publish(key, {"event": "signal", "ticker": ticker, **signal})
+            self._publish(key, {"event": "end", "ticker": ticker})
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._publish(key, {"event": "error", "ticker": ticker, "detail": str(e)})
+
+
+def _default_feed() -> BarFeed:
+    if settings.STREAM_REPLAY_DIR:
+        return ReplayFeed.from_cache(
+            settings.STREAM_REPLAY_DIR,
+            settings.STREAM_INTERVAL,
+            speed=settings.STREAM_REPLAY_SPEED or None,
+            warmup=100
+        )
+    return PollingFeed(market_data, interval=settings.STREAM_INTERVAL, poll_seconds=settings.STREAM_POLL_SECONDS)
+
+
+stream_hub = StreamHub(_default_feed(), queue_size=settings.STREAM_QUEUE_SIZE)
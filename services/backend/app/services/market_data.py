@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.dataset import OHLCVDataset
+from app.core.metrics import span
+from app.services.bar_cache import BarCache
+
+# fetch_bars(ticker, period, interval) -> OHLCVDataset; BarCache.get fits as-is
+BarsProvider = Callable[[str, str, str], OHLCVDataset]
+
+
+def download(ticker: str, interval: str, period: Optional[str] = None, start: Optional[datetime] = None):
+    # yfinance (and the pandas it brings) loads with the first download, not at startup
+    import yfinance as yf
+
+    with span("download"):
+        return yf.download(
+            ticker,
+            period=period,
+            start=start,
+            interval=interval,
+            progress=False
+        )
+
+
+def download_bars(ticker: str, period: str, interval: str) -> OHLCVDataset:
+    """Uncached provider: one yfinance download per call."""
+    return OHLCVDataset.from_frame(download(ticker, interval, period=period))
+
+
+class MarketDataService:
+    """
+    Async front for a blocking bars provider.
+
+    Concurrent requests for the same (ticker, period, interval) share a single
+    in-flight fetch. Fetches run in worker threads, at most `max_concurrency`
+    at a time. A request that gives up after `timeout` seconds only stops
+    waiting: the shared fetch carries on for the other waiters (and, with a
+    caching provider, still fills the cache).
+    """
+
+    def __init__(
+        self,
+        provider: BarsProvider,
+        max_concurrency: int = 4,
+        timeout: Optional[float] = 30.0
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+        # asyncio primitives belong to one event loop; they are rebuilt if the loop changes
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    async def get_bars(
+        self,
+        ticker: str,
+        period: str,
+        interval: str,
+        timeout: Optional[float] = None
+    ) -> OHLCVDataset:
+        """Bars for the key; raises asyncio.TimeoutError if they take longer than the timeout."""
+        key = (ticker, period, interval)
+        task = self._join(key)
+        timeout = self.timeout if timeout is None else timeout
+        # shield: a waiter timing out or disconnecting must not cancel the shared fetch
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def _join(self, key: Tuple[str, str, str]) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop is not self._loop:
+                self._loop = loop
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._inflight = {}
+
+            task = self._inflight.get(key)
+            if task is not None:
+                self.coalesced += 1
+                return task
+
+            task = loop.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            return task
+
+    async def _fetch(self, key: Tuple[str, str, str]) -> OHLCVDataset:
+        async with self._semaphore:
+            self.upstream_calls += 1
+            return await asyncio.to_thread(self.provider, *key)
+
+    def _finished(self, key: Tuple[str, str, str], task: asyncio.Task):
+        with self._lock:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        if not task.cancelled():
+            # Mark the error as retrieved even if every waiter already timed out
+            task.exception()
+
+
+def _default_provider() -> BarsProvider:
+    if settings.BAR_STORE_ENABLED:
+        from app.core.database import engine
+        from app.services.bar_store import BarStore, StoredBarsProvider
+        return StoredBarsProvider(BarStore(engine), fetch=download)
+    if settings.BAR_CACHE_ENABLED:
+        return BarCache(settings.BAR_CACHE_DIR, fetch=download).get
+    return download_bars
+
+
+market_data = MarketDataService(
+    _default_provider(),
+    max_concurrency=settings.MARKET_DATA_MAX_CONCURRENCY,
+    timeout=settings.MARKET_DATA_TIMEOUT
+)
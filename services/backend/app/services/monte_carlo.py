@@ -0,0 +1,138 @@
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+METHODS = ("bootstrap", "shuffle")
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Paths drawn from one child generator; results do not depend on the chunk size
+_BLOCK_PATHS = 1000
+
+# Memory cap for the (paths x trades) working arrays of one chunk
+_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def trade_returns(trades: List[Dict], initial_capital: float) -> np.ndarray:
+    """Each trade's net P&L as a fraction of the capital it was opened with."""
+    pnl = np.fromiter((t['pnl'] for t in trades), dtype=np.float64, count=len(trades))
+    capital_before = initial_capital + np.concatenate(([0.0], np.cumsum(pnl)[:-1]))
+    return pnl / capital_before
+
+
+def _path_stats(returns: np.ndarray, initial_capital: float, annualise: float):
+    """Final capital, max drawdown (%) and Sharpe for every row of a (paths x trades) array."""
+    sharpe_mean = returns.mean(axis=1)
+    sharpe_std = returns.std(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(sharpe_std > 0, sharpe_mean / sharpe_std * annualise, 0.0)
+
+    # Reuse the buffer: returns -> growth factors -> equity
+    equity = np.add(returns, 1.0, out=returns)
+    np.cumprod(equity, axis=1, out=equity)
+    equity *= initial_capital
+
+    peaks = np.maximum.accumulate(equity, axis=1)
+    # Starting capital is the first peak
+    np.maximum(peaks, initial_capital, out=peaks)
+    np.divide(equity, peaks, out=peaks)
+    max_drawdown = (1.0 - peaks.min(axis=1)) * 100
+
+    return equity[:, -1].copy(), max_drawdown, sharpe
+
+
+def _bands(values: np.ndarray, percentiles: Sequence[float]) -> Dict:
+    bands = np.percentile(values, percentiles)
+    return {
+        **{f"p{p:g}": round(float(v), 4) for p, v in zip(percentiles, bands)},
+        'mean': round(float(values.mean()), 4),
+    }
+
+
+def simulate(
+    trades: List[Dict],
+    initial_capital: float,
+    n_paths: int = 10_000,
+    method: str = "bootstrap",
+    seed: Optional[int] = None,
+    trades_per_year: Optional[float] = None,
+    percentiles: Sequence[float] = PERCENTILES,
+    chunk_bytes: int = _CHUNK_BYTES
+) -> Dict:
+    """
+    Monte Carlo over the order of a backtest's trades.
+
+    "bootstrap" draws each path's trades with replacement, "shuffle" permutes
+    the actual trades (the final capital and Sharpe are then fixed; only the
+    path, and so the drawdown, changes). Trades compound as returns on the
+    capital they were opened with. Paths are simulated as 2D arrays, a chunk
+    of rows at a time to keep memory under `chunk_bytes` (or one path, if a
+    single path is larger); the same seed gives the same result whatever the
+    chunk size.
+
+    Sharpe is per trade, annualised by sqrt(trades_per_year) when given.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method '{method}', expected one of {METHODS}")
+    if n_paths < 1:
+        raise ValueError("n_paths must be at least 1")
+    if not trades:
+        raise ValueError("Backtest has no trades to resample")
+
+    returns = trade_returns(trades, initial_capital)
+    n_trades = len(returns)
+    annualise = math.sqrt(trades_per_year) if trades_per_year else 1.0
+
+    # Roughly three (paths x trades) float64 arrays are alive per chunk, and a chunk is at least one path
+    rows_per_chunk = max(1, chunk_bytes // (3 * 8 * n_trades))
+    n_blocks = -(-n_paths // _BLOCK_PATHS)
+    generators = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_blocks)]
+
+    final = np.empty(n_paths)
+    max_drawdown = np.empty(n_paths)
+    sharpe = np.empty(n_paths)
+
+    for start in range(0, n_paths, rows_per_chunk):
+        stop = min(start + rows_per_chunk, n_paths)
+        # Uniform draws, one double each, so a block's stream does not depend on
+        # how its rows are split between chunks
+        uniform = np.empty((stop - start, n_trades))
+        row = start
+        while row < stop:
+            block = row // _BLOCK_PATHS
+            block_stop = min(stop, (block + 1) * _BLOCK_PATHS)
+            generators[block].random(out=uniform[row - start:block_stop - start])
+            row = block_stop
+
+        if method == "bootstrap":
+            picks = np.multiply(uniform, n_trades, out=uniform).astype(np.intp)
+        else:
+            # Sorting random keys gives each row an independent random permutation
+            picks = np.argsort(uniform, axis=1)
+        del uniform
+        final[start:stop], max_drawdown[start:stop], sharpe[start:stop] = _path_stats(
+            returns[picks], initial_capital, annualise
+        )
+
+    # The backtest's own path, for placing it within the distribution
+    actual_final, actual_drawdown, actual_sharpe = _path_stats(returns[None, :].copy(), initial_capital, annualise)
+
+    return {
+        'method': method,
+        'n_paths': n_paths,
+        'n_trades': n_trades,
+        'seed': seed,
+        'initial_capital': initial_capital,
+        'final_capital': _bands(final, percentiles),
+        'total_return_percent': _bands((final / initial_capital - 1) * 100, percentiles),
+        'max_drawdown_percent': _bands(max_drawdown, percentiles),
+        'sharpe_ratio': _bands(sharpe, percentiles),
+        'probability_of_loss': round(float(np.mean(final < initial_capital)), 4),
+        'actual': {
+            'final_capital': round(float(actual_final[0]), 4),
+            'max_drawdown_percent': round(float(actual_drawdown[0]), 4),
+            'sharpe_ratio': round(float(actual_sharpe[0]), 4),
+            # Share of simulated paths with a deeper drawdown than the backtest's
+            'drawdown_exceeded_by': round(float(np.mean(max_drawdown > actual_drawdown[0])), 4),
+        },
+    }
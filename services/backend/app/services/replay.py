@@ -0,0 +1,115 @@
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.dataset import COLUMNS, OHLCVDataset
+from app.services.backtest_service import BacktestEngine
+from app.services.feeds import BarFeed, ReplayFeed
+from strategies.base import BaseStrategy
+
+
+class PaperSession:
+    """One ticker's strategy fed batch by batch, with the signals it produced so far."""
+
+    def __init__(self, ticker: str, strategy: BaseStrategy, history: OHLCVDataset):
+        self.ticker = ticker
+        self.strategy = strategy
+        self.history = history
+        self.batches: List[OHLCVDataset] = []
+        self.signals: List[Dict] = []
+        strategy.warm_up(history)
+
+    def on_bars(self, batch: OHLCVDataset) -> List[Dict]:
+        self.batches.append(batch)
+        signals = self.strategy.on_bars(batch)
+        self.signals.extend(signals)
+        return signals
+
+    @property
+    def bars(self) -> OHLCVDataset:
+        """History plus everything replayed so far (signal indices refer to this)."""
+        parts = [self.history] + self.batches
+        if len(parts) == 1:
+            return self.history
+        return OHLCVDataset(
+            *(np.concatenate([getattr(part, name) for part in parts]) for name in COLUMNS),
+            tz=self.history.tz or parts[-1].tz
+        )
+
+
+class ReplayEngine:
+    """
+    Paper-trades a strategy over a bar feed, one session per ticker.
+
+    Any BarFeed works; with a ReplayFeed this is an accelerated historical
+    replay, with a live feed it is paper trading. Strategies go through the
+    BaseStrategy incremental interface (warm_up/on_bars), so existing
+    strategies run unchanged, and at the end (or whenever result() is
+    called) the signals so far are run through an unmodified BacktestEngine.
+    All tickers replay concurrently on the calling event loop.
+    """
+
+    def __init__(
+        self,
+        feed: BarFeed,
+        strategy_factory: Callable[[], BaseStrategy],
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        position_size: float = 1.0,
+        on_signal: Optional[Callable[[str, Dict], None]] = None
+    ):
+        self.feed = feed
+        self.strategy_factory = strategy_factory
+        self.backtest_engine = BacktestEngine(
+            initial_capital=initial_capital,
+            commission=commission,
+            position_size=position_size
+        )
+        self.on_signal = on_signal
+        self.sessions: Dict[str, PaperSession] = {}
+
+    async def run(self, tickers: Iterable[str], backtest: bool = True) -> Dict:
+        tickers = list(tickers)
+        await asyncio.gather(*(self._replay(ticker) for ticker in tickers))
+        return self.result(tickers, backtest=backtest)
+
+    async def _replay(self, ticker: str):
+        history = await self.feed.history(ticker)
+        session = self.sessions[ticker] = PaperSession(ticker, self.strategy_factory(), history)
+        after = int(history.timestamp[-1]) if len(history) else None
+
+        async for batch in self.feed.bars(ticker, after):
+            signals = session.on_bars(batch)
+            if self.on_signal is not None:
+                for signal in signals:
+                    self.on_signal(ticker, signal)
+
+    def result(self, tickers: Optional[Iterable[str]] = None, backtest: bool = True) -> Dict:
+        results = {}
+        for ticker in (self.sessions if tickers is None else tickers):
+            session = self.sessions[ticker]
+            bars = session.bars
+            entry = {
+                "bars": len(bars),
+                "replayed_bars": len(bars) - len(session.history),
+                "signals": len(session.signals),
+            }
+            if backtest:
+                entry["backtest"] = self.backtest_engine.run_backtest(session.signals, bars)
+            results[ticker] = entry
+
+        stats = self.feed.stats() if isinstance(self.feed, ReplayFeed) else None
+        return {"tickers": results, "stats": stats}
+
+
+def replay(
+    bars: Dict[str, OHLCVDataset],
+    strategy_factory: Callable[[], BaseStrategy],
+    speed: Optional[float] = None,
+    warmup: int = 0,
+    **engine_options
+) -> Dict:
+    """Synchronous one-shot replay of in-memory bars (e.g. BarCache.stored()) at `speed`."""
+    feed = ReplayFeed.from_datasets(bars, speed=speed, warmup=warmup)
+    return asyncio.run(ReplayEngine(feed, strategy_factory, **engine_options).run(bars))
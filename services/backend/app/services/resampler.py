@@ -0,0 +1,151 @@
+from math import gcd
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.dataset import OHLCVDataset
+
+# Intraday yfinance intervals and their width in minutes
+INTRADAY_MINUTES = {
+    "1m": 1,
+    "2m": 2,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "60m": 60,
+    "90m": 90,
+    "1h": 60,
+}
+
+# Buckets that follow the local calendar rather than a fixed width
+CALENDAR_INTERVALS = ("1d", "1wk", "1mo")
+
+_MINUTE = 60 * 1_000_000_000
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
+# Intraday buckets start on this grid (or the interval, if finer) after a session's first bar
+_SESSION_GRID = 30 * _MINUTE
+
+# Rows reduced per pass; bounds the temporaries when resampling very long histories
+_CHUNK_ROWS = 4_000_000
+
+
+def can_resample(source: str, interval: str) -> bool:
+    """Whether `interval` bars can be built exactly from `source` bars."""
+    if source == interval:
+        return False
+    if interval in CALENDAR_INTERVALS:
+        return source in INTRADAY_MINUTES or (source == "1d" and interval != "1d")
+    if interval in INTRADAY_MINUTES and source in INTRADAY_MINUTES:
+        width, step = INTRADAY_MINUTES[interval], INTRADAY_MINUTES[source]
+        return width > step and width % step == 0
+    return False
+
+
+def finer_intervals(interval: str) -> List[str]:
+    """Intervals `interval` can be built from, coarsest (fewest rows to reduce) first."""
+    sources = [source for source in INTRADAY_MINUTES if can_resample(source, interval)]
+    sources.sort(key=lambda source: -INTRADAY_MINUTES[source])
+    if can_resample("1d", interval):
+        sources.insert(0, "1d")
+    return sources
+
+
+def resample(bars: OHLCVDataset, interval: str, chunk_rows: int = _CHUNK_ROWS) -> OHLCVDataset:
+    """
+    Aggregate bars to a coarser interval: first open, max high, min low, last close, summed volume.
+
+    Buckets follow the dataset's timezone. Daily, weekly (Monday) and monthly
+    bars cover local calendar days and are stamped at local midnight, like
+    yfinance's. Intraday buckets never span two local days and are aligned
+    to each day's first bar, so hourly bars of a session opening at 9:30 run
+    9:30, 10:30, ... Empty buckets produce no bar.
+    """
+    if interval not in INTRADAY_MINUTES and interval not in CALENDAR_INTERVALS:
+        raise ValueError(f"Cannot resample to interval '{interval}'")
+
+    n = len(bars)
+    parts = []
+    begin = 0
+    while begin < n:
+        stop = min(begin + chunk_rows, n)
+        timestamps = bars.timestamp[begin:stop]
+        local = timestamps + _utc_offsets(timestamps, bars.tz)
+        days = local // _DAY
+        labels = _bucket_labels(local, days, interval)
+        starts = _run_starts(labels)
+
+        if stop < n:
+            # The last bucket (and, intraday, the last day's alignment) may continue in the next chunk
+            cut = min(int(starts[-1]), int(_run_starts(days)[-1]))
+            if cut == 0:
+                chunk_rows *= 2
+                continue
+            stop = begin + cut
+            starts = starts[starts < cut]
+            labels = labels[:cut]
+
+        parts.append(_reduce(bars, begin, stop, starts, labels[starts]))
+        begin = stop
+
+    if not parts:
+        return OHLCVDataset.empty(tz=bars.tz)
+    return OHLCVDataset(
+        *(np.concatenate([part[i] for part in parts]) for i in range(6)),
+        tz=bars.tz
+    )
+
+
+def _reduce(bars: OHLCVDataset, begin: int, stop: int, starts: np.ndarray, local_labels: np.ndarray):
+    rows = slice(begin, stop)
+    ends = np.append(starts[1:], stop - begin) - 1
+    # Bucket labels are local wall times; the second pass corrects for a DST change since the first bar
+    guess = local_labels - _utc_offsets(bars.timestamp[begin + starts], bars.tz)
+    timestamps = local_labels - _utc_offsets(guess, bars.tz)
+    return (
+        timestamps,
+        bars.open[begin + starts],
+        np.maximum.reduceat(bars.high[rows], starts),
+        np.minimum.reduceat(bars.low[rows], starts),
+        bars.close[begin + ends],
+        np.add.reduceat(bars.volume[rows], starts),
+    )
+
+
+def _bucket_labels(local: np.ndarray, days: np.ndarray, interval: str) -> np.ndarray:
+    # Local wall-clock start (ns) of the bucket each bar falls in
+    if interval == "1d":
+        return days * _DAY
+    if interval == "1wk":
+        # Day 0 (1970-01-01) was a Thursday
+        return (days - (days + 3) % 7) * _DAY
+    if interval == "1mo":
+        return local.view("datetime64[ns]").astype("datetime64[M]").astype("datetime64[ns]").view(np.int64)
+
+    width = INTRADAY_MINUTES[interval] * _MINUTE
+    grid = gcd(width, _SESSION_GRID)
+    day_starts = _run_starts(days)
+    since_midnight = local - days * _DAY
+    anchors = since_midnight[day_starts] // grid * grid
+    anchor = np.repeat(anchors, np.diff(np.append(day_starts, len(local))))
+    return days * _DAY + anchor + (since_midnight - anchor) // width * width
+
+
+def _run_starts(values: np.ndarray) -> np.ndarray:
+    # Indices where a run of equal values begins
+    return np.concatenate([[0], np.flatnonzero(values[1:] != values[:-1]) + 1])
+
+
+def _utc_offsets(timestamps: np.ndarray, tz: Optional[str]):
+    """Local-minus-UTC offset (ns) for each sorted UTC timestamp."""
+    if tz is None or tz == "UTC" or len(timestamps) == 0:
+        return np.int64(0)
+    import pandas as pd
+
+    # Offsets only change on the hour, so convert one timestamp per distinct hour and spread the result
+    hours = timestamps // _HOUR
+    firsts = _run_starts(hours)
+    index = pd.DatetimeIndex((hours[firsts] * _HOUR).view("datetime64[ns]")).tz_localize("UTC")
+    offsets = index.tz_convert(tz).tz_localize(None).asi8 - hours[firsts] * _HOUR
+    return np.repeat(offsets, np.diff(np.append(firsts, len(timestamps))))
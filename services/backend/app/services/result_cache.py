@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.dataset import COLUMNS, OHLCVDataset
+
+
+def fingerprint(bars: OHLCVDataset) -> str:
+    """Content hash of the bars (every column plus tz); any changed or added bar changes it."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((bars.tz or "").encode())
+    digest.update(np.int64(len(bars)).tobytes())
+    for name in COLUMNS:
+        digest.update(np.ascontiguousarray(getattr(bars, name)).data)
+    return digest.hexdigest()
+
+
+def request_key(**fields) -> str:
+    """Stable key for request fields (strategy parameters, engine settings, ...)."""
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(result: Dict) -> bytes:
+    return json.dumps(result, default=_json_default).encode()
+
+
+class ResultCache:
+    """
+    Backtest results keyed by (request key, data fingerprint).
+
+    The memory tier is an LRU of serialized JSON bounded by its size in
+    bytes; every hit decodes a fresh copy, so callers may modify what they
+    get. The optional disk tier keeps zlib-compressed JSON files and
+    survives restarts. Each request key holds one fingerprint at a time:
+    storing a result for new data drops the entry computed from the old data.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._current: Dict[str, str] = {}  # request key -> fingerprint
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str, data_fingerprint: str) -> Optional[Dict]:
+        with self._lock:
+            payload = self._entries.get(self._slot(key, data_fingerprint))
+            if payload is not None:
+                self._entries.move_to_end(self._slot(key, data_fingerprint))
+                self.hits += 1
+
+        if payload is None:
+            payload = self._read_disk(key, data_fingerprint)
+            with self._lock:
+                if payload is None:
+                    self.misses += 1
+                    return None
+                self.disk_hits += 1
+                self._remember(key, data_fingerprint, payload)
+        # Decoded per hit, outside the lock, so no two callers share nested lists
+        return json.loads(payload)
+
+    def put(self, key: str, data_fingerprint: str, result: Dict):
+        payload = _dumps(result)
+        with self._lock:
+            self._remember(key, data_fingerprint, payload)
+        if self.disk_dir:
+            self._write_disk(key, data_fingerprint, payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current.clear()
+            self._bytes = 0
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for key in os.listdir(self.disk_dir):
+                self._remove_disk(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": bool(self.disk_dir),
+            }
+
+    @staticmethod
+    def _slot(key: str, data_fingerprint: str) -> str:
+        return f"{key}:{data_fingerprint}"
+
+    def _remember(self, key: str, data_fingerprint: str, payload: bytes):
+        # Caller holds self._lock
+        previous = self._current.get(key)
+        if previous is not None and previous != data_fingerprint:
+            # The bars behind this request changed; the old result is stale everywhere
+            self._drop(self._slot(key, previous))
+            self.invalidations += 1
+        self._current[key] = data_fingerprint
+
+        slot = self._slot(key, data_fingerprint)
+        self._drop(slot)
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[slot] = payload
+        self._bytes += len(payload)
+
+        while self._bytes > self.max_bytes:
+            old_slot, _ = next(iter(self._entries.items()))
+            self._drop(old_slot)
+            self.evictions += 1
+
+    def _drop(self, slot: str):
+        payload = self._entries.pop(slot, None)
+        if payload is not None:
+            self._bytes -= len(payload)
+
+    def _path(self, key: str, data_fingerprint: str) -> str:
+        # One directory per request key, so results for superseded data are easy to find
+        return os.path.join(self.disk_dir, key, f"{data_fingerprint}.json.z")
+
+    def _read_disk(self, key: str, data_fingerprint: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(key, data_fingerprint), "rb") as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def _write_disk(self, key: str, data_fingerprint: str, payload: bytes):
+        path = self._path(key, data_fingerprint)
+        # Drop results computed from older bars, including ones left by a previous process
+        self._remove_disk(key, keep=os.path.basename(path))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(payload, 1))
+        os.replace(tmp_path, path)
+
+    def _remove_disk(self, key: str, keep: Optional[str] = None):
+        directory = os.path.join(self.disk_dir, key)
+        try:
+            names = os.listdir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        for name in names:
+            if name != keep and name.endswith(".json.z"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+result_cache = ResultCache(
+    max_bytes=settings.RESULT_CACHE_MAX_MB * 1024 * 1024,
+    disk_dir=settings.RESULT_CACHE_DIR or None
+)
@@ -0,0 +1,204 @@
+import itertools
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.dataset import OHLCVDataset
+from app.core.shared_data import SharedBarsHandle, SharedOHLCV, attach_shared
+from app.services.backtest_service import BacktestEngine
+from strategies.rsi_strategy import RSIStrategy
+
+# Result columns a sweep can be ranked by, besides the keys of _calculate_metrics
+SUMMARY_KEYS = ("total_return_percent", "total_pnl", "final_capital", "total_trades")
+
+RANKABLE_METRICS = SUMMARY_KEYS + (
+    "win_rate",
+    "avg_win",
+    "avg_loss",
+    "profit_factor",
+    "max_drawdown",
+    "max_drawdown_percent",
+    "sharpe_ratio",
+    "total_wins",
+    "total_losses",
+    "largest_win",
+    "largest_loss",
+    "avg_holding_bars",
+)
+
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """Cartesian product of parameter value lists, e.g. {'a': [1, 2], 'b': [3]}."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def parameter_range(start: float, stop: float, step: float) -> List[float]:
+    """Inclusive range, tolerant of float steps (30, 32.5, ..., 40)."""
+    if step <= 0:
+        raise ValueError("step must be positive")
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return [start + i * step for i in range(max(count, 0))]
+
+
+def evaluate_rsi(bars: OHLCVDataset, params: Dict, engine_settings: Dict) -> Dict:
+    """One RSIStrategy + BacktestEngine run reduced to a result-table row."""
+    strategy = RSIStrategy(
+        period=int(params["rsi_period"]),
+        oversold=params["oversold"],
+        overbought=params["overbought"]
+    )
+    signals = strategy.compute_signals(bars)
+    result = BacktestEngine(**engine_settings).run_backtest(signals, bars)
+
+    row = dict(params)
+    row.update({key: result[key] for key in SUMMARY_KEYS})
+    row.update(result["metrics"])
+    return row
+
+
+# Per-process read-only view of the bars, attached from shared memory by name
+_worker_bars: Optional[OHLCVDataset] = None
+
+
+def _init_worker(handle: SharedBarsHandle):
+    global _worker_bars
+    _worker_bars = attach_shared(handle)
+
+
+def _evaluate_batch(batch: List[Dict], engine_settings: Dict) -> List[Dict]:
+    return [evaluate_rsi(_worker_bars, params, engine_settings) for params in batch]
+
+
+class ParameterSweep:
+    """
+    Evaluates RSIStrategy backtests for every parameter set on a process pool.
+
+    The bars are published once into shared memory and workers attach to them
+    by name, so nothing but parameters and result rows is pickled. Work is
+    submitted in small batches with only a few batches in flight, so a cancel()
+    takes effect after the batches currently running finish.
+    """
+
+    def __init__(
+        self,
+        bars: OHLCVDataset,
+        parameter_sets: List[Dict],
+        engine_settings: Dict,
+        max_workers: int = 1,
+        batch_size: Optional[int] = None,
+        sweep_id: Optional[str] = None
+    ):
+        self.bars = bars
+        self.parameter_sets = parameter_sets
+        self.engine_settings = engine_settings
+        self.max_workers = max(1, min(max_workers, len(parameter_sets) or 1))
+        self.batch_size = batch_size or max(1, len(parameter_sets) // (self.max_workers * 8))
+        self.sweep_id = sweep_id or uuid.uuid4().hex
+
+        self.completed = 0
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def total(self) -> int:
+        return len(self.parameter_sets)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self, on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Run to completion (or cancellation) and return the rows evaluated so far."""
+        results = []
+
+        def collect(rows):
+            for row in rows:
+                results.append(row)
+                self.completed += 1
+                if on_result is not None:
+                    on_result(row)
+
+        batches = [
+            self.parameter_sets[i:i + self.batch_size]
+            for i in range(0, len(self.parameter_sets), self.batch_size)
+        ]
+
+        if self.max_workers == 1:
+            for batch in batches:
+                if self.cancelled:
+                    break
+                collect([evaluate_rsi(self.bars, params, self.engine_settings) for params in batch])
+            return results
+
+        # The segment is unlinked on the way out, also when a worker or batch fails
+        with SharedOHLCV(self.bars) as shared, ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(shared.handle,)
+        ) as pool:
+            pending = set()
+            queue = iter(batches)
+            while True:
+                while not self.cancelled and len(pending) < self.max_workers * 2:
+                    batch = next(queue, None)
+                    if batch is None:
+                        break
+                    pending.add(pool.submit(_evaluate_batch, batch, self.engine_settings))
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if not future.cancelled():
+                        collect(future.result())
+
+                if self.cancelled:
+                    for future in pending:
+                        future.cancel()
+
+        return results
+
+
+def rank_results(results: List[Dict], metric: str, descending: bool = True) -> List[Dict]:
+    """Sort rows by `metric`; rows where it is missing or NaN go last."""
+    def key(row):
+        value = row.get(metric)
+        missing = value is None or (isinstance(value, float) and np.isnan(value))
+        if missing:
+            return (1, 0.0)
+        return (0, -value if descending else value)
+
+    return sorted(results, key=key)
+
+
+# Sweeps currently running in this process, so they can be cancelled by id
+_active_sweeps: Dict[str, ParameterSweep] = {}
+_active_lock = threading.Lock()
+
+
+def register_sweep(sweep: ParameterSweep):
+    with _active_lock:
+        if sweep.sweep_id in _active_sweeps:
+            raise ValueError(f"Sweep '{sweep.sweep_id}' is already running")
+        _active_sweeps[sweep.sweep_id] = sweep
+
+
+def unregister_sweep(sweep: ParameterSweep):
+    with _active_lock:
+        _active_sweeps.pop(sweep.sweep_id, None)
+
+
+def cancel_sweep(sweep_id: str) -> bool:
+    with _active_lock:
+        sweep = _active_sweeps.get(sweep_id)
+    if sweep is None:
+        return False
+    sweep.cancel()
+    return True
@@ -0,0 +1,161 @@
+"""
+Shared test setup: puts the backend and its benchmarks on sys.path and
+provides the synthetic market data and fakes the test modules use as
+fixtures.
+"""
+import sys
+import os
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "benchmarks"))
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.dataset import OHLCVDataset
+
+MINUTE_NS = 60 * 1_000_000_000
+HOUR_NS = 60 * MINUTE_NS
+
+# The fake clock and downloads work in epoch seconds; NOW is on the hour
+HOUR = 3600
+NOW = 1_700_000_000 - 1_700_000_000 % HOUR
+
+
+def _synthetic_bars(
+    n: int = 500,
+    seed: int = 0,
+    step: int = HOUR_NS,
+    start: int = 0,
+    spread: float = 0.0,
+    jitter: bool = False,
+    volume: float = 1000.0,
+    tz="UTC"
+) -> OHLCVDataset:
+    """
+    A seeded random walk of closes (1% steps from 100) as evenly spaced bars.
+
+    Bars are `step` ns apart from `start`. Highs and lows sit `spread` (a
+    fraction of the close) either side of it, or a random part of that
+    when `jitter` is set. Opens equal the closes.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    up = down = spread
+    if jitter:
+        up = rng.random(n) * spread
+        down = rng.random(n) * spread
+    return OHLCVDataset(
+        timestamp=start + np.arange(n, dtype=np.int64) * step,
+        open=close,
+        high=close * (1 + up),
+        low=close * (1 - down),
+        close=close,
+        volume=np.full(n, float(volume)),
+        tz=tz,
+    )
+
+
+@pytest.fixture
+def synthetic_bars():
+    """Factory for seeded random-walk bars: synthetic_bars(n, seed, step=..., spread=..., ...)."""
+    return _synthetic_bars
+
+
+def _assert_same_result(expected, got):
+    assert expected["total_trades"] == got["total_trades"]
+    assert got["final_capital"] == pytest.approx(expected["final_capital"], rel=1e-9)
+    np.testing.assert_allclose(got["equity_curve"], expected["equity_curve"], rtol=1e-9)
+
+    for a, b in zip(expected["trades"], got["trades"]):
+        assert a["entry_time"] == b["entry_time"]
+        assert a["exit_time"] == b["exit_time"]
+        assert a["holding_bars"] == b["holding_bars"]
+        for key in ("entry_price", "exit_price", "shares", "pnl", "pnl_percent", "commission_total"):
+            assert b[key] == pytest.approx(a[key], rel=1e-9, abs=1e-9)
+
+    for key, value in expected["metrics"].items():
+        assert got["metrics"][key] == pytest.approx(value, abs=0.011)
+
+
+@pytest.fixture
+def assert_same_result():
+    """Checks two run_backtest results agree, up to float rounding in the metrics."""
+    return _assert_same_result
+
+
+class FakeProvider:
+    """Market-data provider returning the same hourly bars after `delay` seconds, tracking concurrent calls."""
+
+    def __init__(self, delay=0.05, n=200):
+        self.delay = delay
+        self.n = n
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, period, interval):
+        with self._lock:
+            self.calls.append((ticker, period, interval))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if ticker == "FAIL":
+                raise RuntimeError("upstream down")
+            return _synthetic_bars(self.n, seed=7, spread=0.01)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def fake_provider():
+    """Factory for FakeProvider: fake_provider(delay=..., n=...)."""
+    return FakeProvider
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeYahoo:
+    """Hourly bars up to the clock's current time, recording every call."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+
+    def __call__(self, ticker, interval, period=None, start=None):
+        self.calls.append({"period": period, "start": start})
+        end = self.clock.now
+        first = end - 40 * 24 * HOUR if start is None else int(start.timestamp())
+        stamps = np.arange(first, end + 1, HOUR)
+        index = pd.DatetimeIndex(pd.to_datetime(stamps, unit="s", utc=True)).tz_convert("America/New_York")
+        close = 100 + (stamps - stamps[0]) / HOUR * 0.01
+        return pd.DataFrame(
+            {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+            index=index,
+        )
+
+
+@pytest.fixture
+def clock():
+    """A settable clock in epoch seconds, starting on the hour."""
+    return FakeClock(NOW)
+
+
+@pytest.fixture
+def yahoo(clock):
+    """yfinance-style download of hourly bars up to `clock`."""
+    return FakeYahoo(clock)
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import analytics as analytics_router
+from app.services import analytics
+from app.services.backtest_service import BacktestEngine
+
+app = FastAPI()
+app.include_router(analytics_router.router, prefix="/api/v1/analytics")
+client = TestClient(app)
+
+
+def make_equity(n=1500, seed=4):
+    rng = np.random.default_rng(seed)
+    return 10_000 * np.cumprod(1 + rng.normal(0.0003, 0.01, n))
+
+
+def windows(values, window):
+    return [values[i - window + 1:i + 1] for i in range(window - 1, len(values))]
+
+
+@pytest.mark.parametrize("window", [1, 2, 7, 64])
+def test_rolling_max_matches_brute_force(window):
+    x = np.random.default_rng(0).normal(size=500)
+    expected = [x[max(0, i - window + 1):i + 1].max() for i in range(len(x))]
+    np.testing.assert_array_equal(analytics.rolling_max(x, window), expected)
+
+
+def test_rolling_ratios_match_per_window_definitions():
+    returns = analytics.simple_returns(make_equity())
+    window = 50
+
+    sharpe = analytics.rolling_sharpe(returns, window)
+    sortino = analytics.rolling_sortino(returns, window)
+    volatility = analytics.rolling_volatility(returns, window)
+
+    assert np.isnan(sharpe[:window - 1]).all()
+    scale = np.sqrt(252)
+    np.testing.assert_allclose(sharpe[window - 1:], [w.mean() / w.std() * scale for w in windows(returns, window)], rtol=1e-9)
+    np.testing.assert_allclose(
+        sortino[window - 1:],
+        [w.mean() / np.sqrt(np.mean(np.minimum(w, 0) ** 2)) * scale for w in windows(returns, window)],
+        rtol=1e-9
+    )
+    np.testing.assert_allclose(volatility[window - 1:], [w.std() * scale for w in windows(returns, window)], rtol=1e-9)
+
+
+def test_flat_windows_give_zero_rather_than_noise():
+    returns = np.concatenate([np.random.default_rng(1).normal(0, 0.01, 100), np.full(100, 0.001)])
+    assert analytics.rolling_sharpe(returns, 20)[-1] == 0
+    assert analytics.rolling_sortino(returns, 20)[-1] == 0
+    assert analytics.rolling_volatility(returns, 20)[-1] == 0
+
+
+def test_rolling_calmar_and_underwater_duration():
+    equity = make_equity()
+    window = 100
+    calmar = analytics.rolling_calmar(equity, window)
+    assert np.isnan(calmar[:window]).all()
+
+    for i in (window, 700, len(equity) - 1):
+        segment = equity[i - window:i + 1]
+        trailing = [equity[max(0, j - window + 1):j + 1].max() for j in range(i - window + 1, i + 1)]
+        worst = np.max(1 - equity[i - window + 1:i + 1] / trailing)
+        annual = (segment[-1] / segment[0]) ** (252 / window) - 1
+        assert calmar[i] == pytest.approx(annual / worst)
+
+    underwater = analytics.underwater_duration([1, 2, 1.5, 1.8, 2.5, 2.4, 2.5, 2.6])
+    np.testing.assert_array_equal(underwater, [0, 0, 1, 2, 0, 1, 0, 0])
+
+
+def test_calculate_metrics_uses_first_largest_drawdown():
+    engine = BacktestEngine()
+    trades = [
+        {'pnl': 120.0, 'holding_bars': 3},
+        {'pnl': -40.0, 'holding_bars': 5},
+        {'pnl': 0.0, 'holding_bars': 2},
+    ]
+    metrics = engine._calculate_metrics(trades, [100, 120, 90, 130, 100, 140])
+
+    assert metrics['win_rate'] == 33.33
+    assert metrics['avg_loss'] == -20.0
+    assert metrics['profit_factor'] == 3.0
+    assert metrics['total_losses'] == 2
+    assert metrics['avg_holding_bars'] == 3.3
+    assert metrics['max_drawdown'] == 30
+    assert metrics['max_drawdown_percent'] == 25.0
+
+
+def test_endpoint_returns_summary_trades_and_series():
+    equity = make_equity(400)
+    response = client.post("/api/v1/analytics", json={
+        "equity": equity.tolist(),
+        "pnl": [50.0, -20.0],
+        "holding_bars": [4, 6],
+        "window": 30
+    })
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["count"] == 400
+    assert body["summary"]["max_underwater_bars"] == analytics.underwater_duration(equity).max()
+    assert body["trades"]["total_wins"] == 1
+    assert len(body["series"]["sharpe"]) == 400
+    assert body["series"]["sharpe"][29] is None
+    assert body["series"]["sharpe"][30] == pytest.approx(analytics.rolling_metrics(equity, 30)["sharpe"][30])
+
+    summary_only = client.post("/api/v1/analytics", json={"equity": equity.tolist(), "include_series": False})
+    assert summary_only.json()["series"] is None
+
+
+def test_endpoint_rejects_non_positive_equity():
+    response = client.post("/api/v1/analytics", json={"equity": [100, 0, 50]})
+    assert response.status_code == 422
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import indicators
+from app.api.v1.endpoints import indicators as indicators_router
+
+app = FastAPI()
+app.include_router(indicators_router.router, prefix="/api/v1/indicators")
+client = TestClient(app)
+
+
+@pytest.fixture
+def make_payload(synthetic_bars):
+    def make(n=300):
+        bars = synthetic_bars(n, seed=2, spread=0.01)
+        return {"high": bars.high.tolist(), "low": bars.low.tolist(), "close": bars.close.tolist()}
+    return make
+
+
+def test_batch_matches_single_indicator_kernels(make_payload):
+    payload = make_payload()
+    payload["indicators"] = [
+        {"name": "rsi", "period": 7},
+        {"name": "rsi", "period": 14},
+        {"name": "sma", "period": 10},
+        {"name": "sma", "period": 50},
+        {"name": "ema", "period": 20, "key": "fast"},
+        {"name": "atr", "period": 14},
+        {"name": "sma", "period": 5, "source": "high"},
+        {"name": "true_range"},
+    ]
+    response = client.post("/api/v1/indicators/batch", json=payload)
+    assert response.status_code == 200
+
+    body = response.json()
+    columns = body["columns"]
+    assert body["count"] == 300
+    assert set(columns) == {"rsi_7", "rsi_14", "sma_10", "sma_50", "fast", "atr_14", "sma_high_5", "true_range"}
+    assert all(len(values) == 300 for values in columns.values())
+    assert columns["rsi_14"][:14] == [None] * 14
+
+    close, high, low = payload["close"], payload["high"], payload["low"]
+    expected = {
+        "rsi_14": indicators.rsi(close, 14),
+        "sma_50": indicators.sma(close, 50),
+        "fast": indicators.ema(close, 20),
+        "atr_14": indicators.atr(high, low, close, 14),
+        "sma_high_5": indicators.sma(high, 5),
+    }
+    for key, values in expected.items():
+        got = np.array([np.nan if v is None else v for v in columns[key]])
+        np.testing.assert_allclose(got, values, rtol=1e-12)
+
+
+def test_batch_rejects_missing_columns():
+    payload = {"close": [1.0, 2.0, 3.0], "indicators": [{"name": "atr", "period": 2}]}
+    response = client.post("/api/v1/indicators/batch", json=payload)
+    assert response.status_code == 400
+    assert "high" in response.json()["detail"]
+
+
+def test_batch_rejects_unequal_lengths(make_payload):
+    payload = make_payload(50)
+    payload["low"] = payload["low"][:-1]
+    payload["indicators"] = [{"name": "sma", "period": 5}]
+    assert client.post("/api/v1/indicators/batch", json=payload).status_code == 400
+
+
+def test_batch_rejects_different_indicators_under_one_key(make_payload):
+    payload = make_payload(50)
+    payload["indicators"] = [{"name": "rsi", "period": 14, "key": "x"}, {"name": "sma", "period": 5, "key": "x"}]
+    response = client.post("/api/v1/indicators/batch", json=payload)
+    assert response.status_code == 400
+    assert "'x'" in response.json()["detail"]
+
+
+def test_batch_computes_a_repeated_spec_once(make_payload):
+    payload = make_payload(50)
+    payload["indicators"] = [{"name": "sma", "period": 5}, {"name": "sma", "period": 5}]
+    response = client.post("/api/v1/indicators/batch", json=payload)
+    assert response.status_code == 200
+    assert list(response.json()["columns"]) == ["sma_5"]
@@ -0,0 +1,39 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import routes
+
+app = FastAPI()
+app.include_router(routes.router, prefix="/api/v1")
+client = TestClient(app)
+
+CLOSE = [
+    44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08,
+    45.89, 46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64,
+]
+
+
+def post_rsi(**extra):
+    response = client.post("/api/v1/indicators/rsi", json={"close": CLOSE, "period": 14, **extra})
+    assert response.status_code == 200
+    return response.json()["rsi"]
+
+
+def test_rsi_defaults_to_rolling_mean_smoothing():
+    # Values of the original pandas rolling-mean implementation
+    rsi = post_rsi()
+    assert rsi[:14] == [0.0] * 14
+    assert rsi[14:] == pytest.approx([70.4641, 70.0210, 69.8312, 80.5677, 73.3333, 59.8063], abs=1e-4)
+    assert post_rsi(smoothing="sma") == rsi
+
+
+def test_rsi_wilder_smoothing_is_opt_in():
+    rsi = post_rsi(smoothing="wilder")
+    assert rsi[:14] == [0.0] * 14
+    assert rsi[14:] == pytest.approx([70.4641, 66.2496, 66.4809, 69.3469, 66.2947, 57.9150], abs=1e-4)
+
+
+def test_unknown_smoothing_is_rejected():
+    response = client.post("/api/v1/indicators/rsi", json={"close": CLOSE, "period": 14, "smoothing": "ema"})
+    assert response.status_code == 422
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from app.services.bar_cache import BarCache
+
+HOUR = 3600
+
+
+@pytest.fixture
+def cache(tmp_path, clock, yahoo):
+    return BarCache(str(tmp_path), fetch=yahoo, clock=clock)
+
+
+def test_repeat_request_is_served_from_disk(cache, clock, yahoo):
+    first = cache.get("QQQ", "1mo", "1h")
+    second = cache.get("QQQ", "1mo", "1h")
+
+    assert len(yahoo.calls) == 1
+    assert second.tz == "America/New_York"
+    assert first.timestamp[-1] == clock.now * 1_000_000_000
+    np.testing.assert_array_equal(first.close, second.close)
+
+
+def test_stale_entry_only_fetches_tail(cache, clock, yahoo):
+    fetched_until = clock.now
+    before = cache.get("GC=F", "1mo", "1h")
+
+    clock.now += 3 * HOUR
+    after = cache.get("GC=F", "1mo", "1h")
+
+    assert len(yahoo.calls) == 2
+    assert yahoo.calls[1]["period"] is None
+    assert int(yahoo.calls[1]["start"].timestamp()) == fetched_until
+    assert after.timestamp[-1] == clock.now * 1_000_000_000
+    assert len(np.unique(after.timestamp)) == len(after)
+    np.testing.assert_array_equal(np.diff(after.timestamp), HOUR * 1_000_000_000)
+    assert len(after) >= len(before)
+
+
+def test_longer_period_triggers_full_download(cache, yahoo):
+    cache.get("QQQ", "5d", "1h")
+    cache.get("QQQ", "1mo", "1h")
+    cache.get("QQQ", "5d", "1h")
+
+    assert [call["period"] for call in yahoo.calls] == ["5d", "1mo"]
+
+
+def test_cache_survives_new_instance(tmp_path, cache, clock, yahoo):
+    cache.get("EURUSD=X", "1mo", "1h")
+
+    reopened = BarCache(str(tmp_path), fetch=yahoo, clock=clock)
+    bars = reopened.get("EURUSD=X", "1mo", "1h")
+
+    assert len(yahoo.calls) == 1
+    assert bars.close.dtype == np.float64
+    assert bars.tz == "America/New_York"
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from app.core.database import Base
+from app.core.dataset import OHLCVDataset
+from app.services.bar_store import BarStore, StoredBarsProvider, decode_copy, encode_copy
+
+HOUR = 3600
+HOUR_NS = HOUR * 1_000_000_000
+NOW = 1_700_000_000 - 1_700_000_000 % HOUR
+
+
+def make_bars(start_hour, count, offset=0.0):
+    ts = (NOW + np.arange(start_hour, start_hour + count) * HOUR) * 1_000_000_000
+    close = 100 + np.arange(count) * 0.5 + offset
+    return OHLCVDataset.from_columns({
+        "timestamp": ts.astype(np.int64),
+        "open": close - 0.25,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": np.full(count, 500.0),
+    }, tz="America/New_York")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bars.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_schema_has_composite_bar_key(engine):
+    pk = inspect(engine).get_pk_constraint("ohlcv_bars")
+    assert pk["constrained_columns"] == ["ticker", "interval", "ts"]
+
+
+def test_ingest_upserts_and_reads_ranges(engine):
+    store = BarStore(engine)
+    assert store.ingest("QQQ", "1h", make_bars(-100, 100)) == 100
+    # Overlapping tail replaces stored bars instead of duplicating them
+    store.ingest("QQQ", "1h", make_bars(-10, 20, offset=1000))
+    store.ingest("QQQ", "1d", make_bars(-5, 5))
+
+    bars = store.read("QQQ", "1h", tz="America/New_York")
+    assert len(bars) == 110
+    assert bars.tz == "America/New_York"
+    assert np.all(np.diff(bars.timestamp) == HOUR_NS)
+    assert bars.close[-20] == make_bars(-10, 20, offset=1000).close[0]
+
+    window = store.read("QQQ", "1h", start=(NOW - 50 * HOUR) * 10**9, end=(NOW - 40 * HOUR) * 10**9)
+    np.testing.assert_array_equal(window.close, make_bars(-100, 100).close[50:60])
+    assert window.timestamp.dtype == np.int64
+
+    series = store.series("QQQ", "1h")
+    assert series["covered_from"] == (NOW - 100 * HOUR) * 10**9
+    assert series["last"] == (NOW + 9 * HOUR) * 10**9
+    assert len(store.read("SPY", "1h")) == 0
+
+
+def test_binary_copy_round_trip():
+    bars = make_bars(-1000, 1000)
+    payload = encode_copy(bars)
+
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+    assert len(payload) == 19 + 1000 * (2 + 6 * 12) + 2
+
+    decoded = decode_copy(payload, tz=bars.tz)
+    for name, column in bars.columns().items():
+        np.testing.assert_array_equal(getattr(decoded, name), column)
+        assert getattr(decoded, name).dtype.isnative
+
+
+def test_provider_serves_repeat_requests_from_store(engine, clock, yahoo):
+    provider = StoredBarsProvider(BarStore(engine, clock=clock), fetch=yahoo, clock=clock)
+
+    first = provider("QQQ", "1mo", "1h")
+    second = provider("QQQ", "5d", "1h")
+    assert len(yahoo.calls) == 1
+    assert second.tz == "America/New_York"
+    assert second.timestamp[-1] == first.timestamp[-1]
+
+    clock.now += 2 * HOUR
+    topped_up = provider("QQQ", "1mo", "1h")
+    assert len(yahoo.calls) == 2
+    assert yahoo.calls[1]["period"] is None
+    assert topped_up.timestamp[-1] == clock.now * 10**9
+    assert len(np.unique(topped_up.timestamp)) == len(topped_up)
+
+
+def test_backtest_run_and_trades_are_saved(engine, fake_provider):
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.deps import get_db, get_market_data
+    from app.main import app
+    from app.models import BacktestRun
+    from app.services.market_data import MarketDataService
+
+    Session = sessionmaker(bind=engine)
+
+    def session():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(fake_provider(delay=0, n=2000))
+    try:
+        response = TestClient(app).post(
+            "/api/v1/strategies/backtest",
+            json={"ticker": "QQQ", "strategy_type": "rsi", "save": True}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+
+    with Session() as db:
+        run = db.get(BacktestRun, body["run_id"])
+        assert run.ticker == "QQQ"
+        assert run.total_trades == body["total_trades"] == len(run.trades) > 0
+        assert run.strategy_parameters["rsi_period"] == 14
+        assert run.trades[0].pnl == pytest.approx(body["trades"][0]["pnl"])
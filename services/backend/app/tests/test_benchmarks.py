@@ -0,0 +1,29 @@
+import suite
+
+
+def test_every_case_runs_on_small_series():
+    results = suite.run_suite([300], repeat=1)
+
+    assert set(results) == {f"{case.name}/300" for case in suite.CASES}
+    assert all(r["seconds"] > 0 and r["peak_bytes"] > 0 for r in results.values())
+
+
+def test_compare_and_baseline_round_trip(tmp_path):
+    results = suite.run_suite([300], only=["rsi", "sma"], repeat=1)
+    path = str(tmp_path / "baseline.json")
+    suite.save_baseline(path, results)
+
+    ratios = suite.compare(results, suite.load_baseline(path))
+
+    assert set(ratios) == {"rsi/300", "sma/300"}
+    assert all(r == {"seconds": 1.0, "peak_bytes": 1.0} for r in ratios.values())
+    assert suite.compare(results, {}) == {}
+    assert suite.missing_baseline(results, suite.load_baseline(path)) == []
+    assert suite.missing_baseline(results, {"rsi/300": results["rsi/300"]}) == ["sma/300"]
+
+
+def test_every_case_has_a_baseline():
+    results = {f"{case.name}/{n}": {} for case in suite.CASES for n in suite.DEFAULT_SIZES
+               if case.max_bars is None or n <= case.max_bars}
+
+    assert suite.missing_baseline(results, suite.load_baseline(suite.BASELINE_PATH)) == []
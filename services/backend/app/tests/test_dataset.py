@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from app.core.dataset import OHLCVDataset
+from app.services.backtest_service import BacktestEngine
+from strategies.rsi_strategy import RSIStrategy
+
+
+@pytest.fixture
+def bars(synthetic_bars):
+    return synthetic_bars(200, seed=7, start=1_700_000_000 * 1_000_000_000, spread=0.01, tz="America/New_York")
+
+
+def test_slices_are_views(bars):
+    window = bars[10:50]
+
+    assert len(window) == 40
+    assert np.shares_memory(window.close, bars.close)
+    assert np.shares_memory(window.timestamp, bars.timestamp)
+
+
+def test_between_uses_half_open_time_range(bars):
+    window = bars.between(bars.timestamp[5], bars.timestamp[9])
+
+    np.testing.assert_array_equal(window.timestamp, bars.timestamp[5:9])
+    assert np.shares_memory(window.open, bars.open)
+
+
+def test_records_round_trip(bars):
+    head = bars[:5]
+    records = head.to_records()
+    restored = OHLCVDataset.from_records(records)
+
+    assert records[0]["timestamp"].endswith("-05:00")
+    np.testing.assert_array_equal(restored.timestamp, head.timestamp)
+    np.testing.assert_array_equal(restored.close, head.close)
+
+
+def test_strategy_and_engine_accept_dataset_and_records_alike(bars):
+    records = bars.to_records()
+    strategy = RSIStrategy(period=14, oversold=40, overbought=60)
+
+    from_bars = strategy.generate_signals(bars)
+    from_records = strategy.generate_signals(records)
+    assert from_bars["signals"] == from_records["signals"]
+    assert from_bars["buy_signals"] > 0 and from_bars["sell_signals"] > 0
+
+    engine = BacktestEngine(initial_capital=10000, commission=0.001)
+    result = engine.run_backtest(from_bars["signals"], bars)
+    assert result == engine.run_backtest(from_records["signals"], records)
+    first_buy = next(s for s in from_bars["signals"] if s["type"] == "BUY")
+    assert result["trades"][0]["entry_time"] == first_buy["timestamp"]
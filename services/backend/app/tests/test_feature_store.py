@@ -0,0 +1,122 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.core.ml.linear_regression import LinearRegressionGD
+from app.core.ml.logistic_regression import LogisticRegression
+from app.services import feature_store
+from app.services.feature_store import FeatureStore, compute_features, feature_names, spec_hash
+from indicators.streaming import StreamingATR, StreamingEMA, StreamingRSI, StreamingSMA
+
+SPEC = [
+    {"name": "return", "lag": 0},
+    {"name": "return", "lag": 3},
+    {"name": "rsi", "period": 14},
+    {"name": "ema_distance", "period": 20},
+    {"name": "sma_distance", "period": 10},
+    {"name": "atr_range", "period": 14},
+]
+
+
+@pytest.fixture
+def bars(synthetic_bars):
+    return synthetic_bars(1000, seed=11, spread=0.01, jitter=True)
+
+
+@pytest.mark.parametrize("cls", [StreamingRSI, StreamingEMA, StreamingSMA, StreamingATR])
+@pytest.mark.parametrize("n", [0, 5, 14, 15, 300])
+def test_streaming_state_from_history_matches_replay(cls, n, synthetic_bars):
+    bars = synthetic_bars(400, seed=11, spread=0.01, jitter=True)
+    records = [{"high": h, "low": lo, "close": c} for h, lo, c in zip(bars.high, bars.low, bars.close)]
+
+    replayed = cls(14)
+    for bar in records[:n]:
+        replayed.update(bar)
+    built = cls.from_history({"high": bars.high[:n], "low": bars.low[:n], "close": bars.close[:n]}, 14)
+
+    np.testing.assert_allclose(
+        [built.update(bar) for bar in records[n:n + 50]],
+        [replayed.update(bar) for bar in records[n:n + 50]],
+        rtol=1e-10
+    )
+
+
+def test_features_match_their_definitions(bars):
+    X, returns = compute_features(bars, SPEC)
+    log_returns = np.diff(np.log(bars.close))
+
+    assert feature_names(SPEC) == ["return_0", "return_3", "rsi_14", "ema_distance_20", "sma_distance_10", "atr_range_14"]
+    np.testing.assert_allclose(X[1:, 0], log_returns)
+    np.testing.assert_allclose(X[4:, 1], log_returns[:-3])
+    np.testing.assert_allclose(returns[1:], log_returns)
+    sma = np.convolve(bars.close, np.ones(10) / 10, mode="valid")
+    np.testing.assert_allclose(X[9:, 4], bars.close[9:] / sma - 1)
+    assert np.isnan(X[:13, 2]).all() and not np.isnan(X[14:, 2]).any()
+
+
+def test_incremental_append_matches_full_build(tmp_path, bars):
+    store = FeatureStore(str(tmp_path))
+
+    store.sync("GC=F", "1h", bars[:600], SPEC)
+    # Bar by bar, then a chunk, each time passing the overlapping history like a refreshed download
+    for stop in range(601, 611):
+        store.sync("GC=F", "1h", bars[stop - 50:stop], SPEC)
+    matrix = store.sync("GC=F", "1h", bars[500:], SPEC)
+
+    expected, returns = compute_features(bars, SPEC)
+    assert len(matrix) == len(bars)
+    np.testing.assert_allclose(matrix.X, expected, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(matrix.returns, returns, rtol=1e-9, equal_nan=True)
+    np.testing.assert_array_equal(matrix.timestamps, bars.timestamp)
+    assert isinstance(matrix.X, np.memmap)
+
+
+def test_reopened_store_serves_the_same_matrix(tmp_path, bars):
+    FeatureStore(str(tmp_path)).sync("QQQ", "1h", bars, SPEC)
+
+    reopened = FeatureStore(str(tmp_path)).get("QQQ", "1h", list(reversed(SPEC))[::-1])
+    assert reopened is not None and len(reopened) == len(bars)
+    assert FeatureStore(str(tmp_path)).get("QQQ", "1h", SPEC[:2]) is None
+    assert spec_hash(SPEC) != spec_hash(SPEC[:2])
+
+
+def test_gap_in_history_rebuilds_and_interrupted_append_is_discarded(tmp_path, monkeypatch, bars):
+    store = FeatureStore(str(tmp_path))
+    store.sync("QQQ", "1h", bars[:500], SPEC)
+
+    # Leftover bytes past meta's row count, as an interrupted append would leave
+    directory = store._dir("QQQ", "1h", feature_store.normalize_spec(SPEC))
+    with open(os.path.join(directory, "features.f64"), "ab") as f:
+        f.write(b"\x00" * 8 * len(SPEC) * 3)
+    matrix = store.sync("QQQ", "1h", bars[400:520], SPEC)
+    np.testing.assert_allclose(matrix.X, compute_features(bars[:520], SPEC)[0], rtol=1e-9, equal_nan=True)
+
+    rebuilt = store.sync("QQQ", "1h", bars[700:], SPEC)
+    assert rebuilt.timestamps[0] == bars.timestamp[700]
+    with open(os.path.join(directory, "meta.json")) as f:
+        assert json.load(f)["rows"] == len(bars) - 700
+
+
+def test_batches_train_models_without_copying(tmp_path, synthetic_bars):
+    bars = synthetic_bars(3000, seed=11, spread=0.01, jitter=True)
+    matrix = FeatureStore(str(tmp_path)).sync("QQQ", "1h", bars, SPEC)
+
+    batches = list(matrix.batches(1000))
+    assert batches[0][0].base is not None and np.shares_memory(batches[0][0], matrix.X)
+    assert sum(len(X) for X, _ in batches) == len(matrix) - 1 - matrix.first_complete
+    np.testing.assert_array_equal(batches[0][1][:5], matrix.returns[matrix.first_complete + 1:matrix.first_complete + 6])
+
+    regression = LinearRegressionGD(solver="lstsq")
+    for X, y in batches:
+        regression.partial_fit(X, y)
+    full = LinearRegressionGD(solver="lstsq").fit(
+        matrix.X[matrix.first_complete:-1], matrix.targets()[matrix.first_complete:]
+    )
+    np.testing.assert_allclose(regression.predict(matrix.X[100:110]), full.predict(matrix.X[100:110]), rtol=1e-6)
+
+    classifier = LogisticRegression(lr=0.1, n_iters=1, warm_start=True)
+    for X, y in matrix.batches(1000, target="direction"):
+        classifier.fit(X, y)
+    assert classifier.w.shape == (len(SPEC),)
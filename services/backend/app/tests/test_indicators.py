@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+import indicators
+
+
+# Straightforward loop versions the kernels have to agree with
+
+def loop_ema(values, period):
+    k = 2 / (period + 1)
+    out = [values[0]]
+    for v in values[1:]:
+        out.append(v * k + out[-1] * (1 - k))
+    return np.array(out)
+
+
+def loop_sma(values, period):
+    return np.array([np.nan if i < period - 1 else np.mean(values[i - period + 1:i + 1]) for i in range(len(values))])
+
+
+def loop_wilder(values, period):
+    out = [np.nan] * (period - 1) + [np.mean(values[:period])]
+    for v in values[period:]:
+        out.append((out[-1] * (period - 1) + v) / period)
+    return np.array(out)
+
+
+def loop_rsi(close, period, smooth=loop_wilder):
+    deltas = np.diff(close)
+    gain = smooth(np.where(deltas > 0, deltas, 0), period)
+    loss = smooth(np.where(deltas < 0, -deltas, 0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+    return np.concatenate(([np.nan], rsi))
+
+
+def loop_atr(high, low, close, period):
+    tr = [high[0] - low[0]]
+    for i in range(1, len(close)):
+        tr.append(max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])))
+    return np.concatenate(([np.nan], loop_wilder(np.array(tr[1:]), period)))
+
+
+@pytest.fixture
+def series(synthetic_bars):
+    bars = synthetic_bars(5000, seed=1, spread=0.01, jitter=True)
+    return bars.high, bars.low, bars.close
+
+
+@pytest.mark.parametrize("period", [2, 14, 200])
+def test_kernels_match_loop_versions(period, series):
+    high, low, close = series
+
+    np.testing.assert_allclose(indicators.ema(close, period), loop_ema(close, period), rtol=1e-10)
+    np.testing.assert_allclose(indicators.sma(close, period), loop_sma(close, period), rtol=1e-10)
+    np.testing.assert_allclose(indicators.rsi(close, period), loop_rsi(close, period), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(
+        indicators.rsi(close, period, smoothing="sma"), loop_rsi(close, period, loop_sma), rtol=1e-9, atol=1e-9
+    )
+    np.testing.assert_allclose(indicators.atr(high, low, close, period), loop_atr(high, low, close, period), rtol=1e-10)
+
+
+def test_true_range_is_vectorized_loop(series):
+    high, low, close = (column[:200] for column in series)
+    expected = [high[0] - low[0]] + [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])) for i in range(1, 200)
+    ]
+    np.testing.assert_array_equal(indicators.true_range(high, low, close), expected)
+
+
+def test_float32_in_float32_out(series):
+    _, _, close = series
+    close32 = close.astype(np.float32)
+
+    for result in (indicators.ema(close32, 10), indicators.sma(close32, 10), indicators.rsi(close32, 10)):
+        assert result.dtype == np.float32
+    np.testing.assert_allclose(indicators.rsi(close32, 10), indicators.rsi(close, 10), rtol=1e-4)
+    assert indicators.rsi(list(close), 10).dtype == np.float64
+
+
+def test_short_inputs():
+    assert np.isnan(indicators.rsi([1.0, 2.0], 14)).all()
+    assert np.isnan(indicators.sma([1.0, 2.0], 5)).all()
+    assert len(indicators.ema([], 5)) == 0
+    with pytest.raises(ValueError):
+        indicators.atr([1.0], [1.0], [1.0], 14)
+
+
+def test_flat_series_rsi_is_100():
+    assert indicators.rsi(np.full(30, 5.0), 14)[-1] == 100
+    assert indicators.rsi(np.full(30, 5.0), 14, smoothing="sma")[-1] == 100
+
+
+def test_unknown_rsi_smoothing_raises():
+    with pytest.raises(ValueError):
+        indicators.rsi(np.arange(30.0), 14, smoothing="ema")
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_job_queue, get_market_data, get_result_cache
+from app.main import app
+from app.services.job_queue import CANCELLED, FAILED, QUEUED, SUCCEEDED, JobQueue, QueueFull
+from app.services.market_data import MarketDataService
+from app.services.result_cache import ResultCache
+
+
+def wait_for(job, timeout=10):
+    deadline = time.time() + timeout
+    while job.status in (QUEUED, "running"):
+        assert time.time() < deadline, f"job still {job.status}"
+        time.sleep(0.01)
+    return job
+
+
+def blocked_queue():
+    """One-worker queue whose worker is held busy until the returned event is set."""
+    queue = JobQueue(max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold(job):
+        started.set()
+        release.wait(5)
+
+    blocker = queue.submit("hold", hold, client="setup")
+    started.wait(5)
+    return queue, release, blocker
+
+
+def test_priority_then_fair_share_between_clients():
+    queue, release, blocker = blocked_queue()
+    order = []
+
+    def record(name):
+        return lambda job: order.append(name)
+
+    for i in range(3):
+        queue.submit("t", record(f"greedy-{i}"), client="greedy")
+    queue.submit("t", record("polite-0"), client="polite")
+    queue.submit("t", record("urgent"), client="greedy", priority=5)
+    last = queue.submit("t", record("polite-1"), client="polite")
+
+    release.set()
+    wait_for(last)
+    queue.shutdown()
+
+    assert order[0] == "urgent"
+    # Round robin between the two clients instead of draining greedy first
+    assert order[1:] == ["polite-0", "greedy-0", "polite-1", "greedy-1", "greedy-2"]
+
+
+def test_progress_partial_results_and_cancel():
+    queue = JobQueue(max_workers=1)
+    step = threading.Event()
+
+    def work(job):
+        for i in range(1, 5):
+            step.wait(5)
+            step.clear()
+            job.check_cancelled()
+            job.report(i, 4, row={"i": i})
+        return "done"
+
+    job = queue.submit("t", work)
+    step.set()
+    while job.completed < 1:
+        time.sleep(0.01)
+    assert job.progress == 25.0
+    assert job.partial_results() == [{"i": 1}]
+
+    queue.cancel(job.id)
+    step.set()
+    wait_for(job)
+    assert job.status == CANCELLED
+    assert job.partial_results() == [{"i": 1}]
+
+    queue2, release, _ = blocked_queue()
+    pending = queue2.submit("t", lambda job: "never")
+    assert queue2.cancel(pending.id).status == CANCELLED
+    release.set()
+    queue2.shutdown()
+    assert pending.result is None
+
+    queue.shutdown()
+
+
+def test_failures_ttl_and_queue_bound():
+    now = [1000.0]
+    queue = JobQueue(max_workers=1, ttl=60, max_queued=1, clock=lambda: now[0])
+
+    def boom(job):
+        raise ValueError("bad input")
+
+    job = wait_for(queue.submit("t", boom))
+    assert (job.status, job.error) == (FAILED, "bad input")
+
+    now[0] += 61
+    assert queue.get(job.id) is None
+
+    queue2, release, _ = blocked_queue()
+    queue2.max_queued = 1
+    queue2.submit("t", lambda job: None)
+    with pytest.raises(QueueFull):
+        queue2.submit("t", lambda job: None)
+    release.set()
+    queue2.shutdown()
+    queue.shutdown()
+
+
+def test_backtest_and_sweep_jobs_over_http(fake_provider):
+    queue = JobQueue(max_workers=2)
+    provider = fake_provider(delay=0, n=1500)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(provider)
+    app.dependency_overrides[get_result_cache] = lambda: ResultCache()
+    try:
+        with TestClient(app) as client:
+            submitted = client.post(
+                "/api/v1/jobs/backtest",
+                json={"ticker": "QQQ", "strategy_type": "rsi"},
+                headers={"X-Client-Id": "ui"}
+            )
+            assert submitted.status_code == 202
+            job_id = submitted.json()["job_id"]
+
+            sweep = client.post("/api/v1/jobs/sweep?priority=3", json={
+                "ticker": "QQQ", "rsi_period": [10, 14], "oversold": [25, 30], "max_workers": 1
+            })
+            sweep_id = sweep.json()["job_id"]
+
+            wait_for(queue.get(job_id))
+            wait_for(queue.get(sweep_id))
+
+            status = client.get(f"/api/v1/jobs/{sweep_id}").json()
+            assert status["status"] == SUCCEEDED and status["progress"] == 100.0
+            assert status["priority"] == 3
+
+            result = client.get(f"/api/v1/jobs/{job_id}/result").json()
+            assert result["ticker"] == "QQQ" and "metrics" in result
+            assert len(client.get(f"/api/v1/jobs/{sweep_id}/result").json()["results"]) == 4
+
+            assert client.get("/api/v1/jobs", params={"client": "ui"}).json()["jobs"][0]["job_id"] == job_id
+            assert client.get("/api/v1/jobs/nope").status_code == 404
+            assert client.post("/api/v1/jobs/sweep", json={"ticker": "QQQ", "rank_by": "x"}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+        queue.shutdown()
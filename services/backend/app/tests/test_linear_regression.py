@@ -19,3 +19,72 @@ def test_lr():
     print("Predict 6:", model.predict([[6]]))
 
 test_lr()
+
+
+def make_data(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3)) * [1, 10, 100] + [0, 50, 1000]
+    W = np.array([[1.5, -2.0], [0.3, 0.1], [-0.02, 0.05]])
+    Y = X @ W + [4.0, -1.0] + rng.normal(0, 0.1, (n, 2))
+    return X, Y
+
+
+def test_lstsq_matches_numpy_for_every_target():
+    X, Y = make_data()
+    model = LinearRegressionGD(solver="lstsq").fit(X, Y)
+
+    A = np.column_stack([X, np.ones(len(X))])
+    expected = A @ np.linalg.lstsq(A, Y, rcond=None)[0]
+    np.testing.assert_allclose(model.predict(X), expected, atol=1e-8)
+
+    single = LinearRegressionGD(solver="lstsq", normalize=False).fit(X, Y[:, 1])
+    np.testing.assert_allclose(single.predict(X), expected[:, 1], atol=1e-8)
+
+
+def test_one_dimensional_x_fits_and_predicts_as_a_column():
+    x = np.arange(10, dtype=float)
+    y = 2 * x + 1
+
+    for solver in ("lstsq", "gd"):
+        model = LinearRegressionGD(solver=solver, lr=0.1, epochs=5000).fit(x, y)
+        np.testing.assert_allclose(model.predict(x), y, atol=1e-3)
+        np.testing.assert_allclose(model.predict(x), model.predict(x.reshape(-1, 1)))
+
+
+def test_sgd_stops_early_near_the_least_squares_fit():
+    X, Y = make_data()
+    model = LinearRegressionGD(solver="sgd", lr=0.05, epochs=500, random_state=0).fit(X, Y)
+    best = LinearRegressionGD(solver="lstsq").fit(X, Y)
+
+    assert model.n_iter_ < 500
+    assert model.mse(Y, model.predict(X)) < 1.05 * best.mse(Y, best.predict(X))
+
+
+def test_partial_fit_lstsq_is_exact_on_all_rows_seen():
+    X, Y = make_data()
+    model = LinearRegressionGD(solver="lstsq")
+    for start in range(0, len(X), 7):
+        model.partial_fit(X[start:start + 7], Y[start:start + 7])
+
+    full = LinearRegressionGD(solver="lstsq").fit(X, Y)
+    assert model.n_seen_ == len(X)
+    np.testing.assert_allclose(model.mean, X.mean(axis=0))
+    np.testing.assert_allclose(model.std, X.std(axis=0) + 1e-8)
+    np.testing.assert_allclose(model.predict(X), full.predict(X), atol=1e-8)
+
+
+def test_partial_fit_rescaling_keeps_predictions_then_learns():
+    X, Y = make_data()
+    model = LinearRegressionGD(solver="sgd", lr=0.05, random_state=1)
+    model.partial_fit(X[:500], Y[:500])
+
+    before = model.predict(X)
+    model.lr = 0.0
+    model.partial_fit(X[500:1000], Y[500:1000])
+    assert not np.allclose(model.mean, X[:500].mean(axis=0))
+    np.testing.assert_allclose(model.predict(X), before, atol=1e-9)
+
+    model.lr = 0.05
+    for start in range(1000, len(X), 50):
+        model.partial_fit(X[start:start + 50], Y[start:start + 50])
+    assert model.mse(Y, model.predict(X)) < 0.5 * model.mse(Y, before)
@@ -0,0 +1,117 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_stream_hub
+from app.main import app
+from app.services.bar_cache import BarCache
+from app.services.feeds import BarFeed, ReplayFeed
+from app.services.live_stream import StreamHub
+from strategies.rsi_strategy import RSIStrategy
+
+
+class ListFeed(BarFeed):
+    """History, then the remaining bars in batches of `batch`, counting subscriptions."""
+
+    def __init__(self, bars, warmup=100, batch=7):
+        self.data = bars
+        self.warmup = warmup
+        self.batch = batch
+        self.opened = 0
+        self.release = asyncio.Event()
+
+    async def history(self, ticker):
+        self.opened += 1
+        return self.data[:self.warmup]
+
+    async def bars(self, ticker, after):
+        await self.release.wait()
+        for start in range(self.warmup, len(self.data), self.batch):
+            await asyncio.sleep(0)
+            yield self.data[start:start + self.batch]
+
+
+def test_on_bar_matches_generate_signals(synthetic_bars):
+    bars = synthetic_bars(600, seed=7, spread=0.01)
+    expected = RSIStrategy().generate_signals(bars)["signals"]
+
+    strategy = RSIStrategy()
+    strategy.warm_up(bars[:50])
+    timestamps = bars.iso_timestamps()
+    streamed = [
+        signal for i in range(50, len(bars))
+        if (signal := strategy.on_bar({"timestamp": timestamps[i], "close": bars.close[i]})) is not None
+    ]
+
+    assert streamed == [signal for signal in expected if signal["index"] >= 50]
+    assert len(streamed) > 10
+
+
+def test_hub_fans_out_one_computation_and_slow_clients_only_lose_their_own_backlog(synthetic_bars):
+    bars = synthetic_bars(600, seed=7, spread=0.01)
+    expected = [s for s in RSIStrategy().generate_signals(bars)["signals"] if s["index"] >= 100]
+
+    async def scenario():
+        feed = ListFeed(bars)
+        hub = StreamHub(feed, queue_size=8)
+        fast = hub.subscribe("QQQ", {"period": 14})
+        slow = hub.subscribe("QQQ", {"period": 14})
+        other = hub.subscribe("QQQ", {"period": 21})
+
+        received = []
+
+        async def consume():
+            while True:
+                message = await fast.get()
+                if message["event"] == "end":
+                    return
+                received.append(message)
+
+        consumer = asyncio.create_task(consume())
+        feed.release.set()
+        await asyncio.wait_for(consumer, 5)
+
+        backlog = [await slow.get() for _ in range(9)]
+        stats = hub.stats()
+        hub.unsubscribe(fast)
+        hub.unsubscribe(slow)
+        hub.unsubscribe(other)
+        await asyncio.sleep(0)
+        return feed, received, backlog, stats, hub.stats()
+
+    feed, received, backlog, stats, after = asyncio.run(scenario())
+
+    assert feed.opened == 2  # one channel per parameter set, shared by both period-14 clients
+    assert [m["index"] for m in received] == [s["index"] for s in expected]
+    assert all(m["event"] == "signal" and m["ticker"] == "QQQ" for m in received)
+    assert backlog[0] == {"event": "lagged", "dropped": len(expected) + 1 - 8}
+    assert backlog[-1]["event"] == "end"
+    assert stats["subscribers"] == 3 and stats["dropped"] > 0
+    assert after == {"channels": 0, "subscribers": 0, "dropped": 0}
+
+
+def test_websocket_streams_replayed_signals(tmp_path, synthetic_bars):
+    bars = synthetic_bars(300, seed=7, spread=0.01)
+    store = BarCache(str(tmp_path), fetch=None)
+    store._write("GC=F", "1h", {"bars": bars, "covered_from": 0, "fetched_at": 0.0})
+    app.dependency_overrides[get_stream_hub] = lambda: StreamHub(
+        ReplayFeed.from_cache(str(tmp_path), "1h", warmup=100)
+    )
+
+    try:
+        with TestClient(app) as client:
+            with client.websocket_connect("/api/v1/stream/gc=f?period=14") as ws:
+                assert ws.receive_json()["event"] == "subscribed"
+                messages = []
+                while not messages or messages[-1]["event"] != "end":
+                    messages.append(ws.receive_json())
+
+            with client.websocket_connect("/api/v1/stream/MISSING") as ws:
+                assert ws.receive_json()["event"] == "subscribed"
+                assert ws.receive_json()["event"] == "error"
+    finally:
+        app.dependency_overrides.clear()
+
+    # Query parameters arrive as floats, which shows in the reason text
+    expected = [s for s in RSIStrategy(14, 30.0, 70.0).generate_signals(bars)["signals"] if s["index"] >= 100]
+    assert messages[:-1] == [{"event": "signal", "ticker": "GC=F", **s} for s in expected]
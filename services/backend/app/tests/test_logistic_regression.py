@@ -0,0 +1,83 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from app.core.ml.logistic_regression import LogisticRegression, direction_dataset
+
+
+def make_problem(n_models=3, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_models, n, 4))
+    true_w = rng.normal(0, 1.5, size=(n_models, 4))
+    logits = np.einsum("mnd,md->mn", X, true_w) + rng.logistic(size=(n_models, n))
+    return X, (logits > 0).astype(float)
+
+
+def test_sigmoid_and_loss_are_stable_at_extremes():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        np.testing.assert_allclose(LogisticRegression.sigmoid([-1000, 0, 1000]), [0, 0.5, 1])
+
+        # Separable data drives the weights up without overflowing
+        X = np.array([[-1.0], [1.0]])
+        y = np.array([0.0, 1.0])
+        model = LogisticRegression(lr=10, n_iters=2000).fit(X, y)
+        assert model.loss(X, y) < 1e-3
+        assert np.isfinite(model.w).all()
+
+
+def test_gradient_descent_reaches_the_regularised_optimum():
+    X, y = make_problem(n_models=1)
+    model = LogisticRegression(lr=0.5, n_iters=3000, l2=0.1).fit(X[0], y[0])
+
+    p = model.predict_prob(X[0])
+    grad_w = X[0].T @ (p - y[0]) / len(y[0]) + 0.1 * model.w
+    grad_b = np.mean(p - y[0])
+    assert np.abs(grad_w).max() < 1e-6 and abs(grad_b) < 1e-6
+
+
+def test_batched_training_matches_one_model_at_a_time():
+    X, y = make_problem()
+    batched = LogisticRegression(lr=0.5, n_iters=200, l2=0.01).fit(X, y)
+
+    for k in range(len(X)):
+        single = LogisticRegression(lr=0.5, n_iters=200, l2=0.01).fit(X[k], y[k])
+        np.testing.assert_allclose(batched.w[k], single.w, atol=1e-12)
+        assert batched.b[k] == pytest.approx(single.b)
+    assert (batched.score(X, y) > 0.75).all()
+
+
+def test_nan_padding_is_ignored():
+    X, y = make_problem()
+    padded_X, padded_y = X.copy(), y.copy()
+    padded_X[1, :100] = np.nan
+    padded_y[1, :100] = np.nan
+
+    batched = LogisticRegression(lr=0.5, n_iters=100).fit(padded_X, padded_y)
+    single = LogisticRegression(lr=0.5, n_iters=100).fit(X[1, 100:], y[1, 100:])
+    np.testing.assert_allclose(batched.w[1], single.w, atol=1e-12)
+
+
+def test_minibatch_warm_start_and_early_stopping():
+    X, y = make_problem(n_models=2, n=2000)
+    model = LogisticRegression(lr=0.1, n_iters=3, batch_size=64, random_state=0).fit(X, y)
+    start_loss = model.loss(X, y)
+
+    model.warm_start = True
+    model.n_iters = 500
+    model.tol = 1e-7
+    model.fit(X, y)
+    assert (model.loss(X, y) < start_loss).all()
+    assert model.n_iter_ < 500
+
+
+def test_direction_dataset_aligns_features_with_next_bar():
+    closes = np.array([[100, 101, 100, 102, 103, 101.0], [np.nan, 50, 51, 50, 49, 50.0]])
+    X, y = direction_dataset(closes, lags=2)
+
+    returns = np.diff(np.log(closes), axis=1)
+    assert X.shape == (2, 3, 2)
+    np.testing.assert_allclose(X[0, 0], returns[0, :2])
+    np.testing.assert_array_equal(y[0], [1, 1, 0])
+    assert np.isnan(X[1, 0]).any() and not np.isnan(y[1]).any()
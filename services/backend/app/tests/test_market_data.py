@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_market_data
+from app.main import app
+from app.services.market_data import MarketDataService
+
+
+def test_identical_requests_share_one_fetch(fake_provider):
+    provider = fake_provider()
+    service = MarketDataService(provider)
+
+    async def main():
+        return await asyncio.gather(*(service.get_bars("QQQ", "1mo", "1h") for _ in range(10)))
+
+    results = asyncio.run(main())
+
+    assert len(provider.calls) == 1
+    assert service.coalesced == 9
+    assert all(bars is results[0] for bars in results)
+    assert service.in_flight() == 0
+
+
+def test_upstream_concurrency_is_bounded(fake_provider):
+    provider = fake_provider()
+    service = MarketDataService(provider, max_concurrency=2)
+
+    async def main():
+        await asyncio.gather(*(service.get_bars(f"T{i}", "1mo", "1h") for i in range(6)))
+
+    asyncio.run(main())
+
+    assert len(provider.calls) == 6
+    assert provider.peak == 2
+
+
+def test_timeout_does_not_cancel_shared_fetch(fake_provider):
+    provider = fake_provider(delay=0.2)
+    service = MarketDataService(provider)
+
+    async def main():
+        impatient = service.get_bars("QQQ", "1mo", "1h", timeout=0.01)
+        patient = service.get_bars("QQQ", "1mo", "1h")
+        return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+    impatient, patient = asyncio.run(main())
+
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert len(patient) == provider.n
+    assert len(provider.calls) == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached(fake_provider):
+    provider = fake_provider()
+    service = MarketDataService(provider)
+
+    async def main():
+        return await asyncio.gather(
+            *(service.get_bars("FAIL", "1mo", "1h") for _ in range(3)),
+            return_exceptions=True
+        )
+
+    assert all(isinstance(e, RuntimeError) for e in asyncio.run(main()))
+    assert len(provider.calls) == 1
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.get_bars("FAIL", "1mo", "1h"))
+    assert len(provider.calls) == 2
+
+
+@pytest.fixture
+def client(fake_provider):
+    provider = fake_provider(delay=0)
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(provider, timeout=5)
+    yield TestClient(app), provider
+    app.dependency_overrides.clear()
+
+
+def test_endpoints_use_injected_provider(client):
+    client, provider = client
+
+    response = client.get("/api/v1/nasdaq", params={"period": "5d", "interval": "1h"})
+    assert response.status_code == 200
+    assert response.json()["count"] == provider.n
+
+    response = client.post("/api/v1/strategies/backtest", json={"ticker": "QQQ", "strategy_type": "rsi"})
+    assert response.status_code == 200
+    assert response.json()["ticker"] == "QQQ"
+
+    assert provider.calls == [("QQQ", "5d", "1h"), ("QQQ", "1mo", "1h")]
+
+    assert client.get("/api/v1/custom/fail").status_code == 500
+
+
+def test_slow_provider_answers_504(fake_provider):
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(fake_provider(delay=0.5), timeout=0.05)
+    try:
+        response = TestClient(app).post("/api/v1/strategies/backtest", json={"ticker": "QQQ", "strategy_type": "rsi"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 504
+    assert response.json()["detail"] == "Timed out fetching data for QQQ"
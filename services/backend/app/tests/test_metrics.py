@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_market_data, get_result_cache
+from app.core.metrics import Histogram, MetricsMiddleware, span
+from app.main import app
+from app.services.market_data import MarketDataService
+from app.services.result_cache import ResultCache
+
+BACKTEST = {"ticker": "QQQ", "strategy_type": "rsi", "oversold": 45, "overbought": 55}
+
+
+@pytest.fixture
+def client(fake_provider):
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(fake_provider(delay=0, n=500))
+    app.dependency_overrides[get_result_cache] = lambda: ResultCache()
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", (0.1, 1.0), ("stage",))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'a"b')
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="a\\"b",le="0.1"} 2',
+        'test_seconds_bucket{stage="a\\"b",le="1.0"} 3',
+        'test_seconds_bucket{stage="a\\"b",le="+Inf"} 4',
+        'test_seconds_sum{stage="a\\"b"} 3.65',
+        'test_seconds_count{stage="a\\"b"} 4',
+    ]
+
+
+def test_backtest_reports_its_stages_and_shows_up_in_metrics(client):
+    response = client.post("/api/v1/strategies/backtest", json=BACKTEST)
+    assert response.status_code == 200
+
+    stages = [part.split(";")[0] for part in response.headers["server-timing"].split(", ")]
+    assert stages[:4] == ["load_bars", "cache_lookup", "generate_signals", "run_backtest"]
+    assert stages[-2:] == ["serialize", "total"]
+
+    client.get("/api/v1/jobs/missing-job")
+    text = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/strategies/backtest",status="200"} ' in text
+    # Path parameters are labelled by the route template, not the value
+    assert 'route="/api/v1/jobs/{job_id}",status="404"' in text
+    assert 'stage_duration_seconds_bucket{stage="generate_signals",le="+Inf"}' in text
+    response_size = [line for line in text.splitlines() if line.startswith(
+        'http_response_size_bytes_sum{method="POST",route="/api/v1/strategies/backtest"}'
+    )]
+    assert float(response_size[0].split()[-1]) >= len(response.content)
+
+
+def test_profile_header_returns_the_profile_of_worker_threads_too():
+    profiled = FastAPI()
+    profiled.add_middleware(MetricsMiddleware, profiling=True)
+
+    @profiled.get("/work")
+    def work():
+        # Sync endpoints run on a worker thread; the span there is what gets profiled
+        with span("work"):
+            return {"total": sum(i * i for i in range(10000))}
+
+    with TestClient(profiled) as client:
+        plain = client.get("/work")
+        profile = client.get("/work", headers={"X-Profile": "1"})
+
+    assert plain.json() == {"total": sum(i * i for i in range(10000))}
+    assert profile.headers["content-type"].startswith("text/plain")
+    assert "GET /work -> 200" in profile.text
+    assert "function calls" in profile.text and "<genexpr>" in profile.text
+
+
+def test_profile_header_is_ignored_unless_enabled(client):
+    response = client.post("/api/v1/strategies/backtest", json=BACKTEST, headers={"X-Profile": "1"})
+    assert response.headers["content-type"] == "application/json"
+    assert "total_trades" in response.json()
+
+
+def test_spans_from_threads_are_all_recorded():
+    from app.core.metrics import STAGE_DURATION
+
+    def worker():
+        for _ in range(1000):
+            with span("threaded_test_stage"):
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert STAGE_DURATION._series[("threaded_test_stage",)][2] == 4000
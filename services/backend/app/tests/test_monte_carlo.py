@@ -0,0 +1,104 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_market_data, get_result_cache
+from app.main import app
+from app.services import monte_carlo
+from app.services.market_data import MarketDataService
+from app.services.result_cache import ResultCache
+
+
+def make_trades(n=80, seed=3):
+    rng = np.random.default_rng(seed)
+    return [{'pnl': float(p)} for p in rng.normal(15, 120, n)]
+
+
+def test_trade_returns_compound_on_capital_at_entry():
+    returns = monte_carlo.trade_returns([{'pnl': 100.0}, {'pnl': -110.0}], 1000.0)
+    np.testing.assert_allclose(returns, [0.1, -0.1])
+
+
+def test_shuffle_keeps_final_capital_and_varies_drawdown():
+    trades = make_trades()
+    result = monte_carlo.simulate(trades, 10_000, n_paths=2000, method="shuffle", seed=1)
+
+    final = 10_000 + sum(t['pnl'] for t in trades)
+    assert result['final_capital']['p5'] == pytest.approx(final)
+    assert result['final_capital']['p95'] == pytest.approx(final)
+    assert result['actual']['final_capital'] == pytest.approx(final)
+    assert result['max_drawdown_percent']['p5'] < result['max_drawdown_percent']['p95']
+
+
+def test_bootstrap_is_reproducible_and_independent_of_chunking():
+    trades = make_trades()
+    first = monte_carlo.simulate(trades, 10_000, n_paths=2500, seed=42)
+    small_chunks = monte_carlo.simulate(trades, 10_000, n_paths=2500, seed=42, chunk_bytes=1)
+    other_seed = monte_carlo.simulate(trades, 10_000, n_paths=2500, seed=43)
+
+    assert first == small_chunks
+    assert first != other_seed
+    bands = first['final_capital']
+    assert bands['p5'] < bands['p25'] < bands['p50'] < bands['p75'] < bands['p95']
+
+
+@pytest.mark.parametrize("method", monte_carlo.METHODS)
+def test_chunk_budget_splits_blocks_of_long_paths(method):
+    # One 1000-path block of 5000 trades is ~120 MB of working arrays
+    trades = make_trades(5000)
+    budget = 2 * 1024 * 1024
+    whole = monte_carlo.simulate(trades, 10_000, n_paths=1200, method=method, seed=5)
+
+    tracemalloc.start()
+    try:
+        chunked = monte_carlo.simulate(trades, 10_000, n_paths=1200, method=method, seed=5, chunk_bytes=budget)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert chunked == whole
+    assert peak < 2 * budget
+
+
+def test_drawdown_matches_path_by_path_reference():
+    returns = np.array([[0.1, -0.2, 0.05, -0.1], [-0.05, 0.1, -0.3, 0.5]])
+    final, max_drawdown, _ = monte_carlo._path_stats(returns.copy(), 100.0, 1.0)
+
+    for row, expected_final, dd in zip(returns, final, max_drawdown):
+        equity = 100.0 * np.cumprod(1 + row)
+        peak, worst = 100.0, 0.0
+        for value in equity:
+            peak = max(peak, value)
+            worst = max(worst, 1 - value / peak)
+        assert expected_final == pytest.approx(equity[-1])
+        assert dd == pytest.approx(worst * 100)
+
+
+def test_invalid_input_raises():
+    with pytest.raises(ValueError):
+        monte_carlo.simulate([], 10_000)
+    with pytest.raises(ValueError):
+        monte_carlo.simulate(make_trades(), 10_000, method="jackknife")
+
+
+def test_monte_carlo_endpoint_reuses_cached_backtest(fake_provider):
+    provider = fake_provider(delay=0, n=1500)
+    cache = ResultCache()
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(provider)
+    app.dependency_overrides[get_result_cache] = lambda: cache
+    try:
+        client = TestClient(app)
+        body = {"ticker": "QQQ", "strategy_type": "rsi", "oversold": 35}
+        backtest = client.post("/api/v1/strategies/backtest", json=body).json()
+        response = client.post("/api/v1/strategies/monte-carlo", json={**body, "n_paths": 500, "seed": 9})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    result = response.json()
+    assert cache.hits == 1
+    assert result['backtest']['final_capital'] == backtest['final_capital']
+    assert result['monte_carlo']['n_trades'] == backtest['total_trades']
+    assert result['monte_carlo']['actual']['final_capital'] == pytest.approx(backtest['final_capital'])
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from app.core.dataset import OHLCVDataset
+from app.services.backtest_service import BacktestEngine
+from app.services.feeds import ReplayFeed
+from app.services.replay import ReplayEngine, replay
+from indicators import StreamingRSI
+from strategies.regression_strategy import LinearRegressionStrategy
+from strategies.rsi_strategy import RSIStrategy
+
+HOUR_NS = 3600 * 1_000_000_000
+
+
+def test_rsi_update_many_matches_update(synthetic_bars):
+    closes = synthetic_bars(2000, 1, spread=0.002).close
+    one_by_one = StreamingRSI(14)
+    expected = [one_by_one.update(c) for c in closes]
+
+    batched = StreamingRSI(14)
+    got = np.concatenate([batched.update_many({"close": closes[a:b]}) for a, b in [(0, 5), (5, 40), (40, 2000)]])
+    np.testing.assert_allclose(got, expected, rtol=1e-10, equal_nan=True)
+
+
+def test_regression_on_bars_refits_only_the_new_windows(synthetic_bars):
+    bars = synthetic_bars(600, 6, spread=0.002)
+    strategy = LinearRegressionStrategy(lookback=20, threshold=0.2, min_r2=0.3)
+    expected = [s for s in strategy.generate_signals(bars)["signals"] if s["index"] >= 10]
+
+    strategy.warm_up(bars[:10])
+    cuts = [10, 11, 15, 30, 31, 200, 600]
+    got = [s for a, b in zip(cuts, cuts[1:]) for s in strategy.on_bars(bars[a:b])]
+
+    assert len(got) > 10
+    assert [s["index"] for s in got] == [s["index"] for s in expected]
+    for a, b in zip(got, expected):
+        assert a["forecast"] == pytest.approx(b["forecast"], abs=1e-3)
+    assert len(strategy._tail) == 19
+
+
+@pytest.mark.parametrize("factory", [RSIStrategy, lambda: LinearRegressionStrategy(lookback=20, threshold=0.2, min_r2=0.3)])
+def test_replay_matches_a_backtest_over_the_same_bars(factory, synthetic_bars):
+    data = {"QQQ": synthetic_bars(3000, 2, spread=0.002), "GC=F": synthetic_bars(2500, 3, spread=0.002)}
+    feed = ReplayFeed.from_datasets(data, warmup=200, batch_size=97)
+    result = asyncio.run(ReplayEngine(feed, factory).run(data))
+
+    for ticker, bars in data.items():
+        signals = factory().generate_signals(bars)["signals"]
+        # Signals inside the warm-up are history, not replayed events
+        expected = BacktestEngine().run_backtest([s for s in signals if s["index"] >= 200], bars)
+        replayed = result["tickers"][ticker]
+        assert replayed["replayed_bars"] == len(bars) - 200
+        assert replayed["signals"] > 0
+        assert replayed["backtest"]["final_capital"] == pytest.approx(expected["final_capital"])
+        assert replayed["backtest"]["total_trades"] == expected["total_trades"]
+
+    assert result["stats"]["bars"] == 3000 + 2500 - 400
+    assert result["stats"]["tickers"]["QQQ"]["batches"] == -(-2800 // 97)
+
+
+def test_paced_replay_follows_bar_spacing_and_caps_gaps(synthetic_bars):
+    bars = synthetic_bars(31, 4, spread=0.002)
+    # Hourly bars at 360000x are 10ms apart; the 10-day gap is capped at 50ms
+    timestamps = bars.timestamp.copy()
+    timestamps[20:] += 240 * HOUR_NS
+    bars = OHLCVDataset(timestamps, bars.open, bars.high, bars.low, bars.close, bars.volume, tz="UTC")
+    feed = ReplayFeed.from_datasets({"QQQ": bars}, speed=360_000, max_gap=0.05)
+
+    seen = []
+    started = time.monotonic()
+    result = asyncio.run(ReplayEngine(feed, RSIStrategy, on_signal=lambda t, s: seen.append(s)).run(["QQQ"]))
+    elapsed = time.monotonic() - started
+
+    stats = result["stats"]["tickers"]["QQQ"]
+    assert 0.29 <= elapsed < 2.0
+    assert stats["bars"] == 31 and stats["finished"]
+    assert 0 <= stats["mean_lag"] <= stats["max_lag"]
+    assert len(seen) == result["tickers"]["QQQ"]["signals"]
+
+
+def test_max_speed_replay_throughput(synthetic_bars):
+    data = {f"T{i}": synthetic_bars(250_000, i, spread=0.002) for i in range(4)}
+    result = replay(data, RSIStrategy, warmup=100)
+
+    assert result["stats"]["bars"] == 4 * (250_000 - 100)
+    # The suite's replay case tracks the real figure; this only guards against falling off a cliff
+    assert result["stats"]["bars_per_second"] > 200_000
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.dataset import OHLCVDataset
+from app.services.bar_cache import BarCache
+from app.services.resampler import finer_intervals, resample
+
+
+MINUTE_NS = 60 * 1_000_000_000
+
+
+def session_minutes(first="2024-03-04", last="2024-04-05", tz="America/New_York", seed=3):
+    # Regular-hours 1m bars across the March DST change and a month end, with a few missing minutes
+    days = pd.bdate_range(first, last)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{day.date()} 09:30", f"{day.date()} 15:59", freq="1min", tz=tz) for day in days
+    ])).tz_convert(tz)
+    rng = np.random.default_rng(seed)
+    index = index[rng.random(len(index)) > 0.02]
+    close = 100 + np.cumsum(rng.normal(0, 0.05, len(index)))
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.02, len(index)),
+        "High": close + 0.1,
+        "Low": close - 0.1,
+        "Close": close,
+        "Volume": rng.integers(1, 1000, len(index)).astype(float),
+    }, index=index)
+
+
+def reference(frame, rule, **kwargs):
+    grouped = frame.resample(rule, **kwargs)
+    out = pd.DataFrame({
+        "Open": grouped["Open"].first(),
+        "High": grouped["High"].max(),
+        "Low": grouped["Low"].min(),
+        "Close": grouped["Close"].last(),
+        "Volume": grouped["Volume"].sum(),
+    })
+    return OHLCVDataset.from_frame(out[grouped["Close"].count() > 0])
+
+
+def assert_same(bars, expected):
+    np.testing.assert_array_equal(bars.timestamp, expected.timestamp)
+    for name in ("open", "high", "low", "close", "volume"):
+        np.testing.assert_allclose(getattr(bars, name), getattr(expected, name))
+    assert bars.tz == expected.tz
+
+
+@pytest.mark.parametrize("interval,rule,kwargs", [
+    ("5m", "5min", {}),
+    ("15m", "15min", {}),
+    ("1h", "1h", {"offset": "30min"}),
+    ("1d", "1D", {}),
+    ("1wk", "W-MON", {"label": "left", "closed": "left"}),
+    ("1mo", "MS", {}),
+])
+def test_session_bars_match_pandas(interval, rule, kwargs):
+    frame = session_minutes()
+    minutes = OHLCVDataset.from_frame(frame)
+
+    assert_same(resample(minutes, interval), reference(frame, rule, **kwargs))
+    # Chunk edges must not split a bucket or shift a session's alignment
+    assert_same(resample(minutes, interval, chunk_rows=97), resample(minutes, interval))
+
+
+def test_ninety_minute_bars_restart_each_session():
+    # pandas keeps one absolute grid, which only matches a session-aligned one within a DST regime
+    frame = session_minutes("2024-03-04", "2024-03-08")
+    expected = reference(frame, "90min", origin="start_day", offset="30min")
+    assert_same(resample(OHLCVDataset.from_frame(frame), "90m"), expected)
+
+
+def test_hourly_bars_follow_the_session_open_through_dst():
+    hourly = resample(OHLCVDataset.from_frame(session_minutes()), "1h")
+    local = pd.to_datetime(hourly.iso_timestamps(), utc=True).tz_convert("America/New_York")
+
+    assert set(local.strftime("%H:%M")) == {"09:30", "10:30", "11:30", "12:30", "13:30", "14:30", "15:30"}
+    assert {offset.total_seconds() / 3600 for offset in local.map(lambda t: t.utcoffset())} == {-5, -4}
+
+
+def test_utc_series_uses_fixed_grid():
+    stamps = np.arange(0, 3 * 24 * 60) * MINUTE_NS + 1_700_000_000 * 10 ** 9
+    bars = OHLCVDataset(stamps, *(np.arange(len(stamps), dtype=float) for _ in range(5)))
+    daily = resample(bars, "1d")
+
+    assert len(daily) == 4
+    assert (daily.timestamp % (24 * 60 * MINUTE_NS) == 0).all()
+    assert daily.volume.sum() == bars.volume.sum()
+    assert daily.open[1] == daily.close[0] + 1
+
+
+def test_empty_and_invalid():
+    assert len(resample(OHLCVDataset.empty(tz="UTC"), "1h")) == 0
+    with pytest.raises(ValueError):
+        resample(OHLCVDataset.empty(), "3mo")
+    assert finer_intervals("1h")[:2] == ["30m", "15m"]
+    assert finer_intervals("1wk")[0] == "1d"
+    assert finer_intervals("1m") == []
+
+
+class FakeMinuteYahoo:
+    """Serves slices of one fixed 1m history, recording every call."""
+
+    def __init__(self, frame, clock):
+        self.frame = frame
+        self.clock = clock
+        self.calls = []
+
+    def __call__(self, ticker, interval, period=None, start=None):
+        self.calls.append({"interval": interval, "period": period})
+        if interval != "1m":
+            raise AssertionError("only minute bars should be downloaded")
+        end = pd.Timestamp(self.clock.now, unit="s", tz="UTC")
+        first = end - pd.Timedelta(period.upper()) if start is None else pd.Timestamp(start)
+        return self.frame[(self.frame.index >= first) & (self.frame.index <= end)]
+
+
+def test_bar_cache_builds_coarser_intervals_from_stored_minutes(tmp_path, clock):
+    frame = session_minutes("2024-04-01", "2024-04-12")
+    clock.now = pd.Timestamp("2024-04-10 20:00", tz="UTC").timestamp()
+    fetch = FakeMinuteYahoo(frame, clock)
+    cache = BarCache(str(tmp_path), fetch=fetch, clock=clock)
+
+    minutes = cache.get("QQQ", "5d", "1m")
+    hourly = cache.get("QQQ", "5d", "1h")
+    daily = cache.get("QQQ", "5d", "1d")
+
+    assert len(fetch.calls) == 1
+    assert_same(hourly, resample(minutes, "1h"))
+    assert_same(daily, resample(minutes, "1d"))
+    assert daily.close[-1] == minutes.close[-1]
+
+    # Stale coarse request tops up the minute series rather than downloading hourly bars
+    clock.now += 24 * 3600
+    hourly = cache.get("QQQ", "5d", "1h")
+    assert [call["period"] for call in fetch.calls] == ["5d", None]
+    assert hourly.timestamp[-1] > minutes.timestamp[-1]
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.dataset import OHLCVDataset
+from app.core.deps import get_market_data, get_result_cache
+from app.main import app
+from app.services.market_data import MarketDataService
+from app.services.result_cache import ResultCache, fingerprint, request_key
+
+
+def make_bars(close):
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    return OHLCVDataset.from_columns({
+        "timestamp": np.arange(n, dtype=np.int64) * 60_000_000_000,
+        "open": close, "high": close, "low": close, "close": close,
+        "volume": np.ones(n),
+    }, tz="UTC")
+
+
+def test_fingerprint_tracks_content_not_identity():
+    a = make_bars([1.0, 2.0, 3.0])
+    assert fingerprint(a) == fingerprint(make_bars([1.0, 2.0, 3.0]))
+    assert fingerprint(a) != fingerprint(make_bars([1.0, 2.0, 3.5]))
+    assert fingerprint(a) != fingerprint(make_bars([1.0, 2.0, 3.0, 4.0]))
+    assert request_key(a=1, b=[1, 2]) == request_key(b=[1, 2], a=1)
+
+
+def test_lru_respects_byte_budget():
+    cache = ResultCache(max_bytes=200)
+    result = {"values": list(range(20))}  # 82 bytes serialized
+
+    for i in range(4):
+        cache.put(f"k{i}", "fp", result)
+    assert cache.get("k0", "fp") is None
+    assert cache.get("k3", "fp") == result
+
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["bytes"] <= 200
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_hits_are_independent_copies(tmp_path):
+    cache = ResultCache(disk_dir=str(tmp_path))
+    result = {"trades": [{"pnl": 1.0}], "equity_curve": [100.0, 101.0]}
+    cache.put("req", "fp", result)
+    result["equity_curve"].append(0.0)
+
+    first = cache.get("req", "fp")
+    first["trades"][0]["pnl"] = -5.0
+    assert cache.get("req", "fp") == {"trades": [{"pnl": 1.0}], "equity_curve": [100.0, 101.0]}
+
+    reopened = ResultCache(disk_dir=str(tmp_path))
+    from_disk = reopened.get("req", "fp")
+    from_disk["equity_curve"].clear()
+    assert reopened.get("req", "fp")["equity_curve"] == [100.0, 101.0]
+    assert reopened.stats()["bytes"] == len(b'{"trades": [{"pnl": 1.0}], "equity_curve": [100.0, 101.0]}')
+
+
+def test_new_data_invalidates_and_disk_tier_survives_restart(tmp_path):
+    cache = ResultCache(disk_dir=str(tmp_path))
+    cache.put("req", "old", {"pnl": 1.0, "n": np.int64(3), "ratio": float("inf")})
+    cache.put("req", "new", {"pnl": 2.0})
+
+    assert cache.get("req", "old") is None
+    assert cache.stats()["invalidations"] == 1
+    assert os.listdir(tmp_path / "req") == ["new.json.z"]
+
+    reopened = ResultCache(disk_dir=str(tmp_path))
+    assert reopened.get("req", "new") == {"pnl": 2.0}
+    assert reopened.get("req", "new") == {"pnl": 2.0}
+    assert (reopened.disk_hits, reopened.hits) == (1, 1)
+
+
+def test_repeat_backtest_is_served_from_cache(fake_provider):
+    provider = fake_provider(delay=0, n=1500)
+    cache = ResultCache()
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(provider)
+    app.dependency_overrides[get_result_cache] = lambda: cache
+    try:
+        client = TestClient(app)
+        body = {"ticker": "QQQ", "strategy_type": "rsi", "oversold": 35}
+        first = client.post("/api/v1/strategies/backtest", json=body)
+        second = client.post("/api/v1/strategies/backtest", json=body)
+        other = client.post("/api/v1/strategies/backtest", json={**body, "comission": 0.002})
+        stats = client.get("/api/v1/strategies/cache").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [r.headers["X-Cache"] for r in (first, second, other)] == ["MISS", "HIT", "MISS"]
+    assert second.json() == first.json()
+    assert other.json()["final_capital"] != first.json()["final_capital"]
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 2
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.dataset import OHLCVDataset
+from app.core.deps import get_market_data, get_result_cache
+from app.core.ml import rolling_regression
+from app.core.ml.rolling_regression import rolling_ols, rolling_trend
+from app.main import app
+from app.services.market_data import MarketDataService
+from app.services.result_cache import ResultCache
+from strategies.regression_strategy import LinearRegressionStrategy
+
+
+def reference_fit(X, y):
+    A = np.column_stack([X, np.ones(len(X))])
+    coef = np.linalg.lstsq(A, y, rcond=None)[0]
+    residual = y - A @ coef
+    r2 = 1 - residual @ residual / np.sum((y - y.mean()) ** 2)
+    return coef[:-1], coef[-1], r2
+
+
+def test_rolling_ols_matches_per_window_lstsq_across_blocks(monkeypatch):
+    # Small blocks so the checked windows straddle several prefix-sum restarts
+    monkeypatch.setattr(rolling_regression, "_BLOCK", 64)
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 2)) + [100, 0]
+    y = X @ [2.0, -1.0] + 5 + rng.normal(0, 1, 500)
+    window = 40
+
+    fit = rolling_ols(X, y, window)
+    assert np.isnan(fit.coef[:window - 1]).all()
+    for end in (window - 1, 63, 64, 150, 499):
+        coef, intercept, r2 = reference_fit(X[end - window + 1:end + 1], y[end - window + 1:end + 1])
+        np.testing.assert_allclose(fit.coef[end], coef, atol=1e-10)
+        assert fit.intercept[end] == pytest.approx(intercept, abs=1e-8)
+        assert fit.r2[end] == pytest.approx(r2, abs=1e-10)
+
+
+def test_rolling_trend_stays_accurate_far_into_a_long_series():
+    rng = np.random.default_rng(1)
+    closes = 100 + np.cumsum(rng.normal(0, 0.1, 200_000))
+    slope, r2, forecast = rolling_trend(closes, 20, horizon=3)
+
+    end = len(closes) - 1
+    local = np.arange(20.0)
+    expected_slope, expected_intercept = np.polyfit(local, closes[end - 19:end + 1], 1)
+    assert slope[end] == pytest.approx(expected_slope, rel=1e-9)
+    assert forecast[end] == pytest.approx(expected_intercept + expected_slope * 22, rel=1e-12)
+
+
+def test_flat_window_does_not_break_the_solve():
+    X = np.concatenate([np.full(30, 5.0), np.arange(30.0)])
+    y = 2 * X + 1
+    fit = rolling_ols(X, y, 10)
+    assert np.isfinite(fit.coef[20:30]).all()
+    np.testing.assert_allclose(fit.predict(X)[9:], y[9:], atol=1e-9)
+
+
+def test_strategy_signals_follow_the_trend():
+    n = 200
+    close = np.concatenate([np.linspace(100, 120, n // 2), np.linspace(120, 100, n // 2)])
+    bars = OHLCVDataset.from_columns({
+        "timestamp": np.arange(n, dtype=np.int64) * 3_600_000_000_000,
+        "open": close, "high": close + 1, "low": close - 1, "close": close,
+        "volume": np.full(n, 1000.0),
+    }, tz="UTC")
+
+    result = LinearRegressionStrategy(lookback=10, horizon=5, threshold=0.3).generate_signals(bars)
+    types = {s['index']: s['type'] for s in result['signals']}
+    assert types[50] == 'BUY' and types[150] == 'SELL'
+    assert min(types) == 9
+
+
+def test_backtest_accepts_linear_regression_strategy(fake_provider):
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(fake_provider(delay=0, n=1500))
+    app.dependency_overrides[get_result_cache] = lambda: ResultCache()
+    try:
+        client = TestClient(app)
+        response = client.post("/api/v1/strategies/backtest", json={
+            "ticker": "QQQ", "strategy_type": "linear_regression", "lookback": 30, "min_r2": 0.3
+        })
+        signals = client.post("/api/v1/strategies/linear-regression-strategy", json={
+            "ticker": "QQQ", "lookback": 30, "min_r2": 0.3
+        })
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['strategy_parameters'] == {'lookback': 30, 'horizon': 5, 'threshold': 0.5, 'min_r2': 0.3}
+    assert body['total_trades'] > 0
+    assert signals.json()['buy_signals'] > 0
@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from app.core.shared_data import SharedOHLCV, attach_shared
+from app.services.backtest_service import BacktestEngine
+from strategies.rsi_strategy import RSIStrategy
+
+
+@pytest.fixture
+def bars(synthetic_bars):
+    return synthetic_bars(500, seed=11, spread=0.001)
+
+
+def run_attached(handle):
+    bars = attach_shared(handle)
+    signals = RSIStrategy(period=14, oversold=40, overbought=60).generate_signals(bars)["signals"]
+    return BacktestEngine().run_backtest(signals, bars)["final_capital"]
+
+
+def test_attached_views_are_zero_copy_and_read_only(bars):
+    with SharedOHLCV(bars) as shared:
+        view = attach_shared(shared.handle)
+
+        for name in ("timestamp", "open", "high", "low", "close", "volume"):
+            np.testing.assert_array_equal(getattr(view, name), getattr(bars, name))
+        assert view.tz == "UTC"
+        assert np.shares_memory(view.close, attach_shared(shared.handle).close)
+        with pytest.raises(ValueError):
+            view.close[0] = 1.0
+
+
+def test_workers_backtest_on_shared_views(bars):
+    signals = RSIStrategy(period=14, oversold=40, overbought=60).generate_signals(bars)["signals"]
+    expected = BacktestEngine().run_backtest(signals, bars)["final_capital"]
+
+    with SharedOHLCV(bars) as shared, ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(run_attached, [shared.handle] * 4))
+
+    assert results == [expected] * 4
+
+
+def test_segment_is_unlinked_on_error(bars):
+    with pytest.raises(RuntimeError):
+        with SharedOHLCV(bars) as shared:
+            name = shared.name
+            raise RuntimeError("job crashed")
+
+    assert shared.closed
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_market_data
+from app.core.signals import BUY, SELL, signal_codes
+from app.main import app
+from app.services.backtest_service import BacktestEngine
+from app.services.market_data import MarketDataService
+from strategies.base import BaseStrategy
+from strategies.regression_strategy import LinearRegressionStrategy
+from strategies.rsi_strategy import RSIStrategy
+
+
+@pytest.mark.parametrize("strategy", [RSIStrategy(14, 45, 55), LinearRegressionStrategy(10, 5, 0.1, 0.3)])
+def test_codes_agree_with_records(strategy, synthetic_bars):
+    bars = synthetic_bars(3000, 1)
+    signals = strategy.compute_signals(bars)
+    records = strategy.generate_signals(bars)["signals"]
+
+    assert signals.codes.dtype == np.int8
+    assert len(signals) == len(records) > 0
+    assert signals.indices.tolist() == [record["index"] for record in records]
+    assert [BUY if record["type"] == "BUY" else SELL for record in records] == signals.codes[signals.indices].tolist()
+    np.testing.assert_array_equal(signal_codes(records, len(bars)), signals.codes)
+
+
+def test_records_are_built_per_page(synthetic_bars):
+    bars = synthetic_bars(3000, 2)
+    strategy = RSIStrategy(14, 45, 55)
+    full = strategy.generate_signals(bars)
+
+    page = strategy.generate_signals(bars, offset=10, limit=5)
+
+    assert page["signals"] == full["signals"][10:15]
+    assert page["total_signals"] == len(full["signals"])
+    assert (page["buy_signals"], page["sell_signals"]) == (full["buy_signals"], full["sell_signals"])
+    assert strategy.compute_signals(bars).records(len(full["signals"])) == []
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_backtest_takes_codes_or_records(engine, synthetic_bars, assert_same_result):
+    bars = synthetic_bars(3000, 3)
+    signals = RSIStrategy(14, 45, 55).compute_signals(bars)
+    backtest = BacktestEngine(engine=engine)
+
+    from_records = backtest.run_backtest(signals.records(), bars)
+
+    assert_same_result(from_records, backtest.run_backtest(signals, bars))
+    assert_same_result(from_records, backtest.run_backtest(signals.codes, bars))
+    with pytest.raises(ValueError):
+        backtest.run_backtest(signals.codes[:-1], bars)
+
+
+class RecordsOnly(BaseStrategy):
+    # A strategy written before compute_signals existed
+    def __init__(self):
+        super().__init__("Every tenth bar")
+
+    def generate_signals(self, data):
+        return {"signals": [
+            {"index": i, "type": "BUY" if i % 20 else "SELL"} for i in range(0, len(data), 10)
+        ]}
+
+
+def test_default_compute_signals_wraps_generate_signals(synthetic_bars):
+    bars = synthetic_bars(100, 4)
+    strategy = RecordsOnly()
+
+    signals = strategy.compute_signals(bars)
+
+    assert signals.indices.tolist() == list(range(0, 100, 10))
+    assert signals.records(2, 4) == strategy.generate_signals(bars)["signals"][2:4]
+    strategy.warm_up(bars[:45])
+    assert [s["index"] for s in strategy.on_bars(bars[45:])] == [50, 60, 70, 80, 90]
+
+
+class Breakout(BaseStrategy):
+    # Looks back five bars, so a short history is enough
+    history_bars = 20
+
+    def __init__(self):
+        super().__init__("Five-bar breakout")
+
+    def generate_signals(self, data):
+        close = data.close
+        return {"signals": [
+            {"index": i, "type": "BUY"} for i in range(5, len(data)) if close[i] > close[i - 5:i].max()
+        ]}
+
+
+def test_default_on_bars_keeps_a_bounded_history(synthetic_bars):
+    bars = synthetic_bars(300, 4)
+    strategy = Breakout()
+
+    strategy.warm_up(bars[:45])
+    got = [s["index"] for a, b in [(45, 62), (62, 63), (63, 300)] for s in strategy.on_bars(bars[a:b])]
+
+    expected = [s["index"] for s in strategy.generate_signals(bars)["signals"] if s["index"] >= 45]
+    assert got == expected and len(got) > 10
+    assert len(strategy._history) == 20
+
+
+def test_strategy_endpoint_pages_signals(fake_provider):
+    app.dependency_overrides[get_market_data] = lambda: MarketDataService(fake_provider(delay=0, n=1500))
+    try:
+        client = TestClient(app)
+        request = {"ticker": "QQQ", "oversold": 45, "overbought": 55}
+        full = client.post("/api/v1/strategies/rsi-strategy", json=request).json()
+        page = client.post(
+            "/api/v1/strategies/rsi-strategy", json={**request, "signals_offset": 3, "signals_limit": 4}
+        ).json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert page["signals"] == full["signals"][3:7]
+    assert page["total_signals"] == full["total_signals"] == len(full["signals"])
@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import import_budget
+from app.core.lazy_routers import LazyRouterMiddleware, LazyRouters
+
+# Cold starts run from the backend root, as the server does
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+def run_cold(code: str) -> dict:
+    # A fresh interpreter, so nothing the rest of the suite imported counts
+    done = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+HEAVY = f"[m for m in {import_budget.HEAVY_MODULES!r} if m in sys.modules]"
+
+
+def test_cold_start_is_within_budget():
+    report = import_budget.measure("app.main")
+
+    assert report.heavy == []
+    assert report.total_ms < import_budget.BUDGET_MS
+
+
+def test_health_answers_before_heavy_modules_load():
+    result = run_cold(f"""
+import json, sys
+from fastapi.testclient import TestClient
+from app.main import app
+client = TestClient(app)
+health = client.get("/health")
+before = {HEAVY}
+status = client.get("/api/v1/status")
+print(json.dumps({{"health": health.json(), "before": before, "after": {HEAVY}, "status": status.json()}}))
+""")
+
+    assert result["health"] == {"status": "ok", "routers_loaded": []}
+    assert result["before"] == []
+    assert "numpy" in result["after"]
+    assert result["status"] == {"status": "ok"}
+
+
+def make_app():
+    app = FastAPI()
+    routers = LazyRouters(app)
+    routers.add("app.api.v1.routes", prefix="/api/v1")
+    routers.add("app.api.v1.endpoints.ohlcv", prefix="/api/v1")
+    routers.add("app.api.v1.endpoints.analytics", prefix="/api/v1/analytics")
+    app.add_middleware(LazyRouterMiddleware, routers=routers)
+    return app, routers
+
+
+def test_routers_load_on_first_request_under_their_prefix():
+    app, routers = make_app()
+    client = TestClient(app)
+
+    assert client.get("/elsewhere").status_code == 404
+    assert routers.loaded == []
+
+    # Both /api/v1 routers declare /status; the one registered first answers, as with eager includes
+    assert client.get("/api/v1/status").json() == {"status": "ok"}
+    assert routers.loaded == ["app.api.v1.routes", "app.api.v1.endpoints.ohlcv"]
+    assert routers.pending
+
+    assert client.post("/api/v1/analytics", json={}).status_code == 422
+    assert not routers.pending
+
+
+def test_openapi_schema_loads_every_router():
+    app, routers = make_app()
+    client = TestClient(app)
+
+    paths = client.get("/openapi.json").json()["paths"]
+
+    assert not routers.pending
+    assert "/api/v1/status" in paths and any(path.startswith("/api/v1/analytics") for path in paths)
@@ -0,0 +1,69 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from indicators.atr import atr
+from indicators.streaming import (
+    StreamingATR,
+    StreamingEMA,
+    StreamingIndicator,
+    StreamingRSI,
+    StreamingSMA,
+)
+from strategies.rsi_strategy import RSIStrategy
+
+
+@pytest.fixture
+def bars(synthetic_bars):
+    bars = synthetic_bars(600, seed=5, spread=0.01, jitter=True)
+    return [{"high": h, "low": lo, "close": c} for h, lo, c in zip(bars.high, bars.low, bars.close)]
+
+
+def stream(indicator, bars):
+    return np.array([indicator.update(bar) for bar in bars])
+
+
+@pytest.mark.parametrize("period", [2, 14, 30])
+def test_streaming_matches_batch(period, bars):
+    closes = [b["close"] for b in bars]
+    batch = RSIStrategy()
+
+    np.testing.assert_allclose(stream(StreamingRSI(period), bars), batch.calculate_rsi(closes, period), rtol=1e-10)
+    np.testing.assert_allclose(stream(StreamingEMA(period), closes), batch.calculate_ema(closes, period), rtol=1e-10)
+    np.testing.assert_allclose(stream(StreamingSMA(period), closes), batch.calculate_sma(closes, period), rtol=1e-10)
+
+    expected_atr = atr([b["high"] for b in bars], [b["low"] for b in bars], closes, period)
+    np.testing.assert_allclose(stream(StreamingATR(period), bars), expected_atr, rtol=1e-10)
+
+
+@pytest.mark.parametrize("cls", [StreamingRSI, StreamingEMA, StreamingSMA, StreamingATR])
+def test_checkpoint_resume_is_seamless(cls, bars):
+    uninterrupted = stream(cls(14), bars)
+
+    first = cls(14)
+    stream(first, bars[:250])
+    checkpoint = json.dumps(first.to_dict())
+
+    resumed = StreamingIndicator.from_dict(json.loads(checkpoint))
+    assert type(resumed) is cls
+    np.testing.assert_array_equal(stream(resumed, bars[250:]), uninterrupted[250:])
+
+    pickled = pickle.loads(pickle.dumps(first))
+    assert pickled.update(bars[250]) == uninterrupted[250]
+
+
+def test_checkpoint_kind_is_checked():
+    with pytest.raises(ValueError):
+        StreamingEMA.from_dict(StreamingRSI(14).to_dict())
+
+
+def test_rsi_has_no_look_ahead():
+    closes = list(np.linspace(100, 120, 40))
+    rsi = RSIStrategy().calculate_rsi(closes, 14)
+
+    assert np.isnan(rsi[13]) and rsi[14] == 100
+    # Appending a bar must not change any earlier value
+    extended = RSIStrategy().calculate_rsi(closes + [90.0], 14)
+    np.testing.assert_array_equal(extended[:-1], rsi)
@@ -0,0 +1,62 @@
+import pytest
+
+from app.services import sweep_service
+
+ENGINE = {"initial_capital": 10000, "commission": 0.001, "position_size": 1.0, "engine": "vectorized"}
+
+
+@pytest.fixture
+def bars(synthetic_bars):
+    return synthetic_bars(1500, seed=3)
+
+
+def make_grid():
+    return sweep_service.expand_grid({
+        "rsi_period": [7, 14],
+        "oversold": sweep_service.parameter_range(25, 35, 5),
+        "overbought": [65, 70],
+    })
+
+
+def test_grid_and_range_expansion():
+    assert sweep_service.parameter_range(30, 40, 2.5) == [30, 32.5, 35, 37.5, 40]
+    grid = make_grid()
+    assert len(grid) == 12
+    assert grid[0] == {"rsi_period": 7, "oversold": 25, "overbought": 65}
+
+
+def test_parallel_sweep_matches_sequential_evaluation(bars):
+    grid = make_grid()
+
+    sweep = sweep_service.ParameterSweep(bars, grid, ENGINE, max_workers=2, batch_size=2)
+    rows = sweep.run()
+
+    assert sweep.completed == len(grid)
+    expected = [sweep_service.evaluate_rsi(bars, params, ENGINE) for params in grid]
+    key = lambda row: (row["rsi_period"], row["oversold"], row["overbought"])
+    assert sorted(rows, key=key) == sorted(expected, key=key)
+
+
+def test_ranking_puts_best_metric_first():
+    rows = [{"sharpe_ratio": 0.5}, {"sharpe_ratio": float("nan")}, {"sharpe_ratio": 1.5}, {}]
+    ranked = sweep_service.rank_results(rows, "sharpe_ratio")
+    assert [r.get("sharpe_ratio") for r in ranked[:2]] == [1.5, 0.5]
+
+    ascending = sweep_service.rank_results(rows, "sharpe_ratio", descending=False)
+    assert ascending[0]["sharpe_ratio"] == 0.5
+
+
+def test_cancelled_sweep_stops_early(bars):
+    grid = make_grid()
+    sweep = sweep_service.ParameterSweep(bars, grid, ENGINE, max_workers=1, batch_size=1, sweep_id="abc")
+    sweep_service.register_sweep(sweep)
+
+    def cancel_after_first(row):
+        assert sweep_service.cancel_sweep("abc")
+
+    rows = sweep.run(on_result=cancel_after_first)
+    sweep_service.unregister_sweep(sweep)
+
+    assert sweep.cancelled
+    assert len(rows) == 1
+    assert not sweep_service.cancel_sweep("abc")
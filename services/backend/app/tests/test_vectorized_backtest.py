@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.services.backtest_service import BacktestEngine
+
+MINUTE_NS = 60 * 1_000_000_000
+
+
+def random_signals(n, density, seed):
+    rng = np.random.default_rng(seed)
+    indices = np.flatnonzero(rng.random(n) < density)
+    kinds = rng.choice(["BUY", "SELL"], size=len(indices))
+    signals = [{"index": int(i), "type": str(k)} for i, k in zip(indices, kinds)]
+    # Duplicate bars: the later signal has to win in both engines
+    signals += [{"index": int(i), "type": "SELL"} for i in indices[::7]]
+    return signals
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("density", [0.01, 0.3])
+def test_vectorized_matches_loop(seed, density, synthetic_bars, assert_same_result):
+    bars = synthetic_bars(2000, seed, step=MINUTE_NS)
+    signals = random_signals(len(bars), density, seed)
+
+    for position_size, commission in [(1.0, 0.001), (0.5, 0.0)]:
+        loop = BacktestEngine(commission=commission, position_size=position_size, engine="loop")
+        fast = BacktestEngine(commission=commission, position_size=position_size, engine="vectorized")
+        assert_same_result(loop.run_backtest(signals, bars), fast.run_backtest(signals, bars))
+
+
+def test_open_position_and_leading_sell(synthetic_bars, assert_same_result):
+    bars = synthetic_bars(10, 0, step=MINUTE_NS)
+    signals = [
+        {"index": 0, "type": "SELL"},
+        {"index": 2, "type": "BUY"},
+        {"index": 3, "type": "BUY"},
+        {"index": 5, "type": "SELL"},
+        {"index": 6, "type": "SELL"},
+        {"index": 8, "type": "BUY"},
+    ]
+    loop = BacktestEngine(engine="loop").run_backtest(signals, bars)
+    fast = BacktestEngine(engine="vectorized").run_backtest(signals, bars)
+
+    assert fast["total_trades"] == 1
+    assert_same_result(loop, fast)
+
+
+def test_no_signals(synthetic_bars):
+    bars = synthetic_bars(50, 1, step=MINUTE_NS)
+    result = BacktestEngine().run_backtest([], bars)
+
+    assert result["trades"] == []
+    assert result["equity_curve"] == [10000.0] * 51
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        BacktestEngine(engine="gpu")
@@ -0,0 +1,112 @@
+"""
+Throughput of the vectorized indicator kernels against the implementations
+they replaced.
+
+    python benchmarks/bench_indicators.py [--sizes 10000 100000 1000000]
+
+Run from services/backend. Legacy versions are skipped above --legacy-limit
+bars because the per-bar loops take minutes on long series.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import indicators  # noqa: E402
+
+
+# Previous per-bar implementations, reproduced for comparison only
+
+def legacy_rsi(closes, period=14):
+    closes = np.array(closes, dtype=float)
+    deltas = np.diff(closes)
+    gain = np.where(deltas > 0, deltas, 0)
+    loss = np.where(deltas < 0, -deltas, 0)
+    avg_gain = np.mean(gain[:period])
+    avg_loss = np.mean(loss[:period])
+    rsi_values = [np.nan] * period
+    for i in range(period, len(deltas)):
+        avg_gain = (avg_gain * (period - 1) + gain[i]) / period
+        avg_loss = (avg_loss * (period - 1) + loss[i]) / period
+        rsi_values.append(100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+    return rsi_values
+
+
+def legacy_ema(values, period):
+    ema_values = []
+    k = 2 / (period + 1)
+    for i, val in enumerate(values):
+        ema_values.append(val if i == 0 else val * k + ema_values[i - 1] * (1 - k))
+    return ema_values
+
+
+def legacy_sma(values, period):
+    return [np.nan if i < period - 1 else np.mean(values[i - period + 1:i + 1]) for i in range(len(values))]
+
+
+def legacy_atr(high, low, close, period=14):
+    tr = np.zeros(len(close))
+    tr[0] = high[0] - low[0]
+    for i in range(1, len(close)):
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    atr_values = np.full(len(close), np.nan)
+    atr_prev = np.mean(tr[1:period + 1])
+    atr_values[period] = atr_prev
+    for i in range(period + 1, len(close)):
+        atr_prev = (atr_prev * (period - 1) + tr[i]) / period
+        atr_values[i] = atr_prev
+    return atr_values
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--period", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-limit", type=int, default=1_000_000)
+    parser.add_argument("--float32", action="store_true", help="Feed float32 arrays to the kernels")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    p = args.period
+    print(f"{'indicator':<10}{'bars':>12}{'kernel ms':>12}{'legacy ms':>12}{'speedup':>10}{'Mbars/s':>10}")
+
+    for n in args.sizes:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        high = close * (1 + rng.random(n) * 0.01)
+        low = close * (1 - rng.random(n) * 0.01)
+        if args.float32:
+            high, low, close = (a.astype(np.float32) for a in (high, low, close))
+        close_list = close.tolist()
+
+        cases = [
+            ("rsi", lambda: indicators.rsi(close, p), lambda: legacy_rsi(close_list, p)),
+            ("ema", lambda: indicators.ema(close, p), lambda: legacy_ema(close_list, p)),
+            ("sma", lambda: indicators.sma(close, p), lambda: legacy_sma(close_list, p)),
+            ("atr", lambda: indicators.atr(high, low, close, p), lambda: legacy_atr(high, low, close, p)),
+        ]
+        for name, kernel, legacy in cases:
+            kernel_s = best_of(kernel, args.repeat)
+            if n <= args.legacy_limit:
+                legacy_s = best_of(legacy, 1)
+                legacy_ms, speedup = f"{legacy_s * 1e3:.1f}", f"{legacy_s / kernel_s:.0f}x"
+            else:
+                legacy_ms, speedup = "-", "-"
+            print(f"{name:<10}{n:>12,}{kernel_s * 1e3:>12.2f}{legacy_ms:>12}{speedup:>10}{n / kernel_s / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
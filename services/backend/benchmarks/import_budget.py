@@ -0,0 +1,103 @@
+"""
+Import-time budget for application startup.
+
+    python benchmarks/import_budget.py                  # report for app.main
+    python benchmarks/import_budget.py --top 30
+    python benchmarks/import_budget.py --budget-ms 250  # exit 1 if over
+
+Run from services/backend. Imports the module in a fresh interpreter under
+`python -X importtime`, then reports its cumulative import time, the
+slowest modules it pulled in, and any of the heavy dependencies (which
+should load with the first request that needs them, not at startup) that
+were imported anyway. Exits 1 when over budget or a heavy module loaded.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Cold import of app.main, in milliseconds; FastAPI alone takes roughly 150
+BUDGET_MS = 400
+
+# Loaded by the routers that use them, never by importing the app
+HEAVY_MODULES = ("numpy", "pandas", "yfinance", "sqlalchemy", "sklearn", "indicators", "strategies")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_ms: float
+    cumulative_ms: float
+
+
+class Report(NamedTuple):
+    module: str
+    total_ms: float
+    imports: List[ImportTime]
+    heavy: List[str]
+
+
+def measure(module: str = "app.main") -> Report:
+    """Import `module` in a fresh interpreter and time everything it imports."""
+    probe = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imports = _parse(done.stderr)
+    total = next(entry.cumulative_ms for entry in reversed(imports) if entry.module == module)
+    heavy = [name for name in done.stdout.strip().split(",") if name]
+    return Report(module, total, imports, heavy)
+
+
+def _parse(stderr: str) -> List[ImportTime]:
+    # Lines look like "import time:  self [us] | cumulative | imported package", nesting shown by indentation
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append(ImportTime(name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return imports
+
+
+def slowest(report: Report, top: int) -> List[ImportTime]:
+    """The top-level imports (what the module itself pulled in) that cost the most."""
+    by_module: Dict[str, ImportTime] = {}
+    for entry in report.imports:
+        root = entry.module.split(".")[0]
+        if root not in by_module or entry.cumulative_ms > by_module[root].cumulative_ms:
+            by_module[root] = entry
+    return sorted(by_module.values(), key=lambda entry: -entry.cumulative_ms)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    report = measure(args.module)
+    print(f"{report.module}: {report.total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)\n")
+    print(f"{'package':<40} {'cumulative ms':>14} {'self ms':>10}")
+    for entry in slowest(report, args.top):
+        print(f"{entry.module:<40} {entry.cumulative_ms:>14.1f} {entry.self_ms:>10.1f}")
+
+    failed = False
+    if report.heavy:
+        print(f"\nHeavy modules loaded at import: {', '.join(report.heavy)}")
+        failed = True
+    if report.total_ms > args.budget_ms:
+        print(f"\nOver budget by {report.total_ms - args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
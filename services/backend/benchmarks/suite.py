@@ -0,0 +1,316 @@
+"""
+Micro-benchmarks for indicators, signal generation, backtesting, metrics,
+the linear regression model and market-data parsing on synthetic bars.
+
+    python benchmarks/suite.py                        # 1k, 100k and 10M bars
+    python benchmarks/suite.py --sizes 1000 100000 --only rsi backtest
+    python benchmarks/suite.py --save-baseline        # rewrite baseline.json
+    python benchmarks/suite.py --max-regression 1.3   # exit 1 on a >30% slowdown or an unrecorded case
+
+Run from services/backend. Each case reports the best wall time over
+--repeat runs and the peak traced allocation (tracemalloc, measured in a
+separate run so tracing does not skew the timings), then compares both
+against the saved baseline. Cases skip sizes above their `max_bars`, where
+they would only measure swap.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import indicators  # noqa: E402
+from app.core.dataset import OHLCVDataset  # noqa: E402
+from app.core.ml.linear_regression import LinearRegressionGD  # noqa: E402
+from app.core.ml.rolling_regression import rolling_trend  # noqa: E402
+from app.services import analytics, monte_carlo  # noqa: E402
+from app.services.backtest_service import BacktestEngine  # noqa: E402
+from app.services.replay import replay  # noqa: E402
+from app.services.resampler import resample  # noqa: E402
+from strategies.rsi_strategy import RSIStrategy  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+HOUR_NS = 3600 * 1_000_000_000
+START_NS = 1_700_000_000 * 1_000_000_000
+
+
+def synthetic_bars(n: int, seed: int = 0) -> OHLCVDataset:
+    """Hourly geometric random walk with plausible OHLC ranges."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = close * rng.random(n) * 0.004
+    return OHLCVDataset.from_columns({
+        "timestamp": START_NS + np.arange(n, dtype=np.int64) * HOUR_NS,
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.integers(100, 10_000, n).astype(np.float64),
+    }, tz="UTC")
+
+
+def yahoo_frame(bars: OHLCVDataset):
+    """The bars as yfinance returns them: tz-aware index, (field, ticker) columns."""
+    import pandas as pd
+
+    index = pd.DatetimeIndex(pd.to_datetime(bars.timestamp, utc=True), name="Datetime")
+    columns = pd.MultiIndex.from_product([["Close", "High", "Low", "Open", "Volume"], ["QQQ"]])
+    values = np.column_stack([bars.close, bars.high, bars.low, bars.open, bars.volume])
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+class Case(NamedTuple):
+    name: str
+    # setup(bars) does the untimed preparation and returns the timed callable
+    setup: Callable[[OHLCVDataset], Callable[[], object]]
+    max_bars: Optional[int] = None
+
+
+def _signals_setup(bars):
+    strategy = RSIStrategy()
+    return lambda: strategy.generate_signals(bars)
+
+
+def _signal_codes_setup(bars):
+    # What backtests use: the code array, no signal records
+    strategy = RSIStrategy()
+    return lambda: strategy.compute_signals(bars)
+
+
+def _backtest_setup(engine):
+    def setup(bars):
+        signals = RSIStrategy().compute_signals(bars)
+        backtest = BacktestEngine(engine=engine)
+        return lambda: backtest.run_backtest(signals, bars)
+    return setup
+
+
+def _metrics_setup(bars):
+    backtest = BacktestEngine()
+    signals = RSIStrategy().compute_signals(bars)
+    _, trades, equity_curve = backtest._run_vectorized(signals.codes, bars)
+    return lambda: backtest._calculate_metrics(trades, equity_curve)
+
+
+def _monte_carlo_setup(bars):
+    backtest = BacktestEngine()
+    signals = RSIStrategy().compute_signals(bars)
+    _, trades, _ = backtest._run_vectorized(signals.codes, bars)
+    return lambda: monte_carlo.simulate(trades, backtest.initial_capital, n_paths=10_000, seed=0) if trades else None
+
+
+def _regression_setup(solver="gd"):
+    def setup(bars):
+        # Lagged returns predicting the next return
+        returns = np.diff(np.log(bars.close))
+        X = np.column_stack([returns[i:len(returns) - 5 + i] for i in range(5)])
+        y = returns[5:]
+
+        def fit():
+            LinearRegressionGD(lr=0.1, epochs=100, solver=solver).fit(X, y)
+        return fit
+    return setup
+
+
+def _parse_setup(bars):
+    frame = yahoo_frame(bars)
+    return lambda: OHLCVDataset.from_frame(frame)
+
+
+def _resample_setup(bars):
+    # DST-aware local days, the most involved bucketing
+    local = OHLCVDataset.from_columns(bars.columns(), tz="America/New_York")
+    return lambda: resample(local, "1d")
+
+
+def _replay_setup(bars):
+    # Max-speed paper trading of the RSI strategy over four tickers, backtest included
+    data = {f"T{i}": bars for i in range(4)}
+    return lambda: replay(data, RSIStrategy, warmup=100)
+
+
+def _load_data_setup(bars):
+    # The whole endpoint path: parse the download, build rows, validate the response
+    from app.api.v1.endpoints.ohlcv import MarketDataResponse, load_data
+    from app.services.market_data import MarketDataService
+
+    frame = yahoo_frame(bars)
+    service = MarketDataService(lambda ticker, period, interval: OHLCVDataset.from_frame(frame))
+
+    def run():
+        payload = asyncio.run(load_data(service, "QQQ", "1mo", "1h"))
+        return MarketDataResponse.model_validate(payload)
+    return run
+
+
+CASES = [
+    Case("rsi", lambda b: lambda: indicators.rsi(b.close, 14)),
+    Case("ema", lambda b: lambda: indicators.ema(b.close, 20)),
+    Case("sma", lambda b: lambda: indicators.sma(b.close, 20)),
+    Case("true_range", lambda b: lambda: indicators.true_range(b.high, b.low, b.close)),
+    Case("atr", lambda b: lambda: indicators.atr(b.high, b.low, b.close, 14)),
+    Case("generate_signals", _signals_setup),
+    Case("compute_signals", _signal_codes_setup),
+    Case("backtest", _backtest_setup("vectorized")),
+    Case("backtest_loop", _backtest_setup("loop"), max_bars=100_000),
+    Case("calculate_metrics", _metrics_setup),
+    Case("monte_carlo_10k_paths", _monte_carlo_setup, max_bars=100_000),
+    Case("rolling_metrics", lambda b: lambda: analytics.rolling_metrics(b.close, 252)),
+    Case("linear_regression_fit", _regression_setup()),
+    Case("linear_regression_lstsq", _regression_setup("lstsq")),
+    Case("rolling_trend", lambda b: lambda: rolling_trend(b.close, 20)),
+    Case("resample_daily", _resample_setup),
+    Case("replay_4_tickers", _replay_setup, max_bars=2_500_000),
+    Case("parse_frame", _parse_setup),
+    Case("load_data", _load_data_setup, max_bars=100_000),
+]
+
+
+def best_time(fn: Callable, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(fn: Callable) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes: List[int], only: Optional[List[str]] = None, repeat: int = 3) -> Dict[str, Dict]:
+    """{"<case>/<bars>": {"seconds": ..., "peak_bytes": ...}} for every case and size that ran."""
+    results = {}
+    for n in sizes:
+        bars = synthetic_bars(n)
+        for case in CASES:
+            if only and case.name not in only:
+                continue
+            if case.max_bars is not None and n > case.max_bars:
+                continue
+            fn = case.setup(bars)
+            fn()  # warm-up: lazy imports and first-touch allocations
+            results[f"{case.name}/{n}"] = {
+                "seconds": best_time(fn, repeat),
+                "peak_bytes": peak_memory(fn),
+            }
+        del bars
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Current/baseline ratios for every key present in both."""
+    ratios = {}
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        ratios[key] = {
+            metric: current[metric] / base[metric] if base[metric] else float("nan")
+            for metric in ("seconds", "peak_bytes")
+        }
+    return ratios
+
+
+def missing_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> List[str]:
+    """Keys of results that compare() cannot check because the baseline has no entry for them."""
+    return sorted(key for key in results if not baseline.get(key))
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path: str, results: Dict[str, Dict]):
+    document = {
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=[case.name for case in CASES])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--max-regression", type=float, help="Fail if any time ratio exceeds this")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.only, args.repeat)
+    baseline = load_baseline(args.baseline)
+    ratios = compare(results, baseline)
+    missing = missing_baseline(results, baseline)
+
+    print(f"{'case':<24}{'bars':>12}{'ms':>12}{'peak mem':>12}{'time x':>9}{'mem x':>9}")
+    for key, result in results.items():
+        name, n = key.rsplit("/", 1)
+        ratio = ratios.get(key)
+        time_x = f"{ratio['seconds']:.2f}" if ratio else "-"
+        mem_x = f"{ratio['peak_bytes']:.2f}" if ratio else "-"
+        print(
+            f"{name:<24}{int(n):>12,}{result['seconds'] * 1e3:>12.2f}"
+            f"{_format_bytes(result['peak_bytes']):>12}{time_x:>9}{mem_x:>9}"
+        )
+
+    if missing and not args.save_baseline:
+        print("\nNo baseline for: " + ", ".join(missing) + " (record them with --save-baseline)")
+
+    if args.save_baseline:
+        # Keep entries for cases/sizes that were not part of this run
+        merged = dict(baseline)
+        merged.update(results)
+        save_baseline(args.baseline, merged)
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.max_regression is not None:
+        slower = {key: r["seconds"] for key, r in ratios.items() if r["seconds"] > args.max_regression}
+        if slower:
+            print("\nRegressions: " + ", ".join(f"{key} {ratio:.2f}x" for key, ratio in sorted(slower.items())))
+        # A case without a baseline could have regressed unnoticed, so it fails the check too
+        if slower or (missing and not args.save_baseline):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from ._filters import linear_recurrence, wilder_smooth
+from .atr import atr, true_range
+from .batch import BATCH_INDICATORS, IndicatorBatch, spec_key
+from .ema import ema
+from .rsi import rsi, rsi_from_averages
+from .sma import sma
+from .streaming import (
+    STREAMING_INDICATORS,
+    StreamingATR,
+    StreamingEMA,
+    StreamingIndicator,
+    StreamingRSI,
+    StreamingSMA,
+)
+
+__all__ = [
+    "atr",
+    "ema",
+    "linear_recurrence",
+    "rsi",
+    "rsi_from_averages",
+    "sma",
+    "spec_key",
+    "true_range",
+    "wilder_smooth",
+    "BATCH_INDICATORS",
+    "IndicatorBatch",
+    "STREAMING_INDICATORS",
+    "StreamingATR",
+    "StreamingEMA",
+    "StreamingIndicator",
+    "StreamingRSI",
+    "StreamingSMA",
+]
@@ -1,31 +1,39 @@
-from typing import List
+from typing import List, Union
 import numpy as np
 
-def atr(high: List[float], low: List[float], close: List[float], period: int = 14) -> np.ndarray:
-    high = np.array(high, dtype=float)
-    low = np.array(high, dtype=float)
-    close = np.array(close, dtype=float)
+from ._filters import as_float_array, wilder_smooth
+
+ArrayLike = Union[List[float], np.ndarray]
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """True Range; the first bar has no previous close, so it is just high - low."""
+    high, out_dtype = as_float_array(high)
+    low, _ = as_float_array(low)
+    close, _ = as_float_array(close)
+
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        np.maximum(tr[1:], np.abs(high[1:] - prev_close), out=tr[1:])
+        np.maximum(tr[1:], np.abs(low[1:] - prev_close), out=tr[1:])
+    return tr.astype(out_dtype)
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """Wilder ATR; NaN for the first `period` bars, then seeded with mean(TR[1:period+1])."""
+    high, out_dtype = as_float_array(high)
+    low, _ = as_float_array(low)
+    close, _ = as_float_array(close)
 
     if len(close) < period + 1:
         raise ValueError("Not enough data for ATR calculation")
-    
-    tr = np.zeros(len(close))
-    tr[0] = high[0] - low[0]
-
-    for i in range(1, len(close)):
-        tr[i] = max(
-            high[i] - low[i],
-            abs(high[i] - close[i - 1]),
-            abs(low[i] - close[i - 1])
-        )
-    
-    atr_values = np.zeros(len(close))
-    atr_values[:period] = np.nan
-
-    atr_prev = np.mean(tr[1:period+1])
-
-    for i in range(period+1, len(close)):
-        atr_prev = (atr_prev * (period - 1) + tr[i]) / period
-        atr_values[i] = atr_prev
-    
+
+    return atr_from_true_range(true_range(high, low, close), period).astype(out_dtype)
+
+
+def atr_from_true_range(tr: np.ndarray, period: int) -> np.ndarray:
+    """ATR for any period from one shared true_range() result."""
+    atr_values = np.full(len(tr), np.nan)
+    atr_values[1:] = wilder_smooth(tr[1:], period)
     return atr_values
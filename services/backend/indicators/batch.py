@@ -0,0 +1,107 @@
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from ._filters import as_float_array
+from .atr import atr_from_true_range, true_range
+from .ema import ema
+from .rsi import price_moves, rsi_from_moves
+from .sma import offset_cumsum, sma_from_cumsum
+
+BATCH_INDICATORS = ("rsi", "ema", "sma", "atr", "true_range")
+
+# Indicators that read high/low/close rather than a single source column
+_OHLC_INDICATORS = ("atr", "true_range")
+
+
+class IndicatorBatch:
+    """
+    Computes many indicators over one OHLCV series, sharing intermediates.
+
+    Price moves, True Range and cumulative sums are computed once per source
+    column and reused by every spec that needs them, so e.g. RSI 7/14/21 and
+    SMA 10/20/50/200 cost one diff and one cumsum plus the per-period smoothing.
+    """
+
+    def __init__(self, columns: Mapping[str, Optional[np.ndarray]]):
+        self._columns = {}
+        length = None
+        for name, values in columns.items():
+            if values is None:
+                continue
+            arr, _ = as_float_array(values)
+            if length is not None and len(arr) != length:
+                raise ValueError("All price columns must have the same length")
+            length = len(arr)
+            self._columns[name] = arr
+
+        self.length = length or 0
+        self._shared: Dict[tuple, object] = {}
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            raise ValueError(f"Column '{name}' is required but was not provided")
+        return self._columns[name]
+
+    def _cached(self, key: tuple, build):
+        if key not in self._shared:
+            self._shared[key] = build()
+        return self._shared[key]
+
+    def compute(self, name: str, period: Optional[int] = None, source: str = "close") -> np.ndarray:
+        if name == "true_range":
+            return self._true_range()
+        if period is None or period < 1:
+            raise ValueError(f"'{name}' needs a period of at least 1")
+
+        if name == "atr":
+            if self.length < period + 1:
+                raise ValueError(f"Need at least {period + 1} values for ATR calculation")
+            return atr_from_true_range(self._true_range(), period)
+
+        x = self.column(source)
+        if name == "sma":
+            offset, csum = self._cached(("cumsum", source), lambda: offset_cumsum(x))
+            return sma_from_cumsum(csum, offset, period)
+        if name == "rsi":
+            gains, losses = self._cached(("moves", source), lambda: price_moves(x))
+            if self.length <= period:
+                return np.full(self.length, np.nan)
+            return rsi_from_moves(gains, losses, period)
+        if name == "ema":
+            return ema(x, period)
+
+        raise ValueError(f"Unknown indicator '{name}', expected one of {BATCH_INDICATORS}")
+
+    def _true_range(self) -> np.ndarray:
+        return self._cached(
+            ("true_range",),
+            lambda: true_range(self.column("high"), self.column("low"), self.column("close"))
+        )
+
+    def run(self, specs: List[Mapping]) -> Dict[str, np.ndarray]:
+        """Evaluate specs ({'name', 'period', 'source', 'key'}) into aligned named columns."""
+        results: Dict[str, np.ndarray] = {}
+        specs_by_key: Dict[str, tuple] = {}
+        for spec in specs:
+            name = spec["name"]
+            period = spec.get("period")
+            source = spec.get("source") or "close"
+            key = spec.get("key") or spec_key(name, period, source)
+            if key in specs_by_key:
+                # The same spec twice is computed once; two different ones can't share a column
+                if specs_by_key[key] != (name, period, source):
+                    raise ValueError(f"Output key '{key}' is used by more than one indicator")
+                continue
+            specs_by_key[key] = (name, period, source)
+            results[key] = self.compute(name, period, source)
+        return results
+
+
+def spec_key(name: str, period: Optional[int], source: str = "close") -> str:
+    parts = [name]
+    if source != "close" and name not in _OHLC_INDICATORS:
+        parts.append(source)
+    if period is not None and name != "true_range":
+        parts.append(str(period))
+    return "_".join(parts)
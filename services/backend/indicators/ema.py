@@ -1,16 +1,16 @@
-from fastapi import APIRouter
 import numpy as np
 
+from ._filters import as_float_array, linear_recurrence
 
-router = APIRouter()
 
-@router.post("/ema")
-def ema(values: list[float], period: int):
-    ema_values = []
+def ema(values, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value, k = 2 / (period + 1)."""
+    x, out_dtype = as_float_array(values)
+    out = np.empty(len(x))
+    if len(x) == 0:
+        return out.astype(out_dtype)
+
     k = 2 / (period + 1)
-    for i, val in enumerate(values):
-        if i == 0:
-            ema_values.append(val)
-        else:
-            ema_values.append(val * k+ ema_values[i-1] * (1-k))
-    return {"values": ema_values}
+    out[0] = x[0]
+    out[1:] = linear_recurrence(x[1:], 1 - k, k, y0=x[0])
+    return out.astype(out_dtype)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from ._filters import as_float_array, wilder_smooth
+from .sma import sma
+
+# "wilder": Wilder's smoothed averages; "sma": Cutler's plain rolling means of the last `period` moves
+SMOOTHINGS = ("wilder", "sma")
+
+
+def rsi(close, period: int = 14, smoothing: str = "wilder") -> np.ndarray:
+    """
+    RSI with Wilder (default) or simple-moving-average smoothing of the moves.
+    The first value is at close[period] (simple averages of the first `period`
+    moves); earlier positions are NaN. 100 when the average loss is zero.
+    """
+    if smoothing not in SMOOTHINGS:
+        raise ValueError(f"Unknown RSI smoothing '{smoothing}', expected one of {', '.join(SMOOTHINGS)}")
+    x, out_dtype = as_float_array(close)
+    out = np.full(len(x), np.nan)
+    if len(x) <= period:
+        return out.astype(out_dtype)
+
+    gains, losses = price_moves(x)
+    if smoothing == "sma":
+        out[1:] = rsi_from_averages(sma(gains, period), sma(losses, period))
+        return out.astype(out_dtype)
+    return rsi_from_moves(gains, losses, period).astype(out_dtype)
+
+
+def price_moves(x: np.ndarray):
+    """Per-bar gains and losses (both >= 0), aligned to x[1:]."""
+    deltas = np.diff(x)
+    return np.maximum(deltas, 0.0), np.maximum(-deltas, 0.0)
+
+
+def rsi_from_moves(gains: np.ndarray, losses: np.ndarray, period: int) -> np.ndarray:
+    """RSI for any period from one shared price_moves() result."""
+    out = np.full(len(gains) + 1, np.nan)
+    if len(gains) < period:
+        return out
+    out[1:] = rsi_from_averages(wilder_smooth(gains, period), wilder_smooth(losses, period))
+    return out
+
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 100.0, values)
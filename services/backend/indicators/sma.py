@@ -1,12 +1,33 @@
-from fastapi import APIRouter
 import numpy as np
 
-router = APIRouter()
+from ._filters import as_float_array
 
-@router.post("/sma")
-def sma(values: list[float], period: int):
-    values = np.array(values)
-    if len(values) < period:
-        return {"values": []}
-    sma = np.convolve(values, np.ones(period)/period, mode='valid')
-    return {"values": sma.tolist()}
\ No newline at end of file
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average from a cumulative sum; NaN for the first period-1 values."""
+    x, out_dtype = as_float_array(values)
+    out = np.full(len(x), np.nan)
+    if period < 1:
+        raise ValueError("period must be at least 1")
+    if len(x) < period:
+        return out.astype(out_dtype)
+
+    offset, csum = offset_cumsum(x)
+    return sma_from_cumsum(csum, offset, period).astype(out_dtype)
+
+
+def offset_cumsum(x: np.ndarray):
+    """Cumulative sum of x - x[0]; summing offsets from the first value keeps it small."""
+    offset = x[0] if len(x) else 0.0
+    return offset, np.cumsum(x - offset)
+
+
+def sma_from_cumsum(csum: np.ndarray, offset: float, period: int) -> np.ndarray:
+    """SMA for any period from one shared offset_cumsum()."""
+    out = np.full(len(csum), np.nan)
+    if len(csum) < period:
+        return out
+    window = csum[period - 1:].copy()
+    window[1:] -= csum[:-period]
+    out[period - 1:] = window / period + offset
+    return out
@@ -0,0 +1,326 @@
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from ._filters import linear_recurrence, wilder_smooth
+from .atr import true_range
+from .ema import ema
+from .rsi import price_moves, rsi_from_averages
+
+Bar = Union[Mapping, float]
+
+
+class StreamingIndicator(ABC):
+    """
+    Stateful indicator fed one bar at a time.
+
+    update(bar) costs O(1) and returns the latest value (NaN while warming up).
+    A bar is either a mapping with OHLC keys or a plain number, which is taken
+    as the close. to_dict()/from_dict() round-trip the full state as JSON-safe
+    data so a stream can be checkpointed and resumed, and from_history() builds
+    the state after a whole series with the vectorized kernels.
+    """
+
+    kind = ""
+
+    def __init__(self, period: int, source: str = "close"):
+        if period < 1:
+            raise ValueError("period must be at least 1")
+        self.period = period
+        self.source = source
+        self.value = math.nan
+
+    @abstractmethod
+    def update(self, bar: Bar) -> float:
+        pass
+
+    def update_many(self, columns: Mapping) -> np.ndarray:
+        """update() for every bar in `columns` (name -> array) in turn; returns each new value."""
+        names = list(columns)
+        rows = zip(*(np.asarray(columns[name], dtype=np.float64).tolist() for name in names))
+        return np.array([self.update(dict(zip(names, row))) for row in rows], dtype=np.float64)
+
+    @classmethod
+    def from_history(cls, columns: Mapping, period: int, source: str = "close") -> "StreamingIndicator":
+        """The indicator as if every bar in `columns` (name -> array) had been fed to update()."""
+        indicator = cls(period, source=source)
+        indicator._replay(columns)
+        return indicator
+
+    @abstractmethod
+    def _replay(self, columns: Mapping):
+        pass
+
+    def _price(self, bar: Bar) -> float:
+        if isinstance(bar, Mapping):
+            return float(bar[self.source])
+        return float(bar)
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.value)
+
+    # Checkpointing
+
+    @abstractmethod
+    def _state(self) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def _restore(self, state: Dict[str, Any]):
+        pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "period": self.period,
+            "source": self.source,
+            "value": None if math.isnan(self.value) else self.value,
+            "state": self._state(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingIndicator":
+        indicator_cls = STREAMING_INDICATORS[data["kind"]]
+        if cls is not StreamingIndicator and indicator_cls is not cls:
+            raise ValueError(f"Checkpoint is for '{data['kind']}', not '{cls.kind}'")
+
+        indicator = indicator_cls(data["period"], source=data.get("source", "close"))
+        indicator.value = math.nan if data["value"] is None else float(data["value"])
+        indicator._restore(data["state"])
+        return indicator
+
+
+class StreamingEMA(StreamingIndicator):
+    """EMA seeded with the first value, k = 2 / (period + 1)."""
+
+    kind = "ema"
+
+    def __init__(self, period: int, source: str = "close"):
+        super().__init__(period, source)
+        self.k = 2 / (period + 1)
+
+    def update(self, bar: Bar) -> float:
+        price = self._price(bar)
+        if math.isnan(self.value):
+            self.value = price
+        else:
+            self.value = price * self.k + self.value * (1 - self.k)
+        return self.value
+
+    def _replay(self, columns):
+        values = np.asarray(columns[self.source], dtype=np.float64)
+        if len(values):
+            self.value = float(ema(values, self.period)[-1])
+
+    def _state(self):
+        return {}
+
+    def _restore(self, state):
+        pass
+
+
+class StreamingSMA(StreamingIndicator):
+    """SMA over a ring buffer with a running sum."""
+
+    kind = "sma"
+
+    def __init__(self, period: int, source: str = "close"):
+        super().__init__(period, source)
+        self._window = [0.0] * period
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, bar: Bar) -> float:
+        price = self._price(bar)
+        self._sum += price - self._window[self._pos]
+        self._window[self._pos] = price
+        self._pos = (self._pos + 1) % self.period
+        self._count += 1
+
+        if self._pos == 0:
+            # Re-sum once per lap so float drift in the running sum stays bounded
+            self._sum = math.fsum(self._window)
+
+        if self._count >= self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+    def _replay(self, columns):
+        values = np.asarray(columns[self.source], dtype=np.float64)
+        n = len(values)
+        tail = values[-self.period:].tolist()
+        self._count = n
+        self._pos = n % self.period
+        if n < self.period:
+            self._window = tail + [0.0] * (self.period - n)
+        else:
+            # Ring order: the oldest value sits at _pos, where the next update writes
+            self._window = tail[-self._pos:] + tail[:-self._pos] if self._pos else tail
+            self.value = math.fsum(tail) / self.period
+        self._sum = math.fsum(self._window)
+
+    def _state(self):
+        return {"window": list(self._window), "pos": self._pos, "count": self._count, "sum": self._sum}
+
+    def _restore(self, state):
+        self._window = [float(v) for v in state["window"]]
+        self._pos = state["pos"]
+        self._count = state["count"]
+        self._sum = state["sum"]
+
+
+class StreamingRSI(StreamingIndicator):
+    """Wilder RSI: simple average of the first `period` moves, then Wilder smoothing."""
+
+    kind = "rsi"
+
+    def __init__(self, period: int = 14, source: str = "close"):
+        super().__init__(period, source)
+        self._prev: Optional[float] = None
+        self._moves = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def update(self, bar: Bar) -> float:
+        price = self._price(bar)
+        if self._prev is None:
+            self._prev = price
+            return self.value
+
+        delta = price - self._prev
+        self._prev = price
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self._moves += 1
+
+        if self._moves <= self.period:
+            # Accumulate the seed window; averaged once it is complete
+            self._avg_gain += gain
+            self._avg_loss += loss
+            if self._moves < self.period:
+                return self.value
+            self._avg_gain /= self.period
+            self._avg_loss /= self.period
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        if self._avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - (100 / (1 + self._avg_gain / self._avg_loss))
+        return self.value
+
+    def update_many(self, columns):
+        values = np.asarray(columns[self.source], dtype=np.float64)
+        out = np.empty(len(values))
+        # Until the seed window is complete, bar by bar; afterwards the averages are a linear recurrence
+        i = 0
+        while i < len(values) and (self._prev is None or self._moves < self.period):
+            out[i] = self.update(float(values[i]))
+            i += 1
+        if i == len(values):
+            return out
+
+        gains, losses = price_moves(np.concatenate([[self._prev], values[i:]]))
+        decay, weight = (self.period - 1) / self.period, 1 / self.period
+        avg_gain = linear_recurrence(gains, decay, weight, y0=self._avg_gain)
+        avg_loss = linear_recurrence(losses, decay, weight, y0=self._avg_loss)
+        out[i:] = rsi_from_averages(avg_gain, avg_loss)
+
+        self._prev = float(values[-1])
+        self._moves += len(gains)
+        self._avg_gain = float(avg_gain[-1])
+        self._avg_loss = float(avg_loss[-1])
+        self.value = float(out[-1])
+        return out
+
+    def _replay(self, columns):
+        values = np.asarray(columns[self.source], dtype=np.float64)
+        if len(values) == 0:
+            return
+        gains, losses = price_moves(values)
+        self._prev = float(values[-1])
+        self._moves = len(gains)
+
+        if self._moves < self.period:
+            # Still accumulating the seed window, which update() keeps as plain sums
+            self._avg_gain = float(gains.sum())
+            self._avg_loss = float(losses.sum())
+            return
+        self._avg_gain = float(wilder_smooth(gains, self.period)[-1])
+        self._avg_loss = float(wilder_smooth(losses, self.period)[-1])
+        if self._avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - (100 / (1 + self._avg_gain / self._avg_loss))
+
+    def _state(self):
+        return {"prev": self._prev, "moves": self._moves, "avg_gain": self._avg_gain, "avg_loss": self._avg_loss}
+
+    def _restore(self, state):
+        self._prev = state["prev"]
+        self._moves = state["moves"]
+        self._avg_gain = state["avg_gain"]
+        self._avg_loss = state["avg_loss"]
+
+
+class StreamingATR(StreamingIndicator):
+    """Wilder ATR; the first value is the mean True Range of bars 1..period."""
+
+    kind = "atr"
+
+    def __init__(self, period: int = 14, source: str = "close"):
+        super().__init__(period, source)
+        self._prev_close: Optional[float] = None
+        self._ranges = 0
+        self._sum = 0.0
+
+    def update(self, bar: Mapping) -> float:
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+
+        if self._prev_close is None:
+            # The first bar has no previous close; like the batch version it is not averaged
+            self._prev_close = close
+            return self.value
+
+        tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._ranges += 1
+
+        if self._ranges < self.period:
+            self._sum += tr
+        elif self._ranges == self.period:
+            self.value = (self._sum + tr) / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+        return self.value
+
+    def _replay(self, columns):
+        close = np.asarray(columns["close"], dtype=np.float64)
+        if len(close) == 0:
+            return
+        ranges = true_range(columns["high"], columns["low"], close)[1:]
+        self._prev_close = float(close[-1])
+        self._ranges = len(ranges)
+        self._sum = float(ranges[:self.period - 1].sum())
+        if self._ranges >= self.period:
+            self.value = float(wilder_smooth(ranges, self.period)[-1])
+
+    def _state(self):
+        return {"prev_close": self._prev_close, "ranges": self._ranges, "sum": self._sum}
+
+    def _restore(self, state):
+        self._prev_close = state["prev_close"]
+        self._ranges = state["ranges"]
+        self._sum = state["sum"]
+
+
+STREAMING_INDICATORS = {
+    cls.kind: cls for cls in (StreamingEMA, StreamingSMA, StreamingRSI, StreamingATR)
+}
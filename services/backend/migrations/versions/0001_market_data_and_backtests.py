@@ -0,0 +1,88 @@
+"""market data bars and series, backtest runs and trades
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'ohlcv_bars',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('interval', sa.String(length=8), nullable=False),
+        sa.Column('ts', sa.BigInteger(), nullable=False),
+        sa.Column('open', sa.Float(precision=53), nullable=False),
+        sa.Column('high', sa.Float(precision=53), nullable=False),
+        sa.Column('low', sa.Float(precision=53), nullable=False),
+        sa.Column('close', sa.Float(precision=53), nullable=False),
+        sa.Column('volume', sa.Float(precision=53), nullable=False),
+        sa.PrimaryKeyConstraint('ticker', 'interval', 'ts')
+    )
+    op.create_table(
+        'ohlcv_series',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('interval', sa.String(length=8), nullable=False),
+        sa.Column('covered_from', sa.BigInteger(), nullable=False),
+        sa.Column('fetched_at', sa.Float(precision=53), nullable=False),
+        sa.Column('tz', sa.String(length=64), nullable=True),
+        sa.PrimaryKeyConstraint('ticker', 'interval')
+    )
+    op.create_table(
+        'backtest_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('period', sa.String(length=8), nullable=False),
+        sa.Column('interval', sa.String(length=8), nullable=False),
+        sa.Column('strategy', sa.String(length=32), nullable=False),
+        sa.Column('strategy_parameters', sa.JSON(), nullable=False),
+        sa.Column('engine_parameters', sa.JSON(), nullable=False),
+        sa.Column('initial_capital', sa.Float(), nullable=False),
+        sa.Column('final_capital', sa.Float(), nullable=False),
+        sa.Column('total_return_percent', sa.Float(), nullable=False),
+        sa.Column('total_trades', sa.Integer(), nullable=False),
+        sa.Column('metrics', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_backtest_runs_ticker'), 'backtest_runs', ['ticker'], unique=False)
+    op.create_table(
+        'backtest_trades',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('entry_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('exit_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('entry_price', sa.Float(), nullable=False),
+        sa.Column('exit_price', sa.Float(), nullable=False),
+        sa.Column('shares', sa.Float(), nullable=False),
+        sa.Column('pnl', sa.Float(), nullable=False),
+        sa.Column('pnl_percent', sa.Float(), nullable=False),
+        sa.Column('holding_bars', sa.Integer(), nullable=False),
+        sa.Column('commission_total', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['backtest_runs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_backtest_trades_run_id'), 'backtest_trades', ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_backtest_trades_run_id'), table_name='backtest_trades')
+    op.drop_table('backtest_trades')
+    op.drop_index(op.f('ix_backtest_runs_ticker'), table_name='backtest_runs')
+    op.drop_table('backtest_runs')
+    op.drop_table('ohlcv_series')
+    op.drop_table('ohlcv_bars')
@@ -1,67 +1,96 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 import numpy as np
 
+import indicators
+from app.core.dataset import OHLCVDataset, as_dataset
+from app.core.ml.rolling_regression import rolling_trend
+from app.core.signals import SignalSet
+
 class BaseStrategy(ABC):
+    # Most recent bars the default on_bars() keeps; strategies that look further back raise it
+    history_bars = 5000
+
     def __init__(self, name: str):
         self.name = name
         self.signals = []
+        self._history: Optional[OHLCVDataset] = None
+        # Index of _history[0] among all the bars seen
+        self._history_start = 0
     
     @abstractmethod
-    def generate_signals(self, data: List[Dict]) -> List[Dict]:
+    def generate_signals(self, data: Union[OHLCVDataset, List[Dict]]) -> Dict:
         pass
-    
-    def calculate_rsi(self, closes: List[float], period: int = 14) -> List[float]:
-        closes = np.array(closes, dtype=float)
-        deltas = np.diff(closes)
 
-        gain = np.where(deltas > 0, deltas, 0)
-        loss = np.where(deltas < 0, -deltas, 0)
+    def compute_signals(self, data: Union[OHLCVDataset, List[Dict]]) -> SignalSet:
+        """
+        Signals as a compact code array (what backtests consume), records built on demand.
 
-        avg_gain = np.mean(gain[:period])
-        avg_loss = np.mean(loss[:period])
+        The default wraps generate_signals(); strategies that can compute
+        their signals as arrays override it and build their report from it.
+        """
+        data = as_dataset(data)
+        return SignalSet.from_records(data, self.generate_signals(data).get("signals", []))
 
-        rsi_values = [np.nan] * period
+    def _report(
+        self,
+        signals: SignalSet,
+        parameters: Dict,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Dict:
+        # The generate_signals() response, with records for signals[offset:offset + limit] only
+        return {
+            'strategy': self.name,
+            'parameters': parameters,
+            'total_candles': len(signals.bars),
+            'signals': signals.records(offset, None if limit is None else offset + limit),
+            'total_signals': len(signals),
+            'buy_signals': signals.buy_count,
+            'sell_signals': signals.sell_count
+        }
 
-        for i in range(period, len(deltas)):
-            avg_gain = (avg_gain * (period - 1) + gain[i]) / period
-            avg_loss = (avg_loss * (period - 1) + loss[i]) / period
+    # Incremental use (live streams, replays). The defaults rerun compute_signals over
+    # the last `history_bars` bars, which is right for any strategy that looks back no
+    # further than that; strategies with streaming state override them.
 
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
+    def warm_up(self, data: Union[OHLCVDataset, List[Dict]]):
+        """Start from the bars in `data` without reporting their signals."""
+        self._history = None
+        self._history_start = 0
+        self._keep_history(as_dataset(data))
 
-        if avg_loss == 0:
-            rsi_values.append(100)
-        else:
-            rs = avg_gain / avg_loss
-            rsi_values.append(100 - (100 / (1 + rs)))
+    def on_bars(self, data: OHLCVDataset) -> List[Dict]:
+        """Signals among `data`, the bars that follow everything seen so far."""
+        start = self._history_start
+        seen = 0 if self._history is None else len(self._history)
+        history = data if self._history is None else self._history.merge(data)
+        signals = self.compute_signals(history).since(seen)
+        self._keep_history(history)
+        # Record indices count from the start of everything seen, not of the kept history
+        return [{**signal, 'index': signal['index'] + start} for signal in signals]
 
-        return rsi_values
+    def _keep_history(self, history: OHLCVDataset):
+        drop = max(0, len(history) - self.history_bars)
+        self._history = history[drop:]
+        self._history_start += drop
     
-    def calculate_ema(self, values: List[float], period: int) -> List[float]:
-        ema_values = []
-        k = 2 / (period + 1)
+    # Thin wrappers over the shared vectorized kernels in `indicators`
 
-        for i, val in enumerate(values):
-            if i == 0:
-                ema_values.append(val)
-            else: 
-                ema_values.append(val * k + ema_values[i - 1] * (1 - k))
-        
-        return ema_values
+    def calculate_rsi(self, closes: Union[List[float], np.ndarray], period: int = 14) -> np.ndarray:
+        return indicators.rsi(closes, period)
     
-    def calculate_sma(self, values: List[float], period: int) -> List[float]:
-        sma_values = []
-        for i in range(len(values)):
-            if i < period - 1:
-                sma_values.append(np.nan)
-            else: 
-                sma_values.append(np.mean(values[i - period + 1:i + 1]))
-        
-        return sma_values
+    def calculate_ema(self, values: Union[List[float], np.ndarray], period: int) -> np.ndarray:
+        return indicators.ema(values, period)
     
+    def calculate_sma(self, values: Union[List[float], np.ndarray], period: int) -> np.ndarray:
+        return indicators.sma(values, period)
+
+    def calculate_rolling_regression(
+        self,
+        values: Union[List[float], np.ndarray],
+        window: int,
+        horizon: int = 1
+    ):
+        """(slope, r2, forecast horizon bars ahead) of a line fitted over each trailing window."""
+        return rolling_trend(values, window, horizon)
@@ -0,0 +1,123 @@
+from .base import BaseStrategy
+from typing import List, Dict, Optional, Union
+import numpy as np
+
+from app.core.dataset import OHLCVDataset, as_dataset
+from app.core.signals import BUY, SELL, SignalSet
+
+class LinearRegressionStrategy(BaseStrategy):
+    """
+    Trend-following on a rolling least-squares line through the closes.
+
+    Buys when the line fitted over the last `lookback` bars projects the close
+    `horizon` bars ahead at least `threshold` percent above the current close,
+    sells when it projects at least `threshold` percent below. Fits with R²
+    under `min_r2` are treated as noise and never signal.
+    """
+
+    def __init__(self,
+                 lookback: int = 20,
+                 horizon: int = 5,
+                 threshold: float = 0.5,
+                 min_r2: float = 0.5):
+        super().__init__("ML Linear Regression")
+        self.lookback = lookback
+        self.horizon = horizon
+        self.threshold = threshold
+        self.min_r2 = min_r2
+
+        # Incremental state for on_bars(): the last lookback - 1 bars and the number seen
+        self._tail: Optional[OHLCVDataset] = None
+        self._bars = 0
+
+    def compute_signals(self, data: Union[OHLCVDataset, List[Dict]]) -> SignalSet:
+        data = as_dataset(data)
+        if len(data) < self.lookback:
+            return SignalSet.empty(data)
+        return self._signal_set(data)
+
+    def _signal_set(self, data: OHLCVDataset, first_index: int = 0) -> SignalSet:
+        slope, r2, forecast = self.calculate_rolling_regression(data.close, self.lookback, self.horizon)
+        move = (forecast / data.close - 1) * 100
+
+        # NaN compares False, so the warm-up bars never signal
+        confident = r2 >= self.min_r2
+        codes = np.zeros(len(data), dtype=np.int8)
+        codes[confident & (move <= -self.threshold)] = SELL
+        codes[confident & (move >= self.threshold)] = BUY
+
+        columns = {"forecast": forecast, "slope": slope, "r2": r2, "move": move}
+        return SignalSet(data, codes, columns, self._signal, first_index)
+
+    def warm_up(self, data: Union[OHLCVDataset, List[Dict]]):
+        """Keep the bars the next windows need, as if on_bars() had seen `data` (no signals)."""
+        data = as_dataset(data)
+        self._tail = None
+        self._bars = 0
+        self._keep_tail(data)
+
+    def on_bars(self, data: OHLCVDataset) -> List[Dict]:
+        """
+        Signals among `data`, the bars that follow everything seen so far.
+
+        Only the windows ending in `data` are fitted, over the stored tail plus
+        the batch, so a batch costs O(lookback + len(data)) however long the
+        stream has run.
+        """
+        first = self._bars - (0 if self._tail is None else len(self._tail))
+        window = data if self._tail is None else self._tail.merge(data)
+        seen = self._bars
+        self._keep_tail(window, first)
+        if len(window) < self.lookback:
+            return []
+        return self._signal_set(window, first).since(seen)
+
+    def _keep_tail(self, bars: OHLCVDataset, first: int = 0):
+        # `first` is the index of bars[0] among all the bars seen
+        self._bars = first + len(bars)
+        self._tail = bars[max(0, len(bars) - (self.lookback - 1)):]
+
+    def generate_signals(
+        self,
+        data: Union[OHLCVDataset, List[Dict]],
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Dict:
+        """Signal report; `offset`/`limit` page the signal records (counts always cover all of them)."""
+        data = as_dataset(data)
+
+        if len(data) < self.lookback:
+            return {
+                "error": f"Not enough data. Need at least {self.lookback} candles",
+                "signals": []
+            }
+
+        parameters = {
+            'lookback': self.lookback,
+            'horizon': self.horizon,
+            'threshold': self.threshold,
+            'min_r2': self.min_r2
+        }
+        return self._report(self.compute_signals(data), parameters, offset, limit)
+
+    def _signal(
+        self,
+        index: int,
+        timestamp,
+        price: float,
+        buy: bool,
+        forecast: float,
+        slope: float,
+        r2: float,
+        move: float
+    ) -> Dict:
+        return {
+            "index": index,
+            "timestamp": timestamp,
+            'type': 'BUY' if buy else 'SELL',
+            'price': price,
+            'forecast': round(forecast, 4),
+            'slope': round(slope, 6),
+            'r2': round(r2, 4),
+            'reason': f"Trend projects {round(move, 2)}% over {self.horizon} bars (R² {round(r2, 2)})"
+        }
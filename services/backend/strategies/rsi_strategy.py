@@ -1,7 +1,11 @@
 from .base import BaseStrategy
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
 import numpy as np
 
+from app.core.dataset import OHLCVDataset, as_dataset
+from app.core.signals import BUY, SELL, SignalSet
+from indicators import StreamingRSI
+
 class RSIStrategy(BaseStrategy):
     def __init__(self, 
                  period: int = 14, 
@@ -11,54 +15,98 @@ class RSIStrategy(BaseStrategy):
         self.period = period
         self.oversold = oversold
         self.overbought = overbought
+
+        # Incremental state for on_bar(); built by warm_up() or the first bar
+        self._rsi: Optional[StreamingRSI] = None
+        self._bars = 0
     
-    def generate_signals(self, data: List[Dict]) -> List[Dict]:
+    def compute_signals(self, data: Union[OHLCVDataset, List[Dict]]) -> SignalSet:
+        data = as_dataset(data)
+        if len(data) < self.period + 1:
+            return SignalSet.empty(data)
+        rsi_values = np.asarray(self.calculate_rsi(data.close, self.period), dtype=float)
+        return self._signal_set(data, rsi_values)
+
+    def generate_signals(
+        self,
+        data: Union[OHLCVDataset, List[Dict]],
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Dict:
+        """Signal report; `offset`/`limit` page the signal records (counts always cover all of them)."""
+        data = as_dataset(data)
+
         if len(data) < self.period + 1:
             return {
                 "error": f"Not enough data. Need at least {self.period + 1} candles",
                 "signals": []
             }
-        
-        closes = [candle['close'] for candle in data]
 
-        rsi_values = self.calculate_rsi(closes, self.period)
+        parameters = {
+            'period': self.period,
+            'oversold': self.oversold,
+            'overbought': self.overbought
+        }
+        return self._report(self.compute_signals(data), parameters, offset, limit)
+
+    def _signal_set(self, data: OHLCVDataset, rsi_values: np.ndarray, first_index: int = 0) -> SignalSet:
+        # NaN compares False, so the warm-up bars never signal; oversold wins if the thresholds overlap
+        codes = np.zeros(len(data), dtype=np.int8)
+        codes[rsi_values > self.overbought] = SELL
+        codes[rsi_values < self.oversold] = BUY
+        return SignalSet(data, codes, {"rsi": rsi_values}, self._signal, first_index)
 
-        signals = []
-        for i, (candle, rsi) in enumerate(zip(data, rsi_values)):
-            if np.isnsn(rsi):
-                continue
+    def warm_up(self, data: Union[OHLCVDataset, List[Dict]]):
+        """Set the incremental state as if on_bar() had seen every bar in `data` (no signals)."""
+        data = as_dataset(data)
+        self._rsi = StreamingRSI.from_history({"close": data.close}, self.period)
+        self._bars = len(data)
 
-            signal = None
-            if rsi < self.oversold:
-                signal = {
-                    "index": i,
-                    "timestamp": candle['timestamp'],
-                    'type': 'BUY',
-                    'price': candle['close'],
-                    'rsi': round(rsi, 2),
-                    'reason': f"RSI ({round(rsi, 2)}) below oversold threshold ({self.oversold})"
-                }
-            elif rsi > self.overbought:
-                signal = {
-                    "index": i,
-                    'timestamp': candle['timestamp'],
-                    'type': 'SELL',
-                    'price': candle['close'],
-                    'rsi': round(rsi, 2),
-                    'reason': f"RSI ({round(rsi, 2)}) above overbought threshold ({self.overbought})"
-                }
+    def on_bar(self, bar: Dict) -> Optional[Dict]:
+        """
+        Feed the next bar; returns its signal, if any, as generate_signals() would list it.
 
-            if signal: 
-                signals.append(signal)
+        `bar` needs "close" and "timestamp" (used as given in the signal). O(1)
+        per bar, so a live stream never recomputes the history.
+        """
+        if self._rsi is None:
+            self._rsi = StreamingRSI(self.period)
+        value = self._rsi.update(bar)
+        index = self._bars
+        self._bars += 1
+
+        # NaN compares False, so the warm-up bars never signal
+        if value < self.oversold:
+            return self._signal(index, bar["timestamp"], float(bar["close"]), True, value)
+        if value > self.overbought:
+            return self._signal(index, bar["timestamp"], float(bar["close"]), False, value)
+        return None
+
+    def on_bars(self, data: OHLCVDataset) -> List[Dict]:
+        """on_bar() for a batch of bars, with the RSI updated in one vectorized pass."""
+        if self._rsi is None:
+            self._rsi = StreamingRSI(self.period)
+        rsi_values = self._rsi.update_many({"close": data.close})
+        first = self._bars
+        self._bars += len(data)
+        return self._signal_set(data, rsi_values, first).records()
+
+    def _signal(self, index: int, timestamp, price: float, buy: bool, rsi: float) -> Dict:
+        rsi = round(rsi, 2)
+        if buy:
+            return {
+                "index": index,
+                "timestamp": timestamp,
+                'type': 'BUY',
+                'price': price,
+                'rsi': rsi,
+                'reason': f"RSI ({rsi}) below oversold threshold ({self.oversold})"
+            }
         return {
-            'strategy': self.name,
-            'parameters': {
-                'period': self.period,
-                'oversold': self.oversold,
-                'overbought': self.overbought
-            },
-            'total_candles': len(data),
-            'signals': signals,
-            'buy_signals': sum(1 for s in signals if s['type'] == 'BUY'),
-            'sell_signals': sum(1 for s in signals if s['type'] == 'SELL')
-        }
\ No newline at end of file
+            "index": index,
+            'timestamp': timestamp,
+            'type': 'SELL',
+            'price': price,
+            'rsi': rsi,
+            'reason': f"RSI ({rsi}) above overbought threshold ({self.overbought})"
+        }